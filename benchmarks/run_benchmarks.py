@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Headless end-to-end benchmarks for DocMiner's processing stages.
+
+Each stage is timed over every paper of a corpus, `--repeat` times after
+`--warmup` untimed runs, and the median total (p50) is reported together
+with its median absolute deviation (MAD) as the stage's noise. Repeats are
+interleaved (every stage once per round) so that a slow phase of a shared
+machine widens every stage's MAD instead of shifting a few stages' p50. Two corpora are measured: the PDFs in
+sample_pdfs/ and a generated synthetic corpus (see synthetic_corpus.py).
+The AI passes run against the offline fake provider, so no API key or
+network is needed and latency is controlled by --llm-latency-ms.
+
+Results are written as JSON. With --baseline (the default is
+benchmarks/baseline.json) the run fails with exit code 1 when any stage is
+slower than its baseline by more than --tolerance (relative), by more than
+--min-delta-ms (absolute, so sub-millisecond noise never fails a run) and
+by more than --noise-k times the combined MAD of the baseline and the run.
+Baselines are machine-specific: refresh with --update-baseline after
+intentional changes or on a new machine.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --synthetic-papers 100 --output results.json
+    python -m benchmarks.run_benchmarks --update-baseline
+"""
+
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SAMPLE_DIR = REPO_ROOT / "sample_pdfs"
+
+RENDER_SCALES = (1.0, 2.0, 3.0)  # the viewer zooms between 100% and 300%
+RENDER_PAGES = 3                 # pages rendered per paper at each scale
+SELECTIONS_PER_PAGE = 50         # drag rectangles hit-tested per page
+SESSION_PAPERS = 2000            # paper states saved and loaded by the session stage
+
+
+def _timed(stages, repeat, warmup):
+    """
+    Time every stage `repeat` times in interleaved rounds, after `warmup`
+    untimed rounds. The warm-up absorbs one-time costs (imports, first-use
+    setup, cold OS caches) that a regression check should not attribute to
+    the stage.
+
+    Args:
+        stages: {stage: zero-argument callable}
+
+    Returns:
+        {stage: (p50, mad)} in seconds: median wall time and its median absolute deviation
+    """
+    for _ in range(warmup):
+        for run in stages.values():
+            run()
+    times = {stage: [] for stage in stages}
+    for _ in range(repeat):
+        for stage, run in stages.items():
+            started = time.perf_counter()
+            run()
+            times[stage].append(time.perf_counter() - started)
+    results = {}
+    for stage, samples in times.items():
+        p50 = statistics.median(samples)
+        results[stage] = (p50, statistics.median(abs(t - p50) for t in samples))
+    return results
+
+
+def _stage_pdf_open(paths):
+    from utils.parsed_document import ParsedDocument
+
+    def run():
+        for path in paths:
+            with ParsedDocument(path) as doc:
+                doc.page_count
+    return run
+
+
+def _stage_text_extraction(paths):
+    from utils.parsed_document import ParsedDocument
+
+    def run():
+        for path in paths:
+            with ParsedDocument(path) as doc:
+                doc.pages_text()
+                for page_num in range(doc.page_count):
+                    doc.words(page_num)
+    return run
+
+
+def _stage_section_detection(indexes):
+    from utils.document_index import detect_headings, sections_from_headings
+
+    def run():
+        for index in indexes:
+            sections_from_headings(detect_headings(index.pages), len(index.full_text))
+    return run
+
+
+def _stage_regex_fallback(paths):
+    from utils.metadata_extractor import _fallback_regex_analysis
+
+    def run():
+        for path in paths:
+            _fallback_regex_analysis(path, lambda pct, msg: None)
+    return run
+
+
+def _stage_metadata_extraction(paths):
+    # Local extractors only: the Crossref/DataCite lookups are network-bound
+    from utils.metadata_extractor import extract_doi, extract_metadata_pymupdf, extract_text_metadata
+    from utils.parsed_document import ParsedDocument
+
+    def run():
+        for path in paths:
+            with ParsedDocument(path) as doc:
+                extract_metadata_pymupdf(doc)
+                extract_text_metadata(doc)
+                extract_doi(doc)
+    return run
+
+
+def _stage_render(paths, scale):
+    from utils.page_cache import render_page_samples
+
+    def run():
+        for path in paths:
+            for page_num in range(RENDER_PAGES):
+                if render_page_samples(path, page_num, scale) is None:
+                    break
+    return run
+
+
+def _stage_selection_hit_test(indexes):
+    from utils.spatial_index import WordGrid
+
+    def run():
+        rng = random.Random(0)
+        for index in indexes:
+            for page_num in range(index.page_count):
+                # Boxes in screen pixels at 150% zoom, as the viewer sees them
+                grid = WordGrid([[coord * 1.5 for coord in word[:4]] for word in index.words(page_num)])
+                for _ in range(SELECTIONS_PER_PAGE):
+                    x, y = rng.uniform(0, 900), rng.uniform(0, 1200)
+                    grid.query(x, y, x + rng.uniform(10, 600), y + rng.uniform(5, 300))
+    return run
+
+
+def _stage_session_save_load(work_dir):
+    from utils.paper_state_store import PaperStateStore
+
+    states = {
+        f"Paper{i:05d}.pdf": {
+            "human_text": "As a researcher I acknowledge my position. " * 5,
+            "ai_text": "CONFIDENCE: 0.8",
+            "decision": "yes" if i % 2 else "",
+            "uploaded": i % 3 == 0,
+        }
+        for i in range(SESSION_PAPERS)
+    }
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        store = PaperStateStore(Path(work_dir) / f"session-{counter[0]}.sqlite3")
+        store.put_many(states)
+        # Reviewing: one paper saved per Next click, then the app restarts
+        for filename in list(states)[:100]:
+            store.stage(filename, dict(states[filename], decision="no"))
+            store.flush()
+        reopened = PaperStateStore(store.db_path)
+        reopened.summaries()
+        for filename in list(states)[:100]:
+            reopened.get(filename)
+    return run
+
+
+def _stage_ai_analysis(paths):
+    from utils.metadata_extractor import extract_positionality
+
+    def run():
+        for path in paths:
+            result = extract_positionality(path, use_cache=False)
+            if result.get("positionality_errors"):
+                raise RuntimeError(f"AI analysis failed for {path}: {result['positionality_errors']}")
+    return run
+
+
+def corpus_stages(paths):
+    """The stages run over one corpus. Returns {stage: zero-argument callable}."""
+    from utils.document_index import load_document_index
+
+    # Indexes are built (and cached) once so the stages that read them measure only themselves
+    indexes = [load_document_index(path) for path in paths]
+    stages = {
+        "pdf_open": _stage_pdf_open(paths),
+        "text_extraction": _stage_text_extraction(paths),
+        "section_detection": _stage_section_detection(indexes),
+        "regex_fallback": _stage_regex_fallback(paths),
+        "metadata_extraction": _stage_metadata_extraction(paths),
+    }
+    for scale in RENDER_SCALES:
+        stages[f"render_{int(scale * 100)}pct"] = _stage_render(paths, scale)
+    stages["selection_hit_test"] = _stage_selection_hit_test(indexes)
+    stages["ai_analysis"] = _stage_ai_analysis(paths)
+    return stages
+
+
+def compare_to_baseline(results, baseline, tolerance, min_delta, noise_k):
+    """
+    Stages slower than baseline * (1 + tolerance), by more than min_delta
+    seconds and by more than noise_k times the summed MAD of baseline and run.
+    """
+    regressions = []
+    for stage, seconds in results["stages"].items():
+        reference = baseline.get("stages", {}).get(stage)
+        if reference is None:
+            continue
+        noise = baseline.get("spread", {}).get(stage, 0.0) + results.get("spread", {}).get(stage, 0.0)
+        delta = seconds - reference
+        if seconds > reference * (1 + tolerance) and delta > min_delta and delta > noise_k * noise:
+            regressions.append({"stage": stage, "baseline": reference, "seconds": seconds, "noise": noise,
+                                "ratio": seconds / reference if reference else float("inf")})
+    return regressions
+
+
+def run_benchmarks(sample_dir, synthetic_papers, synthetic_pages, repeat, warmup, llm_latency_ms):
+    from benchmarks.synthetic_corpus import generate_corpus
+
+    work_dir = tempfile.mkdtemp(prefix="docminer-bench-")
+    # Keep the user's caches untouched and route the AI passes to the fake provider
+    os.environ["DOCMINER_CACHE_DIR"] = str(Path(work_dir) / "cache")
+    os.environ["DOCMINER_OPENAI_BASE_URL"] = f"fake://?latency_ms={llm_latency_ms}&yes_rate=0.3&seed=0"
+    # Start the fake provider up front: its one-time start-up is not part of the AI stage
+    from utils.metadata_extractor import get_openai_client
+    get_openai_client()
+
+    corpora = {}
+    sample_paths = sorted(str(path) for path in Path(sample_dir).glob("*.pdf"))
+    if sample_paths:
+        corpora["sample"] = sample_paths
+    if synthetic_papers:
+        corpora["synthetic"] = generate_corpus(Path(work_dir) / "synthetic", synthetic_papers, synthetic_pages)
+
+    stages = {}
+    for name, paths in corpora.items():
+        print(f"Preparing {name} corpus ({len(paths)} papers)...", file=sys.stderr)
+        for stage, run in corpus_stages(paths).items():
+            stages[f"{name}/{stage}"] = run
+    stages["session_save_load"] = _stage_session_save_load(work_dir)
+
+    print(f"Timing {len(stages)} stages ({warmup} warm-up + {repeat} rounds)...", file=sys.stderr)
+    timings = _timed(stages, repeat, warmup)
+    for stage, (p50, mad) in timings.items():
+        print(f"  {stage}: {p50 * 1000:.1f} ms (±{mad * 1000:.1f})", file=sys.stderr)
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "config": {"repeat": repeat, "warmup": warmup,
+                   "corpora": {name: len(paths) for name, paths in corpora.items()},
+                   "synthetic_pages": synthetic_pages, "llm_latency_ms": llm_latency_ms},
+        "stages": {stage: p50 for stage, (p50, mad) in timings.items()},
+        "spread": {stage: mad for stage, (p50, mad) in timings.items()},
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Time DocMiner's processing stages and check for regressions")
+    parser.add_argument("--sample-dir", default=str(DEFAULT_SAMPLE_DIR))
+    parser.add_argument("--synthetic-papers", type=int, default=20)
+    parser.add_argument("--synthetic-pages", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs of each stage before timing it")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown (0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--noise-k", type=float, default=3.0,
+                        help="Ignore slowdowns within this many MADs (baseline + run) of the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    # The analysis code logs to stdout; keep stdout for the JSON results
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_benchmarks(args.sample_dir, args.synthetic_papers, args.synthetic_pages,
+                                 args.repeat, args.warmup, args.llm_latency_ms)
+
+    baseline_path = Path(args.baseline)
+    regressions = []
+    compared = False
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("config") != results["config"]:
+            # Timings of a different corpus size or repeat count are not comparable
+            print(f"Skipping the regression check: baseline was recorded with {baseline.get('config')}, "
+                  f"this run used {results['config']}", file=sys.stderr)
+        else:
+            regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms / 1000,
+                                              args.noise_k)
+            compared = True
+    results["baseline_compared"] = compared
+    results["regressions"] = regressions
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression['stage']}: {regression['seconds'] * 1000:.1f} ms "
+              f"vs baseline {regression['baseline'] * 1000:.1f} ms ({regression['ratio']:.2f}x, "
+              f"noise ±{regression['noise'] * 1000:.1f} ms)", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
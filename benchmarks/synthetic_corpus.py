@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Synthetic corpus of research-paper-like PDFs for benchmarks.
+
+Papers are generated with PyMuPDF from a fixed vocabulary and seed, so the
+same arguments always produce the same text, headings and page layout.
+Each paper has the usual section headings (Introduction, Methods,
+Positionality, Results, Discussion, Conclusion, References) and roughly
+a third of them contain first-person positionality statements.
+
+Usage:
+    python -m benchmarks.synthetic_corpus /tmp/corpus --papers 50 --pages 20
+"""
+
+import random
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+SECTIONS = ["Introduction", "Background", "Methods", "Positionality", "Results", "Discussion",
+            "Conclusion", "References"]
+
+VOCABULARY = (
+    "research participants community data analysis interview qualitative study findings "
+    "approach framework theory practice context social cultural identity experience field "
+    "knowledge process method sample themes coding narrative evidence policy education "
+    "health students teachers institutions power relationships trust access ethics"
+).split()
+
+POSITIONALITY_SENTENCES = [
+    "As a researcher who grew up in this community, I acknowledge my position as an insider.",
+    "My positionality as a white, middle-class academic shaped how participants responded to me.",
+    "I reflect on how my own background as a former teacher influenced the interpretation of data.",
+    "We recognize that our identities as outsiders limited our access to some participants.",
+]
+
+PAGE_RECT = fitz.paper_rect("letter")
+MARGIN = 72
+
+
+def _sentence(rng):
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng):
+    return " ".join(_sentence(rng) for _ in range(rng.randint(3, 6)))
+
+
+def paper_text(rng, pages, positionality):
+    """Section heading + paragraphs list for one paper of about `pages` pages."""
+    paragraphs_per_page = 4
+    total = max(len(SECTIONS), pages * paragraphs_per_page)
+    per_section = max(1, total // len(SECTIONS))
+    blocks = [("title", f"A Study of {rng.choice(VOCABULARY).title()} and {rng.choice(VOCABULARY).title()}")]
+    for section in SECTIONS:
+        blocks.append(("heading", section))
+        for i in range(per_section):
+            paragraph = _paragraph(rng)
+            if positionality and section in ("Methods", "Positionality") and i == 0:
+                paragraph = rng.choice(POSITIONALITY_SENTENCES) + " " + paragraph
+            blocks.append(("text", paragraph))
+    return blocks
+
+
+def write_paper(path, blocks):
+    """Lay blocks out top to bottom, starting a new page when one is full."""
+    doc = fitz.open()
+    page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+    y = MARGIN
+    for kind, text in blocks:
+        fontsize = {"title": 16, "heading": 13}.get(kind, 10)
+        fontname = "hebo" if kind != "text" else "helv"
+        # Line count from the rendered width, with slack for word wrapping
+        width = PAGE_RECT.width - 2 * MARGIN
+        lines = int(fitz.get_text_length(text, fontname=fontname, fontsize=fontsize) * 1.15 / width) + 2
+        height = lines * fontsize * 1.3
+        if y + height > PAGE_RECT.height - MARGIN:
+            page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+            y = MARGIN
+        rect = fitz.Rect(MARGIN, y, PAGE_RECT.width - MARGIN, y + height)
+        page.insert_textbox(rect, text, fontsize=fontsize, fontname=fontname)
+        y += height + fontsize
+    doc.set_metadata({"title": blocks[0][1], "author": "Synthetic Author", "producer": "DocMiner benchmarks"})
+    doc.save(str(path))
+    doc.close()
+
+
+def generate_corpus(out_dir, papers=20, pages=12, seed=0):
+    """
+    Write `papers` PDFs of about `pages` pages each into out_dir.
+    Existing files with the same names are reused, so repeated runs are cheap.
+
+    Returns:
+        Sorted list of PDF paths
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(papers):
+        path = out_dir / f"Synthetic{i:04d}-Paper-{seed}-{pages}p.pdf"
+        if not path.exists():
+            rng = random.Random(f"{seed}:{i}")
+            write_paper(path, paper_text(rng, pages, positionality=(i % 3 == 0)))
+        paths.append(str(path))
+    return sorted(paths)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic PDF corpus for benchmarks")
+    parser.add_argument("out_dir")
+    parser.add_argument("--papers", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.out_dir, args.papers, args.pages, args.seed)
+    print(f"{len(paths)} papers in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ import os
 
 VERSION = "5.1"
 PROJECT_NAME = "ResearchBuddy"
-MAIN_SCRIPT = "enhanced_training_interface.py"
+MAIN_SCRIPT = "run_docminer.py"
 
 def run_command(cmd, description, capture_output=True):
     """Run a command and handle errors gracefully"""
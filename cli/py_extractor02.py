@@ -1,8 +1,23 @@
 import os
+import sys
 import csv
 import re
+import json
+import hashlib
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 import fitz  # PyMuPDF for PDF reading
-import openai  # OpenAI API
+
+# Add the project root to the Python path for the shared utils
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.openai_client import close_async_clients, get_shared_async_client, get_shared_client
+from utils.request_scheduler import get_request_scheduler, provider_for_base_url
+
+SEARCH_KEYWORDS = ["positionality", "standpoint", "identity", "reflexivity"]
+CSV_HEADER = ["Filename", "Lead Author First Name", "Lead Author Last Name", "Journal Title", "Volume", "Issue", "Month/Year", "DOI", "Detected Positionality Statement?", "Snippet/Excerpt", "Notes"]
 
 def extract_metadata(text):
     lead_author_first = "N/A"
@@ -46,89 +61,330 @@ def search_for_keywords(text, keywords):
             return "Yes", snippet.strip()
     return "No", ""
 
+AI_SYSTEM_PROMPT = "You are an academic assistant helping to detect specific content in research articles."
+AI_TEXT_LIMIT = 12000  # characters of article text sent with the prompt
+
+def ai_messages(text, user_prompt):
+    """Chat messages asking the model the user's detection question about an article."""
+    return [
+        {"role": "system", "content": AI_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{user_prompt}\n\nHere is the article text:\n{text[:AI_TEXT_LIMIT]}"}
+    ]
+
+def parse_ai_reply(reply):
+    """Map the model's reply to ('Yes', reply), ('No', reply) or ('Unclear', reply)."""
+    reply = reply.strip()
+    if "yes" in reply.lower():
+        return "Yes", reply
+    elif "no" in reply.lower():
+        return "No", reply
+    else:
+        return "Unclear", reply
+
 def search_with_ai(text, api_key, model, user_prompt):
     """
     Uses OpenAI API to determine if an article matches the user's detection prompt.
+    The request goes through the shared client and the request scheduler
+    (rate limits and retries, see utils/request_scheduler.py).
     Returns ('Yes', snippet) or ('No', '').
     """
-    openai.api_key = api_key
+    try:
+        client = get_shared_client(api_key, os.getenv("DOCMINER_OPENAI_BASE_URL") or None)
+        response = get_request_scheduler().run(
+            provider_for_base_url(client.base_url),
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=ai_messages(text, user_prompt),
+                temperature=0.2,
+                max_tokens=500
+            ))
+        return parse_ai_reply(response.choices[0].message.content)
+
+    except Exception as e:
+        print(f"⚠️ OpenAI API call failed: {e}")
+        return "Error", str(e)
 
+async def search_with_ai_async(client, text, model, user_prompt):
+    """
+    Async counterpart of search_with_ai using a shared AsyncOpenAI client.
+    Like the sync version it runs under the request scheduler, which shares
+    its per-provider rate limits with the GUI's analyses.
+    Returns ('Yes', snippet), ('No', reply), ('Unclear', reply) or ('Error', message).
+    """
     try:
-        response = openai.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are an academic assistant helping to detect specific content in research articles."},
-                {"role": "user", "content": f"{user_prompt}\n\nHere is the article text:\n{text[:12000]}"}  # Limit to ~12,000 characters
-            ],
-            temperature=0.2,
-            max_tokens=500
-        )
-
-        reply = response.choices[0].message.content.strip()
-
-        if "yes" in reply.lower():
-            return "Yes", reply
-        elif "no" in reply.lower():
-            return "No", reply
-        else:
-            return "Unclear", reply
+        response = await get_request_scheduler().run_async(
+            provider_for_base_url(client.base_url),
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=ai_messages(text, user_prompt),
+                temperature=0.2,
+                max_tokens=500
+            ))
+        return parse_ai_reply(response.choices[0].message.content)
 
     except Exception as e:
         print(f"⚠️ OpenAI API call failed: {e}")
         return "Error", str(e)
 
-def process_pdfs(input_folder, output_csv, mode, api_key=None, provider=None, model=None, user_prompt=None):
+def file_fingerprint(pdf_path, data=None):
     """
-    Processes PDFs in a folder using either keyword search or AI-based analysis.
+    Checkpoint identity of a PDF: filename, modification time and SHA-256 of its bytes.
+    Pass `data` when the file has already been read to avoid a second read.
     """
-    search_keywords = ["positionality", "standpoint", "identity", "reflexivity"]
-    data_rows = []
+    if data is None:
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+    return {
+        "filename": os.path.basename(pdf_path),
+        "mtime": os.path.getmtime(pdf_path),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+def extract_pdf(pdf_path, mode):
+    """
+    CPU-bound half of processing one PDF: text extraction, metadata and keyword search.
+    Runs inside a worker process, so it only takes and returns picklable values.
+    Returns dict with filename, checkpoint fingerprint, metadata tuple, keyword result
+    and (AI mode only) text, or None if the PDF could not be read.
+    """
+    filename = os.path.basename(pdf_path)
+    text = ""
 
-    for filename in os.listdir(input_folder):
-        if filename.endswith(".pdf"):
-            pdf_path = os.path.join(input_folder, filename)
-            text = ""
+    try:
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+        doc = fitz.open(stream=data, filetype="pdf")
+        for page in doc:
+            text += page.get_text()
+        doc.close()
+    except Exception as e:
+        print(f"⚠️ Failed to read {filename}: {e}")
+        return None
+
+    result = {
+        "filename": filename,
+        "checkpoint": file_fingerprint(pdf_path, data),
+        "metadata": extract_metadata(text),
+        "found": None,
+        "snippet": None,
+        "text": None,
+    }
+    if mode == "keyword":
+        result["found"], result["snippet"] = search_for_keywords(text, SEARCH_KEYWORDS)
+    elif mode == "ai":
+        result["text"] = text
+    else:
+        result["found"], result["snippet"] = "Error", "Unknown mode selected"
+    return result
+
+async def iter_rows(pdf_paths, mode, api_key=None, model=None, user_prompt=None, workers=1, max_in_flight=4):
+    """
+    Yield (csv_row, checkpoint_entry) pairs for pdf_paths in input order.
+
+    Text extraction runs on a pool of `workers` processes and at most
+    `max_in_flight` AI requests are outstanding at once. A bounded window of
+    pending papers keeps CPU and network busy without holding the whole
+    corpus in memory, while rows still come out in deterministic order.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(1, max_in_flight))
+    ai_client = None
+    if mode == "ai":
+        ai_client = get_shared_async_client(api_key, os.getenv("DOCMINER_OPENAI_BASE_URL") or None)
+    window = max(1, workers) * 2 + max(1, max_in_flight)
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    async def process_one(pdf_path):
+        extracted = await loop.run_in_executor(executor, extract_pdf, pdf_path, mode)
+        if extracted is None:
+            return None
+
+        found, snippet = extracted["found"], extracted["snippet"]
+        if mode == "ai":
+            async with semaphore:
+                found, snippet = await search_with_ai_async(ai_client, extracted["text"], model, user_prompt)
+
+        lead_first, lead_last, journal, volume, issue, month_year, doi = extracted["metadata"]
+        row = [
+            extracted["filename"],
+            lead_first,
+            lead_last,
+            journal,
+            volume,
+            issue,
+            month_year,
+            doi,
+            found,
+            snippet,
+            ""
+        ]
+        return row, extracted["checkpoint"]
 
+    try:
+        pending = deque()
+        for pdf_path in pdf_paths:
+            pending.append(asyncio.ensure_future(process_one(pdf_path)))
+            if len(pending) >= window:
+                result = await pending.popleft()
+                if result is not None:
+                    yield result
+        while pending:
+            result = await pending.popleft()
+            if result is not None:
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+        if ai_client is not None:
+            await close_async_clients()
+
+def checkpoint_path_for(output_csv):
+    """Sidecar file recording which papers already have a row in output_csv."""
+    return f"{output_csv}.checkpoint.jsonl"
+
+def load_checkpoint(checkpoint_path):
+    """Read checkpoint entries as {filename: entry}; a torn final line is ignored."""
+    entries = {}
+    if not os.path.exists(checkpoint_path):
+        return entries
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        for line in f:
             try:
-                doc = fitz.open(pdf_path)
-                for page in doc:
-                    text += page.get_text()
-            except Exception as e:
-                print(f"⚠️ Failed to read {filename}: {e}")
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry["filename"]] = entry
+    return entries
+
+def is_already_processed(pdf_path, checkpoint):
+    """True if pdf_path is in the checkpoint and its content has not changed since."""
+    entry = checkpoint.get(os.path.basename(pdf_path))
+    if not entry:
+        return False
+    try:
+        if os.path.getmtime(pdf_path) == entry.get("mtime"):
+            return True
+        # Touched but possibly unchanged - fall back to comparing content
+        return file_fingerprint(pdf_path)["sha256"] == entry.get("sha256")
+    except OSError:
+        return False
+
+def write_checkpoint(checkpoint_path, checkpoint):
+    """Atomically rewrite the checkpoint with only its valid entries."""
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in checkpoint.values():
+            f.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, checkpoint_path)
+
+def trim_csv_to_checkpoint(output_csv, checkpoint):
+    """
+    Drop CSV rows that have no checkpoint entry (written just before a crash),
+    so resuming never produces duplicate rows.
+    """
+    if not os.path.exists(output_csv):
+        return
+    tmp_path = f"{output_csv}.tmp"
+    with open(output_csv, "r", newline="", encoding="utf-8") as src, \
+         open(tmp_path, "w", newline="", encoding="utf-8") as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        writer.writerow(CSV_HEADER)
+        try:
+            next(reader)  # existing header
+            for row in reader:
+                if row and row[0] in checkpoint:
+                    writer.writerow(row)
+        except csv.Error:
+            pass  # torn final row from an interrupted write
+    os.replace(tmp_path, output_csv)
+
+def process_pdfs(input_folder, output_csv, mode, api_key=None, provider=None, model=None, user_prompt=None, workers=1, max_in_flight=4, resume=False):
+    """
+    Processes PDFs in a folder using either keyword search or AI-based analysis.
+
+    Rows are streamed to output_csv as they complete, and each finished paper is
+    recorded in a sidecar checkpoint (filename, mtime, SHA-256). With resume=True,
+    papers already in the checkpoint are skipped and new rows are appended; a paper
+    whose content changed since its row was written is processed again and its old
+    row is removed. Rows whose result is 'Error' (e.g. an API outage outlasting the
+    retries) are written but not checkpointed, so resuming replaces them.
+
+    Args:
+        workers: Number of processes used for text extraction and keyword/metadata work
+        max_in_flight: Maximum concurrent AI requests (AI mode only)
+        resume: Continue an interrupted run instead of starting over
+    """
+    pdf_paths = [os.path.join(input_folder, filename)
+                 for filename in sorted(os.listdir(input_folder))
+                 if filename.endswith(".pdf")]
+
+    checkpoint_path = checkpoint_path_for(output_csv)
+    if resume and os.path.exists(output_csv):
+        checkpoint = load_checkpoint(checkpoint_path)
+        remaining = [path for path in pdf_paths if not is_already_processed(path, checkpoint)]
+        # A paper that changed since its row was written is redone: forget the old entry
+        # so trim_csv_to_checkpoint drops the old row instead of keeping a duplicate
+        for path in remaining:
+            checkpoint.pop(os.path.basename(path), None)
+        write_checkpoint(checkpoint_path, checkpoint)
+        trim_csv_to_checkpoint(output_csv, checkpoint)
+        print(f"↩️ Resuming: {len(pdf_paths) - len(remaining)} of {len(pdf_paths)} papers already done")
+        pdf_paths = remaining
+        csv_mode = "a"
+    else:
+        csv_mode = "w"
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    failed = []
+
+    async def stream_rows(writer, csvfile, checkpoint_file):
+        async for row, entry in iter_rows(pdf_paths, mode, api_key, model, user_prompt,
+                                          workers=workers, max_in_flight=max_in_flight):
+            writer.writerow(row)
+            csvfile.flush()
+            if row[8] == "Error":
+                # Not checkpointed: --resume drops the row and tries the paper again
+                failed.append(row[0])
                 continue
+            # Checkpoint only after the row is on disk
+            checkpoint_file.write(json.dumps(entry) + "\n")
+            checkpoint_file.flush()
 
-            if mode == "keyword":
-                found, snippet = search_for_keywords(text, search_keywords)
-            elif mode == "ai":
-                found, snippet = search_with_ai(text, api_key, model, user_prompt)
-            else:
-                found, snippet = "Error", "Unknown mode selected"
-
-            lead_first, lead_last, journal, volume, issue, month_year, doi = extract_metadata(text)
-
-            row = [
-                filename,
-                lead_first,
-                lead_last,
-                journal,
-                volume,
-                issue,
-                month_year,
-                doi,
-                found,
-                snippet,
-                ""
-            ]
-            data_rows.append(row)
-
-    with open(output_csv, "w", newline="", encoding="utf-8") as csvfile:
+    with open(output_csv, csv_mode, newline="", encoding="utf-8") as csvfile, \
+         open(checkpoint_path, "a", encoding="utf-8") as checkpoint_file:
         writer = csv.writer(csvfile)
-        writer.writerow(["Filename", "Lead Author First Name", "Lead Author Last Name", "Journal Title", "Volume", "Issue", "Month/Year", "DOI", "Detected Positionality Statement?", "Snippet/Excerpt", "Notes"])
-        writer.writerows(data_rows)
+        if csv_mode == "w":
+            writer.writerow(CSV_HEADER)
+            csvfile.flush()
+        try:
+            asyncio.run(stream_rows(writer, csvfile, checkpoint_file))
+        except KeyboardInterrupt:
+            print(f"\n⏸️ Interrupted. Rows so far are saved in {output_csv}; re-run with --resume to continue.")
+            return
 
     print(f"✅ Finished processing. Results saved to {output_csv}")
+    if failed:
+        print(f"⚠️ {len(failed)} paper(s) failed (e.g. API errors after retries); re-run with --resume to retry them.")
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scan a folder of PDFs for positionality statements")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes used for PDF text extraction and keyword/metadata work (default: 1)")
+    parser.add_argument("--max-in-flight", type=int, default=4,
+                        help="Maximum concurrent AI requests in AI mode (default: 4)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip papers already recorded in the output's checkpoint and append new rows")
+    args = parser.parse_args()
+
     # Defaults
     default_input_folder = "~/pdfs"
     default_output_filename = "output.csv"
@@ -181,11 +437,15 @@ if __name__ == "__main__":
     print(f"Input folder: {input_folder}")
     print(f"Output file: {output_path}")
     print(f"Mode: {mode}")
+    print(f"Workers: {args.workers}")
+    print(f"Resume: {'yes' if args.resume else 'no'}")
     if mode == "ai":
         print(f"Provider: {provider}")
         print(f"Model: {model}")
         print(f"Detection prompt: {user_prompt}")
+        print(f"Max AI requests in flight: {args.max_in_flight}")
     print("\nStarting processing...\n")
 
     # Call the main processing function
-    process_pdfs(input_folder, output_path, mode, api_key, provider, model, user_prompt)
+    process_pdfs(input_folder, output_path, mode, api_key, provider, model, user_prompt,
+                 workers=args.workers, max_in_flight=args.max_in_flight, resume=args.resume)
@@ -14,6 +14,7 @@ positionality detection capabilities for academic research training.
 import sys
 import os
 import json
+import bisect
 import shutil
 import subprocess
 import platform
@@ -25,10 +26,11 @@ from PySide6.QtWidgets import (
     QLabel, QTextEdit, QPushButton, QButtonGroup, QRadioButton,
     QScrollArea, QProgressBar, QMessageBox, QFileDialog, QCheckBox,
     QComboBox, QSpinBox, QGroupBox, QGridLayout, QSplitter, QFrame,
-    QTabWidget, QSlider, QMenu, QPlainTextEdit, QLineEdit, QSizePolicy, QDialog
+    QTabWidget, QSlider, QMenu, QPlainTextEdit, QLineEdit, QSizePolicy, QDialog,
+    QListWidget, QListWidgetItem
 )
-from PySide6.QtCore import Qt, QTimer, Signal, QRect, QPoint, QUrl, QThread, QObject
-from PySide6.QtGui import QFont, QTextCursor, QPixmap, QPainter, QPen, QColor, QBrush, QAction, QClipboard
+from PySide6.QtCore import Qt, QTimer, Signal, QRect, QPoint, QUrl, QThread, QObject, QFileSystemWatcher
+from PySide6.QtGui import QFont, QTextCursor, QImage, QPixmap, QPainter, QPen, QColor, QBrush, QAction, QClipboard
 
 # Try to import QtWebEngine, but it's optional
 try:
@@ -39,7 +41,16 @@ except ImportError:
     QWebEngineView = None  # Define as None so code doesn't break
 
 import fitz  # PyMuPDF for PDF rendering
-from utils.metadata_extractor import extract_positionality
+from utils.metadata_extractor import extract_positionality, openai_credentials
+from utils.document_index import load_document_index
+from utils.page_cache import PageRenderCache, PagePrefetcher, page_cache_max_bytes
+from utils.spatial_index import WordGrid
+from utils.search_index import load_search_index
+from utils.corpus_index import CorpusIndex
+from utils.paper_state_store import PaperStateStore, summarize_state
+from utils.analysis_prefetch import AnalysisPrefetcher, prefetch_settings
+from utils.analysis_telemetry import get_ring_buffer
+from utils.openai_client import close_shared_clients
 from github_report_uploader import GitHubReportUploader
 from configuration_dialog import ConfigurationDialog
 
@@ -166,6 +177,9 @@ class SelectablePDFLabel(QLabel):
     def __init__(self):
         super().__init__()
         self.text_blocks = []
+        self.selectable_blocks = []  # Non-empty text blocks, in WordGrid index order
+        self.word_grid = WordGrid([])  # Spatial index over selectable_blocks
+        self.block_rects = []  # QRect per selectable block, built once per page
         self.text_lines = []  # Text organized by lines for proper selection
         self.selected_text = ""
         self.selection_start = None
@@ -214,6 +228,13 @@ class SelectablePDFLabel(QLabel):
     def set_text_blocks(self, text_blocks):
         """Set the text blocks from PDF page and organize them into lines"""
         self.text_blocks = text_blocks
+        # Index word boxes so drag-selection only visits the words under the rectangle
+        self.selectable_blocks = [block for block in text_blocks if block.get('text', '').strip()]
+        self.word_grid = WordGrid([block['bbox'] for block in self.selectable_blocks])
+        self.block_rects = [
+            QRect(int(bbox[0]), int(bbox[1]), int(bbox[2] - bbox[0]), int(bbox[3] - bbox[1]))
+            for bbox in (block['bbox'] for block in self.selectable_blocks)
+        ]
         print(f"DEBUG - set_text_blocks called with {len(text_blocks)} blocks")
         self.organize_text_into_lines()
         
@@ -223,27 +244,31 @@ class SelectablePDFLabel(QLabel):
             self.text_lines = []
             return
             
-        # Group text blocks by approximate Y-coordinate (line height tolerance)
+        # Group text blocks by approximate Y-coordinate (line height tolerance).
+        # Line keys are kept sorted so the keys within tolerance are found by
+        # bisection instead of scanning every line: O(n log n) overall. Keys are
+        # always more than the tolerance apart, so at most two can match; the
+        # earlier-created one wins, exactly as with a linear scan.
         lines = {}
         line_height_tolerance = 5  # pixels
+        sorted_keys = []
+        key_order = {}  # line key -> creation order
         
-        for block in self.text_blocks:
-            if not block.get('text', '').strip():
-                continue
-                
+        for block in self.selectable_blocks:
             bbox = block['bbox']
             y_center = (bbox[1] + bbox[3]) / 2  # Center Y coordinate
             
             # Find existing line or create new one
-            line_key = None
-            for existing_y in lines.keys():
-                if abs(y_center - existing_y) <= line_height_tolerance:
-                    line_key = existing_y
-                    break
+            start = bisect.bisect_left(sorted_keys, y_center - line_height_tolerance)
+            stop = bisect.bisect_right(sorted_keys, y_center + line_height_tolerance)
+            matches = sorted_keys[start:stop]
+            line_key = min(matches, key=key_order.get) if matches else None
                     
             if line_key is None:
                 line_key = y_center
                 lines[line_key] = []
+                key_order[line_key] = len(key_order)
+                bisect.insort(sorted_keys, line_key)
                 
             lines[line_key].append({
                 'text': block['text'],
@@ -335,43 +360,42 @@ class SelectablePDFLabel(QLabel):
         # Create selection rectangle
         self.selection_rect = QRect(self.selection_start, self.selection_end).normalized()
         
+        # Column-aware selection with user-adjustable tolerance
+        selection_left = min(self.selection_rect.left(), self.selection_rect.right())
+        selection_right = max(self.selection_rect.left(), self.selection_rect.right())
+        selection_width = selection_right - selection_left
+        
+        # Calculate tolerance based on user settings and column mode
+        if self.column_mode in ["Single", "1-Col"]:
+            # Single column: Very generous tolerance, capture everything in selection
+            tolerance = selection_width * 2.0  # 200% - basically no X filtering
+        elif self.column_mode in ["Two-Column", "2-Col"]:
+            # Two column: Strict tolerance to avoid adjacent columns
+            tolerance = max(selection_width * 0.2, 30)  # 20% with 30px minimum
+        else:  # Auto mode
+            # Use user's slider setting (20% to 200%)
+            tolerance = max(selection_width * self.selection_tolerance, 30)  # User-defined with 30px minimum
+        
         # Collect all blocks that intersect with selection rectangle
+        # (the grid narrows the candidates; QRect keeps the exact pixel test)
         selected_blocks = []
+        candidates = self.word_grid.query(
+            self.selection_rect.left() - 1, self.selection_rect.top() - 1,
+            self.selection_rect.right() + 1, self.selection_rect.bottom() + 1
+        )
         
-        for block in self.text_blocks:
-            if not block.get('text', '').strip():
-                continue
-                
-            bbox = block['bbox']
-            block_rect = QRect(
-                int(bbox[0]), int(bbox[1]),
-                int(bbox[2] - bbox[0]), int(bbox[3] - bbox[1])
-            )
-            
-            # Column-aware selection with user-adjustable tolerance
-            if self.selection_rect.intersects(block_rect):
+        for i in candidates:
+            if self.selection_rect.intersects(self.block_rects[i]):
+                block = self.selectable_blocks[i]
+                bbox = block['bbox']
                 center_x = (bbox[0] + bbox[2]) / 2
-                selection_left = min(self.selection_rect.left(), self.selection_rect.right())
-                selection_right = max(self.selection_rect.left(), self.selection_rect.right())
-                selection_width = selection_right - selection_left
-                
-                # Calculate tolerance based on user settings and column mode
-                if self.column_mode in ["Single", "1-Col"]:
-                    # Single column: Very generous tolerance, capture everything in selection
-                    tolerance = selection_width * 2.0  # 200% - basically no X filtering
-                elif self.column_mode in ["Two-Column", "2-Col"]:
-                    # Two column: Strict tolerance to avoid adjacent columns
-                    tolerance = max(selection_width * 0.2, 30)  # 20% with 30px minimum
-                else:  # Auto mode
-                    # Use user's slider setting (20% to 200%)
-                    tolerance = max(selection_width * self.selection_tolerance, 30)  # User-defined with 30px minimum
                 
                 if (center_x >= selection_left - tolerance and 
                     center_x <= selection_right + tolerance):
                     selected_blocks.append({
                         'text': block['text'],
                         'bbox': bbox,
-                        'x': (bbox[0] + bbox[2]) / 2,  # center X for sorting
+                        'x': center_x,  # center X for sorting
                         'y': (bbox[1] + bbox[3]) / 2   # center Y for sorting
                     })
         
@@ -387,14 +411,16 @@ class SelectablePDFLabel(QLabel):
         # Blocks are on same line if their Y-centers are close (within typical line height)
         lines = []
         current_line = []
+        current_line_y_sum = 0.0
         
         for block in selected_blocks:
             if not current_line:
                 # Start first line
                 current_line.append(block)
+                current_line_y_sum = block['y']
             else:
-                # Calculate average Y-center of current line
-                line_y_avg = sum(b['y'] for b in current_line) / len(current_line)
+                # Average Y-center of current line (running sum, not a rescan)
+                line_y_avg = current_line_y_sum / len(current_line)
                 block_y = block['y']
                 
                 # Typical line height is about 12-15 pixels, use half of that as threshold
@@ -404,11 +430,13 @@ class SelectablePDFLabel(QLabel):
                 if abs(block_y - line_y_avg) <= y_threshold:
                     # Same line
                     current_line.append(block)
+                    current_line_y_sum += block_y
                 else:
                     # New line - save current and start new
                     current_line.sort(key=lambda b: b['x'])  # Sort left to right
                     lines.append(current_line)
                     current_line = [block]
+                    current_line_y_sum = block_y
         
         # Don't forget the last line
         if current_line:
@@ -473,6 +501,116 @@ class SelectablePDFLabel(QLabel):
             clipboard = QApplication.clipboard()
             clipboard.setText(all_text)
 
+def image_from_samples(width, height, stride, samples, owner=None):
+    """
+    Wrap raw RGB samples as a QImage without encoding or copying.
+    The image points straight into the samples buffer, so the buffer (or the
+    Pixmap that owns it) is kept alive on the image. QImage, unlike QPixmap,
+    may be created off the GUI thread, so the background prefetcher uses this too.
+    
+    Returns:
+        (QImage, size in bytes)
+    """
+    image = QImage(samples, width, height, stride, QImage.Format_RGB888)
+    image._samples_owner = owner if owner is not None else samples
+    return image, image.sizeInBytes()
+
+def render_page_image(page, scale):
+    """Rasterize a PyMuPDF page at the given scale into a QImage"""
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    return image_from_samples(pix.width, pix.height, pix.stride, pix.samples_mv, owner=pix)
+
+class TextBlockWorker(QThread):
+    """Extracts a page's word boxes, scaled for display, off the GUI thread"""
+    blocks_ready = Signal(int, int, object)  # generation, page number, list of text blocks
+
+    def __init__(self, generation, pdf_path, page_num, scale, document_index=None):
+        super().__init__()
+        self.generation = generation
+        self.pdf_path = pdf_path
+        self.page_num = page_num
+        self.scale = scale
+        self.document_index = document_index
+
+    def run(self):
+        text_blocks = []
+        try:
+            # Extract word-level text with positions (from the document index when available)
+            if self.document_index is not None:
+                words = self.document_index.words(self.page_num)  # [x0, y0, x1, y1, "word"] in PDF points
+            else:
+                # Own document handle: fitz documents must not be shared across threads
+                with fitz.open(self.pdf_path) as doc:
+                    words = doc[self.page_num].get_text("words")  # (x0, y0, x1, y1, "word", block_no, line_no, word_no)
+            
+            scale = self.scale
+            for word in words:
+                if len(word) >= 5:  # Ensure we have all required fields
+                    x0, y0, x1, y1, text = word[:5]
+                    # Scale coordinates to match display
+                    text_blocks.append({
+                        'bbox': (x0 * scale, y0 * scale, x1 * scale, y1 * scale),
+                        'text': text
+                    })
+        except Exception as e:
+            print(f"DEBUG: Text extraction failed: {e}")
+            text_blocks = []
+        self.blocks_ready.emit(self.generation, self.page_num, text_blocks)
+
+class DocumentIndexWorker(QThread):
+    """Builds (or loads) a document's page index off the GUI thread"""
+    index_ready = Signal(str, object)  # PDF path, DocumentIndex (None if indexing failed)
+
+    def __init__(self, pdf_path):
+        super().__init__()
+        self.pdf_path = pdf_path
+
+    def run(self):
+        try:
+            index = load_document_index(self.pdf_path)
+        except Exception as e:
+            print(f"DEBUG: Document index unavailable: {e}")
+            index = None
+        self.index_ready.emit(self.pdf_path, index)
+
+class SearchIndexWorker(QThread):
+    """Builds a document's whole-text search index off the GUI thread"""
+    index_ready = Signal(object)  # SearchIndex, or None if indexing failed
+
+    def __init__(self, pdf_path):
+        super().__init__()
+        self.pdf_path = pdf_path
+
+    def run(self):
+        try:
+            index = load_search_index(load_document_index(self.pdf_path))
+        except Exception as e:
+            print(f"DEBUG: Search index build failed: {e}")
+            index = None
+        self.index_ready.emit(index)
+
+class CorpusIndexWorker(QThread):
+    """Brings the folder's full-text index up to date off the GUI thread"""
+    progress = Signal(int, int, str)  # done, total, filename
+    indexing_finished = Signal(str, object)  # folder, stats dict (None if indexing failed)
+
+    def __init__(self, corpus_index, folder):
+        super().__init__()
+        self.corpus_index = corpus_index
+        self.folder = folder
+
+    def run(self):
+        try:
+            stats = self.corpus_index.update_folder(
+                self.folder,
+                progress_callback=self.progress.emit,
+                should_stop=self.isInterruptionRequested,
+            )
+        except Exception as e:
+            print(f"DEBUG: Folder indexing failed: {e}")
+            stats = None
+        self.indexing_finished.emit(self.folder, stats)
+
 class EmbeddedPDFViewer(QWidget):
     """Embedded PDF viewer with proper aspect ratio handling for portrait documents"""
     
@@ -483,8 +621,16 @@ class EmbeddedPDFViewer(QWidget):
         self.current_page = 0  # Track current page
         self.total_pages = 0   # Track total pages
         self.pdf_document = None  # Store document object
+        self.document_key = None  # Path, mtime and size: keys rendered pages without hashing the file
+        self.document_index = None  # Cached page text and word boxes, once DocumentIndexWorker delivers them
         self.pdf_width = 612  # Standard letter width
         self.pdf_height = 792  # Standard letter height
+        # Rendered pages keyed by (document, page, scale); neighbours are pre-rendered in the background
+        self.page_cache = PageRenderCache(max_bytes=page_cache_max_bytes())
+        self.page_prefetcher = PagePrefetcher(self.page_cache, lambda raw: image_from_samples(*raw))
+        self.text_generation = 0  # Bumped on every page/zoom render; tags TextBlockWorker results
+        self.text_workers = set()
+        self.index_workers = set()
         self.setup_ui()
         
     def setup_ui(self):
@@ -630,8 +776,12 @@ class EmbeddedPDFViewer(QWidget):
         if hasattr(self, 'pdf_document') and self.pdf_document:
             self.render_current_page()
     
-    def calculate_zoom_scale(self, zoom_text):
-        """Calculate scale factor based on view mode and zoom selection"""
+    def calculate_zoom_scale(self, zoom_text, page_rect=None):
+        """Calculate scale factor based on view mode and zoom selection
+        (for the current page, or for page_rect when given)"""
+        pdf_width = page_rect.width if page_rect is not None else self.pdf_width
+        pdf_height = page_rect.height if page_rect is not None else self.pdf_height
+        
         # Get actual available space in the PDF container
         available_width = self.scroll_area.width() - 40  # Account for scrollbars/margins
         available_height = self.scroll_area.height() - 40
@@ -641,8 +791,8 @@ class EmbeddedPDFViewer(QWidget):
         
         if view_mode == "Fit Page":
             # Fit entire page without scrollbars - scale to fit both dimensions
-            width_scale = available_width / self.pdf_width
-            height_scale = available_height / self.pdf_height
+            width_scale = available_width / pdf_width
+            height_scale = available_height / pdf_height
             base_scale = min(width_scale, height_scale)
         elif view_mode == "1:1 Fixed":
             # No scaling - exact PDF coordinates for perfect text selection
@@ -661,14 +811,14 @@ class EmbeddedPDFViewer(QWidget):
             base_scale = min(width_scale, height_scale)
         elif view_mode == "Full Width":
             # Fill width, allow vertical scrolling
-            base_scale = available_width / self.pdf_width
+            base_scale = available_width / pdf_width
         elif view_mode == "Full Height":
             # Fill height, allow horizontal scrolling if needed
-            base_scale = available_height / self.pdf_height
+            base_scale = available_height / pdf_height
         else:
             # Fallback: fit to available space
-            width_scale = available_width / self.pdf_width
-            height_scale = available_height / self.pdf_height
+            width_scale = available_width / pdf_width
+            height_scale = available_height / pdf_height
             base_scale = min(width_scale, height_scale)
         
         # Then apply zoom multiplier
@@ -681,6 +831,13 @@ class EmbeddedPDFViewer(QWidget):
             return base_scale * zoom_multiplier
         else:
             return base_scale
+    
+    def page_scale(self, page_num):
+        """Display scale for a page, clamped to the usable zoom range"""
+        scale = self.calculate_zoom_scale(self.zoom_combo.currentText(), self.pdf_document[page_num].rect)
+        min_scale = 0.3
+        max_scale = 3.0
+        return max(min_scale, min(scale, max_scale))
         
     def load_pdf(self, pdf_path):
         """Load PDF with proper aspect ratio calculation and page navigation"""
@@ -695,6 +852,15 @@ class EmbeddedPDFViewer(QWidget):
             self.total_pages = len(self.pdf_document)
             self.current_page = 0  # Start with first page
             
+            # Cached per-page text and word boxes, so re-rendering never re-extracts. Building the
+            # index reads every page, so it runs in the background; until it arrives the visible
+            # page's words are extracted on their own (see TextBlockWorker)
+            self.document_index = None
+            stat = os.stat(pdf_path)
+            self.document_key = f"{os.path.abspath(pdf_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+            self.start_document_index_build(pdf_path)
+            self.page_prefetcher.cancel()
+            
             # Update page navigation controls
             self.update_page_controls()
             
@@ -707,31 +873,78 @@ class EmbeddedPDFViewer(QWidget):
         except Exception as e:
             return self.handle_load_error(e)
 
+    def clear(self):
+        """Close the current PDF and show an empty viewer"""
+        self.text_generation += 1  # Text blocks still being extracted are dropped
+        self.page_prefetcher.cancel()
+        if self.pdf_document:
+            self.pdf_document.close()
+        self.pdf_document = None
+        self.current_pdf_path = None
+        self.document_index = None
+        self.document_key = None
+        self.total_pages = 0
+        self.current_page = 0
+        self.pdf_label.set_text_blocks([])
+        self.pdf_label.clear()
+        self.pdf_label.setMinimumSize(0, 0)
+        self.pdf_label.setText("No PDF loaded")
+        self.update_page_controls()
+
+    def shutdown(self):
+        """Stop background rendering and wait for the text and index workers (at window close)"""
+        self.page_prefetcher.stop()
+        for worker in [*self.text_workers, *self.index_workers]:
+            worker.requestInterruption()
+            worker.wait()
+        self.text_workers.clear()
+        self.index_workers.clear()
+
+    def start_document_index_build(self, pdf_path):
+        """Load the document index on a worker thread; on_document_index_ready stores it"""
+        worker = DocumentIndexWorker(pdf_path)
+        worker.index_ready.connect(self.on_document_index_ready)
+        worker.finished.connect(lambda: self.release_index_worker(worker))
+        self.index_workers.add(worker)  # Keep a reference until the thread has finished
+        worker.start()
+
+    def release_index_worker(self, worker):
+        """Drop a finished DocumentIndexWorker"""
+        worker.wait()
+        self.index_workers.discard(worker)
+
+    def on_document_index_ready(self, pdf_path, index):
+        """Use the document index for later pages; an index for a previously loaded PDF is dropped"""
+        if pdf_path == self.current_pdf_path:
+            self.document_index = index
+
     def extract_text_blocks(self, page, scale):
-        """Extract text blocks from PDF page for text selection"""
-        try:
-            text_blocks = []
-            
-            # Extract word-level text with positions
-            words = page.get_text("words")  # Returns list of (x0, y0, x1, y1, "word", block_no, line_no, word_no)
-            
-            for word in words:
-                if len(word) >= 5:  # Ensure we have all required fields
-                    x0, y0, x1, y1, text = word[:5]
-                    # Scale coordinates to match display
-                    text_blocks.append({
-                        'bbox': (x0 * scale, y0 * scale, x1 * scale, y1 * scale),
-                        'text': text
-                    })
-            
-            print(f"DEBUG: Extracted {len(text_blocks)} text blocks for selection")
-            self.pdf_label.set_text_blocks(text_blocks)
-            self.pdf_label.current_page = self.current_page  # Update page number for text selection
-            
-        except Exception as e:
-            print(f"DEBUG: Text extraction failed: {e}")
-            self.pdf_label.set_text_blocks([])
-            self.pdf_label.current_page = self.current_page
+        """Start extracting text blocks for text selection on a worker thread.
+        The page is shown immediately and becomes selectable when the blocks arrive."""
+        self.text_generation += 1
+        self.pdf_label.set_text_blocks([])  # Old page's words must not be selectable meanwhile
+        self.pdf_label.current_page = self.current_page  # Update page number for text selection
+        
+        worker = TextBlockWorker(self.text_generation, self.current_pdf_path, page.number, scale,
+                                 self.document_index)
+        worker.blocks_ready.connect(self.on_text_blocks_ready)
+        worker.finished.connect(lambda: self.release_text_worker(worker))
+        self.text_workers.add(worker)  # Keep a reference until the thread has finished
+        worker.start()
+    
+    def release_text_worker(self, worker):
+        """Drop a finished TextBlockWorker (wait() returns at once; the thread is exiting)"""
+        worker.wait()
+        self.text_workers.discard(worker)
+    
+    def on_text_blocks_ready(self, generation, page_num, text_blocks):
+        """Receive text blocks from TextBlockWorker; results for an older page/zoom are dropped"""
+        if generation != self.text_generation:
+            print(f"DEBUG: Dropped stale text blocks for page {page_num + 1}")
+            return
+        print(f"DEBUG: Extracted {len(text_blocks)} text blocks for selection")
+        self.pdf_label.set_text_blocks(text_blocks)
+        self.pdf_label.current_page = page_num
 
     def update_page_controls(self):
         """Update page navigation controls"""
@@ -744,6 +957,13 @@ class EmbeddedPDFViewer(QWidget):
             self.prev_btn.setEnabled(False)
             self.next_btn.setEnabled(False)
     
+    def go_to_page(self, page_num):
+        """Show a specific page (0-based) of the loaded PDF"""
+        if self.pdf_document and 0 <= page_num < self.total_pages:
+            self.current_page = page_num
+            self.render_current_page()
+            self.update_page_controls()
+
     def previous_page(self):
         """Go to previous page"""
         if hasattr(self, 'current_page') and self.current_page > 0:
@@ -782,28 +1002,21 @@ class EmbeddedPDFViewer(QWidget):
             self.pdf_width = rect.width
             self.pdf_height = rect.height
             
-            # Use zoom control to determine scale
-            zoom_text = self.zoom_combo.currentText()
-            scale = self.calculate_zoom_scale(zoom_text)
-            
-            # Apply minimum/maximum constraints for usability
-            min_scale = 0.3
-            max_scale = 3.0
-            scale = max(min_scale, min(scale, max_scale))
+            # Use zoom control to determine scale (clamped for usability)
+            scale = self.page_scale(self.current_page)
                 
             display_width = int(self.pdf_width * scale)
             display_height = int(self.pdf_height * scale)
             
             print(f"DEBUG: Rendering page {self.current_page + 1}/{self.total_pages} at {display_width} x {display_height} (scale: {scale:.2f})")
             
-            # Render at calculated size
-            mat = fitz.Matrix(scale, scale)
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("ppm")
-            
-            from PySide6.QtGui import QPixmap
-            qimg = QPixmap()
-            qimg.loadFromData(img_data)
+            # Render at calculated size (or reuse a cached/prefetched render)
+            cache_key = PageRenderCache.make_key(self.document_key, self.current_page, scale)
+            image = self.page_cache.get(cache_key)
+            if image is None:
+                image, nbytes = render_page_image(page, scale)
+                self.page_cache.put(cache_key, image, nbytes)
+            qimg = QPixmap.fromImage(image)
             
             # Set the pixmap and adjust label size
             self.pdf_label.setPixmap(qimg)
@@ -813,6 +1026,11 @@ class EmbeddedPDFViewer(QWidget):
             # Extract text blocks for selection
             self.extract_text_blocks(page, scale)
             
+            # Pre-render the neighbouring pages while this one is being read
+            neighbours = [n for n in (self.current_page + 1, self.current_page - 1) if 0 <= n < self.total_pages]
+            self.page_prefetcher.request(self.current_pdf_path, self.document_key,
+                                         [(n, self.page_scale(n)) for n in neighbours])
+            
             return True
             
         except Exception as e:
@@ -862,9 +1080,17 @@ class PDFViewer(QWidget):
     def __init__(self):
         super().__init__()
         self.pdf_document = None
+        self.pdf_path = None
+        self.parent_window = None  # Set by the host window for status bar / Human Input callbacks
         self.current_page = 0
         self.zoom_level = 1.0
         self.text_blocks = []  # Store text block positions for selection
+        # Whole-document search: index built in the background on first search
+        self.search_index = None
+        self.search_worker = None
+        self.pending_search = None
+        self.last_search = None
+        self.search_hits = []  # Hit list for last_search (see utils/search_index.py)
         self.setup_ui()
         
     def setup_ui(self):
@@ -984,8 +1210,15 @@ class PDFViewer(QWidget):
         """Load a PDF file for viewing with proper initial sizing"""
         try:
             self.pdf_document = fitz.open(pdf_path)
+            self.pdf_path = pdf_path
             self.current_page = 0
             
+            # Search results belong to the previous document
+            self.search_index = None
+            self.pending_search = None
+            self.last_search = None
+            self.search_hits = []
+            
             # Get page dimensions first
             dims = self.get_pdf_page_dimensions(0)
             if dims:
@@ -1016,16 +1249,9 @@ class PDFViewer(QWidget):
         try:
             page = self.pdf_document[self.current_page]
             
-            # Create transformation matrix for zoom
-            mat = fitz.Matrix(self.zoom_level, self.zoom_level)
-            
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to QPixmap
-            img_data = pix.tobytes("ppm")
-            qimg = QPixmap()
-            qimg.loadFromData(img_data)
+            # Render page straight into a QPixmap (no image encoding round-trip)
+            image, _ = render_page_image(page, self.zoom_level)
+            qimg = QPixmap.fromImage(image)
             
             # Set the pixmap to the label
             self.pdf_label.setPixmap(qimg)
@@ -1071,16 +1297,9 @@ class PDFViewer(QWidget):
         try:
             page = self.pdf_document[self.current_page]
             
-            # Create transformation matrix for zoom
-            mat = fitz.Matrix(self.zoom_level, self.zoom_level)
-            
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to QPixmap
-            img_data = pix.tobytes("ppm")
-            qpixmap = QPixmap()
-            qpixmap.loadFromData(img_data)
+            # Render page straight into a QPixmap (no image encoding round-trip)
+            image, _ = render_page_image(page, self.zoom_level)
+            qpixmap = QPixmap.fromImage(image)
             
             # Extract text blocks for selection with improved coordinate mapping
             text_blocks = []
@@ -1216,7 +1435,8 @@ class PDFViewer(QWidget):
             self.update_controls()
     
     def find_and_highlight_text(self):
-        """Search for text in PDF using PyMuPDF and add to Human Input"""
+        """Search the whole PDF and add the matches on the hit page to Human Input.
+        Searching for the same text again jumps to the next page with a match."""
         search_text = self.search_input.text().strip()
         if not search_text:
             QMessageBox.information(self, "No Search Text", "Please enter text to search for.")
@@ -1230,39 +1450,95 @@ class PDFViewer(QWidget):
             QMessageBox.warning(self, "Error", "Parent window reference not set.")
             return
         
+        if self.search_index is None:
+            # First search in this document: index it off the GUI thread, then answer
+            self.pending_search = search_text
+            self.start_search_index_build()
+            self.parent_window.statusBar().showMessage("🔎 Indexing document for search...")
+            return
+        
+        self.show_search_results(search_text)
+    
+    def start_search_index_build(self):
+        """Build the document-wide search index on a worker thread (once per document)"""
+        if self.search_worker is not None:
+            return  # Already building; on_search_index_ready picks up pending_search
+        self.search_worker = SearchIndexWorker(self.pdf_path)
+        self.search_worker.index_ready.connect(self.on_search_index_ready)
+        self.search_worker.start()
+    
+    def shutdown(self):
+        """Wait for a search index build still running (call before the viewer is destroyed)"""
+        self.pending_search = None
+        if self.search_worker is not None:
+            self.search_worker.requestInterruption()
+            self.search_worker.wait()
+            self.search_worker = None
+
+    def closeEvent(self, event):
+        self.shutdown()
+        super().closeEvent(event)
+    
+    def on_search_index_ready(self, index):
+        """Receive the search index and run the search that was waiting for it"""
+        worker = self.search_worker
+        if worker is None:
+            return  # The viewer was shut down while indexing
+        worker.wait()
+        self.search_worker = None
+        
+        if worker.pdf_path != self.pdf_path:
+            # A different PDF was loaded while indexing
+            if self.pending_search:
+                self.start_search_index_build()
+            return
+        
+        if index is None:
+            self.pending_search = None
+            if self.parent_window:
+                self.parent_window.statusBar().showMessage("❌ Could not index document for search", 3000)
+            return
+        
+        self.search_index = index
+        search_text, self.pending_search = self.pending_search, None
+        if search_text:
+            self.show_search_results(search_text)
+    
+    def show_search_results(self, search_text):
+        """Jump to the next page with a match and add that page's matches to Human Input"""
         try:
-            # Search in current page
-            import fitz
-            page = self.pdf_document[self.current_page]
+            hits = self.search_index.search(search_text)
+            if not hits:
+                self.search_hits = []
+                self.last_search = None
+                self.parent_window.statusBar().showMessage(f"❌ '{search_text}' not found in document", 3000)
+                return
             
-            # Search with case-insensitive and dehyphenate flags
-            flags = fitz.TEXT_IGNORECASE | fitz.TEXT_DEHYPHENATE
-            hits = page.search_for(search_text, flags=flags, quads=True)
-            
-            if hits:
-                # Extract the found text instances
-                found_texts = []
-                for i, quads in enumerate(hits):
-                    # Get the actual text from the quad coordinates
-                    rect = quads.rect if hasattr(quads, 'rect') else fitz.Rect(quads)
-                    found_text = page.get_textbox(rect)
-                    if found_text.strip():
-                        found_texts.append(found_text.strip())
-                
-                # Add to Human Input via parent window
-                if found_texts:
-                    result_text = "\n".join(found_texts)
-                    self.parent_window.on_text_selected(result_text)
-                    self.parent_window.statusBar().showMessage(
-                        f"✅ Found {len(found_texts)} match(es) on page {self.current_page + 1}", 3000
-                    )
-                else:
-                    self.parent_window.statusBar().showMessage("No text extracted from matches", 2000)
+            hit_pages = sorted({hit['page'] for hit in hits})
+            if search_text != self.last_search:
+                # New search: first page with a match at or after the current page
+                self.search_hits = hits
+                self.last_search = search_text
+                target_page = next((p for p in hit_pages if p >= self.current_page), hit_pages[0])
             else:
-                self.parent_window.statusBar().showMessage(
-                    f"❌ '{search_text}' not found on page {self.current_page + 1}", 3000
-                )
-                
+                # Repeated search: next page with a match, wrapping around
+                target_page = next((p for p in hit_pages if p > self.current_page), hit_pages[0])
+            
+            if target_page != self.current_page:
+                self.current_page = target_page
+                self.render_page()
+                self.update_controls()
+            
+            page_hits = [hit for hit in hits if hit['page'] == target_page]
+            
+            # Add to Human Input via parent window
+            self.parent_window.on_text_selected("\n".join(hit['text'] for hit in page_hits))
+            pages = ", ".join(str(p + 1) for p in hit_pages)
+            self.parent_window.statusBar().showMessage(
+                f"✅ Found {len(hits)} match(es) on page(s) {pages} - showing page {target_page + 1} "
+                f"({len(page_hits)} here, search again for the next page)", 5000
+            )
+            
         except Exception as e:
             print(f"Error searching PDF: {e}")
             QMessageBox.warning(self, "Search Error", f"Error searching PDF:\n{str(e)}")
@@ -1390,13 +1666,35 @@ class EnhancedTrainingInterface(QMainWindow):
         self.setMinimumSize(900, 600)  # Minimum usable size
         
         # Training data storage
-        self.training_data = []
+        self.training_entries = {}  # filename -> decision entry, in the order decisions were saved
         self.current_paper_index = 0
         self.papers_list = []
+        self.papers_in_folder = set()  # papers_list as a set, for constant-time membership
+        self.processed_count = 0  # Uploaded papers in papers_list, kept current on state changes
         self.pdf_folder = ""
         
-        # Paper state persistence - stores content for each paper
-        self.paper_states = {}  # filename -> {human_text, ai_text, decision, uploaded}
+        # Paper state persistence - full states are read from the store when a paper is opened
+        self.paper_summaries = {}  # filename -> {uploaded, has_decision, has_evidence}
+        
+        # Full-text index over the loaded folder, kept current in the background
+        self.corpus_index = None
+        self.corpus_worker = None
+        self.retired_corpus_workers = set()  # Interrupted runs still finishing their current paper
+        self.corpus_indexing = False
+        self.corpus_reindex_pending = False  # Folder changed while it was being indexed
+        
+        # Watch the loaded folder so PDFs added or removed during a session show up without a reload
+        self.folder_watcher = QFileSystemWatcher(self)
+        self.folder_watcher.directoryChanged.connect(self.on_folder_changed)
+        # Copying a PDF fires several change events; rescan once they settle
+        self.folder_rescan_timer = QTimer(self)
+        self.folder_rescan_timer.setSingleShot(True)
+        self.folder_rescan_timer.setInterval(1000)
+        self.folder_rescan_timer.timeout.connect(self.rescan_folder)
+        
+        # Optional background AI analysis of upcoming papers (answers land in the result cache)
+        self.prefetch_analysis = False
+        self.analysis_prefetcher = None
         
         # Default folder in user's home directory
         self.default_pdf_folder = Path.home() / "ExtractorPDFs" 
@@ -1407,9 +1705,19 @@ class EnhancedTrainingInterface(QMainWindow):
         config_dir.mkdir(parents=True, exist_ok=True)
         self.settings_file = config_dir / "ui_settings.json"
         
+        # Paper states live in their own store, written one paper at a time;
+        # only the compact summaries are loaded up front
+        self.paper_store = PaperStateStore(config_dir / "paper_states.sqlite3")
+        self.paper_summaries = self.paper_store.summaries()
+        # Edits are saved once navigation pauses rather than on every click
+        self.state_save_timer = QTimer(self)
+        self.state_save_timer.setSingleShot(True)
+        self.state_save_timer.setInterval(750)
+        self.state_save_timer.timeout.connect(self.save_settings)
+        
         # Initialize without loading any local training data
         # Each session starts fresh - decisions go directly to GitHub
-        self.training_data = []
+        self.training_entries = {}
         self.load_settings()
         
         # Create menu bar
@@ -1446,6 +1754,19 @@ class EnhancedTrainingInterface(QMainWindow):
         config_action.triggered.connect(self.show_configuration)
         config_action.setStatusTip('Configure API keys and GitHub repository settings')
         
+        # Search across every paper in the folder
+        search_action = file_menu.addAction('🔎 Search All Papers...')
+        search_action.setShortcut('Ctrl+Shift+F')
+        search_action.triggered.connect(self.show_corpus_search)
+        search_action.setStatusTip('Find which papers in the folder mention a word or phrase')
+        
+        # Background AI analysis of the next papers
+        prefetch_action = file_menu.addAction('⚡ Pre-analyze Upcoming Papers')
+        prefetch_action.setCheckable(True)
+        prefetch_action.setChecked(self.prefetch_analysis)
+        prefetch_action.toggled.connect(self.toggle_analysis_prefetch)
+        prefetch_action.setStatusTip('Run AI analysis of the next few papers in the background (uses API credits)')
+        
         file_menu.addSeparator()
         
         # Exit action
@@ -1466,6 +1787,10 @@ class EnhancedTrainingInterface(QMainWindow):
         usage_action.triggered.connect(self.show_quick_help)
         usage_action.setStatusTip('Quick help and FAQ')
         
+        stats_action = help_menu.addAction('📊 Analysis Statistics...')
+        stats_action.triggered.connect(self.show_analysis_statistics)
+        stats_action.setStatusTip('Time, tokens and cache use of each AI analysis pass this session')
+        
     def check_if_config_needed(self):
         """Check if configuration is needed (returns True if config missing)"""
         from configuration_dialog import load_configuration
@@ -1633,6 +1958,35 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
     
 
     
+    def show_analysis_statistics(self):
+        """Show per-pass timing, token and cache totals for this session's AI analyses"""
+        telemetry = get_ring_buffer()
+        summary = telemetry.summary()
+        if not summary:
+            QMessageBox.information(self, "Analysis Statistics", "No AI analysis has run in this session yet.")
+            return
+        
+        rows = []
+        for pass_name, totals in summary.items():
+            calls = totals['calls']
+            rows.append(
+                f"<tr><td>{pass_name}</td><td>{calls}</td><td>{totals['cache_hits']}</td>"
+                f"<td>{totals['wall_time'] / calls:.2f}s</td><td>{totals['queue_wait'] / calls:.2f}s</td>"
+                f"<td>{totals['prompt_tokens']:,}</td><td>{totals['completion_tokens']:,}</td>"
+                f"<td>{totals['context_chars'] // calls:,}</td><td>{totals['retries']}</td><td>{totals['errors']}</td></tr>"
+            )
+        analyses = telemetry.records('analysis')
+        average = sum(record['wall_time'] for record in analyses) / len(analyses) if analyses else 0
+        QMessageBox.information(self, "Analysis Statistics", f"""
+<h3>📊 AI Analysis Statistics</h3>
+<p>{len(analyses)} papers analysed this session, {average:.1f}s on average.</p>
+<table border="1" cellpadding="4" cellspacing="0">
+<tr><th>Pass</th><th>Calls</th><th>Cached</th><th>Avg time</th><th>Avg queued</th>
+<th>Prompt tokens</th><th>Completion tokens</th><th>Avg context chars</th><th>Retries</th><th>Errors</th></tr>
+{''.join(rows)}
+</table>
+""")
+        
     def show_about(self):
         """Show about dialog"""
         QMessageBox.about(self, "About DocMiner 6.1.0", 
@@ -2106,35 +2460,221 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
             self.papers_list = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
             self.papers_list.sort()  # Sort alphabetically for consistency
             self.current_paper_index = 0
+            self.recount_progress()
             self.update_progress()
+            self.watch_folder(folder_path)
             if self.papers_list:
                 self.load_current_paper()
                 self.statusBar().showMessage(f"Loaded {len(self.papers_list)} papers from {Path(folder_path).name}")
+                self.start_corpus_indexing(folder_path)
             else:
                 self.statusBar().showMessage(f"📁 No PDF files found in {Path(folder_path).name}")
         except Exception as e:
             self.statusBar().showMessage(f"Error loading folder: {e}")
             
+    def watch_folder(self, folder_path):
+        """Watch only the loaded folder for added and removed PDFs"""
+        self.folder_rescan_timer.stop()
+        watched = self.folder_watcher.directories()
+        if watched:
+            self.folder_watcher.removePaths(watched)
+        if not self.folder_watcher.addPath(folder_path):
+            print(f"Could not watch {folder_path} for new papers")
+            
+    def on_folder_changed(self, folder_path):
+        """Watched folder changed: rescan once events settle"""
+        self.folder_rescan_timer.start()
+        
+    def rescan_folder(self):
+        """Insert PDFs added to the folder into papers_list and drop removed ones, keeping the current paper"""
+        folder_path = self.pdf_folder
+        try:
+            on_disk = {f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')}
+        except OSError as e:
+            print(f"Could not rescan {folder_path}: {e}")
+            return
+        
+        added = sorted(on_disk - self.papers_in_folder)
+        removed = self.papers_in_folder - on_disk
+        if added or removed:
+            current_filename = None
+            if self.current_paper_index < len(self.papers_list):
+                current_filename = self.papers_list[self.current_paper_index]
+                if current_filename in removed:
+                    # Keep what was entered for it in case the file comes back
+                    self.save_current_paper_state()
+            
+            for filename in removed:
+                del self.papers_list[bisect.bisect_left(self.papers_list, filename)]
+                self.papers_in_folder.discard(filename)
+                if self.paper_summaries.get(filename, {}).get('uploaded', False):
+                    self.processed_count -= 1
+            for filename in added:
+                bisect.insort(self.papers_list, filename)
+                self.papers_in_folder.add(filename)
+                if self.paper_summaries.get(filename, {}).get('uploaded', False):
+                    self.processed_count += 1
+            
+            if current_filename is not None and current_filename not in removed:
+                # Same paper stays open; only its position may have moved
+                self.current_paper_index = bisect.bisect_left(self.papers_list, current_filename)
+                self.update_progress()
+            elif self.papers_list:
+                # Current paper is gone (or there was none): show the paper now at its position
+                self.current_paper_index = min(self.current_paper_index, len(self.papers_list) - 1)
+                self.update_progress()
+                self.load_current_paper()
+            else:
+                # The folder is empty now: nothing is left to show or edit
+                self.current_paper_index = 0
+                self.pdf_viewer.clear()
+                self.clear_inputs()
+                self.current_ai_findings = None
+                self.paper_info.setText("No paper selected")
+                self.paper_position.setText("")
+                self.update_progress()
+            
+            changes = []
+            if added:
+                changes.append(f"{len(added)} added")
+            if removed:
+                changes.append(f"{len(removed)} removed")
+            self.statusBar().showMessage(f"📥 Folder updated: {', '.join(changes)} ({len(self.papers_list)} papers)", 5000)
+            self.schedule_analysis_prefetch(extra_papers=added)
+        
+        # New or replaced files get their text index in the background
+        if self.papers_list:
+            self.queue_corpus_indexing()
+            
+    def queue_corpus_indexing(self):
+        """Index the loaded folder again, after the indexing run in progress if there is one"""
+        if self.corpus_worker is not None and self.corpus_worker.folder == self.pdf_folder:
+            self.corpus_reindex_pending = True
+        else:
+            self.start_corpus_indexing(self.pdf_folder)
+            
+    def start_corpus_indexing(self, folder_path):
+        """Index new or changed papers in the folder for Search All Papers"""
+        self.corpus_reindex_pending = False
+        if self.corpus_worker is not None:
+            # A newer folder replaces the one being indexed: the old run stops after its
+            # current paper, without blocking the interface
+            retired = self.corpus_worker
+            retired.requestInterruption()
+            retired.finished.connect(lambda: self.release_corpus_worker(retired))
+            self.retired_corpus_workers.add(retired)  # Keep a reference until the thread has finished
+            if retired.isFinished():
+                self.release_corpus_worker(retired)
+            self.corpus_worker = None
+        try:
+            if self.corpus_index is None:
+                self.corpus_index = CorpusIndex()
+        except Exception as e:
+            print(f"Full-text index unavailable: {e}")
+            return
+        self.corpus_indexing = True
+        self.corpus_worker = CorpusIndexWorker(self.corpus_index, folder_path)
+        self.corpus_worker.indexing_finished.connect(self.on_corpus_indexed)
+        self.corpus_worker.start()
+        
+    def release_corpus_worker(self, worker):
+        """Drop an interrupted CorpusIndexWorker once it has stopped"""
+        worker.wait()
+        self.retired_corpus_workers.discard(worker)
+        
+    def on_corpus_indexed(self, folder_path, stats):
+        """Folder index is up to date"""
+        if self.sender() is not self.corpus_worker:
+            return
+        self.corpus_worker.wait()
+        self.corpus_worker = None
+        self.corpus_indexing = False
+        if stats:
+            print(f"Indexed {Path(folder_path).name}: {stats['added']} added, {stats['updated']} updated, "
+                  f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+        if self.corpus_reindex_pending:
+            self.start_corpus_indexing(folder_path)
+            
+    def show_corpus_search(self):
+        """Search every paper in the loaded folder and jump to a hit"""
+        if not self.papers_list or self.corpus_index is None:
+            QMessageBox.information(self, "No Folder", "Load a folder of PDFs to search across papers.")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("🔎 Search All Papers")
+        dialog.resize(700, 450)
+        layout = QVBoxLayout(dialog)
+        
+        query_input = QLineEdit()
+        query_input.setPlaceholderText("Word or phrase, e.g. positionality or \"insider outsider\"")
+        layout.addWidget(query_input)
+        status_label = QLabel("Press Enter to search; double-click a result to open it")
+        layout.addWidget(status_label)
+        results_list = QListWidget()
+        results_list.setWordWrap(True)
+        layout.addWidget(results_list)
+        
+        def run_search():
+            results_list.clear()
+            query = query_input.text().strip()
+            if not query:
+                return
+            hits = self.corpus_index.search(query, folder=self.pdf_folder)
+            for hit in hits:
+                item = QListWidgetItem(f"{hit['paper']} — page {hit['page'] + 1}\n{hit['snippet']}")
+                item.setData(Qt.UserRole, hit)
+                results_list.addItem(item)
+            papers = len({hit['path'] for hit in hits})
+            message = f"{len(hits)} matching pages in {papers} papers" if hits else "No matches"
+            if self.corpus_indexing:
+                message += " (still indexing the folder...)"
+            status_label.setText(message)
+        
+        def open_result(item):
+            self.open_search_result(item.data(Qt.UserRole))
+        
+        query_input.returnPressed.connect(run_search)
+        results_list.itemDoubleClicked.connect(open_result)
+        dialog.exec()
+        
+    def open_search_result(self, hit):
+        """Switch to the paper and page of a Search All Papers hit"""
+        if hit['paper'] not in self.papers_list:
+            self.statusBar().showMessage(f"{hit['paper']} is no longer in the folder", 3000)
+            return
+        index = self.papers_list.index(hit['paper'])
+        if index != self.current_paper_index:
+            self.save_current_paper_state()
+            self.current_paper_index = index
+            self.update_progress()
+            self.load_current_paper()
+            self.load_current_paper_state()
+        self.pdf_viewer.go_to_page(hit['page'])
+        self.statusBar().showMessage(f"{hit['paper']}, page {hit['page'] + 1}", 3000)
+            
     def update_progress(self):
         """Update the processed papers counter at bottom of window"""
         if not self.papers_list:
             self.papers_completed.setText("0 papers labeled")
             return
             
-        # Count processed papers
-        processed_count = 0
-        for filename in self.papers_list:
-            if filename in self.paper_states and self.paper_states[filename].get('uploaded', False):
-                processed_count += 1
-        
+        # Processed count is maintained by schedule_state_save
         total = len(self.papers_list)
-        self.papers_completed.setText(f"{processed_count} of {total} papers processed")
+        self.papers_completed.setText(f"{self.processed_count} of {total} papers processed")
         # Also refresh the current paper status dot
         try:
             self.update_current_paper_status()
         except Exception:
             pass
         
+    def recount_progress(self):
+        """Count uploaded papers in papers_list (once per folder load; updates are incremental)"""
+        self.papers_in_folder = set(self.papers_list)
+        self.processed_count = sum(
+            1 for filename in self.papers_list if self.paper_summaries.get(filename, {}).get('uploaded', False)
+        )
+        
     def update_processing_animation(self):
         """No-op: Robbie GIF animates itself automatically"""
         # The animated GIF plays continuously, no manual frame updates needed
@@ -2185,23 +2725,68 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
         
         # Clear previous inputs ONLY if no saved state exists
         # This preserves user's work when navigating back to a paper
-        if filename not in self.paper_states or not any([
-            self.paper_states[filename].get('human_text'),
-            self.paper_states[filename].get('ai_text'),
-            self.paper_states[filename].get('decision')
-        ]):
+        summary = self.paper_summaries.get(filename)
+        if not summary or not (summary['has_evidence'] or summary['has_decision']):
             self.clear_inputs()
         
         # Load saved state for this paper (if it exists)
         self.load_current_paper_state()
         
         self.statusBar().showMessage(f"Loaded: {filename} ({current_index}/{total_papers}) - Text selection available in PDF viewer", 3000)
+        if self.analysis_prefetcher is not None and self.analysis_prefetcher.is_done(filepath):
+            self.statusBar().showMessage(f"Loaded: {filename} ({current_index}/{total_papers}) - ⚡ AI analysis is ready", 3000)
         # Update status dot for the newly loaded paper
         try:
             self.update_current_paper_status()
         except Exception:
             pass
         
+        # Keep the next papers' AI analysis running ahead of the reviewer
+        self.schedule_analysis_prefetch()
+        
+    def toggle_analysis_prefetch(self, enabled):
+        """Turn background pre-analysis of upcoming papers on or off"""
+        self.prefetch_analysis = enabled
+        if enabled:
+            self.schedule_analysis_prefetch()
+            self.statusBar().showMessage("⚡ Upcoming papers will be analyzed in the background", 3000)
+        elif self.analysis_prefetcher is not None:
+            self.analysis_prefetcher.cancel()
+        self.save_settings()
+        
+    @staticmethod
+    def prefetch_paper_analysis(pdf_path, progress_callback):
+        """Background analysis of one paper; a paper with failed passes is not counted as prefetched"""
+        result = extract_positionality(pdf_path, progress_callback=progress_callback)
+        if result.get('positionality_errors'):
+            raise RuntimeError(f"{len(result['positionality_errors'])} analysis pass(es) failed")
+        return result
+        
+    def schedule_analysis_prefetch(self, extra_papers=()):
+        """Queue AI analysis of the next few unsubmitted papers (plus extra_papers), replacing the previous queue"""
+        if not self.prefetch_analysis or not self.papers_list:
+            return
+        if not openai_credentials()[0]:
+            return  # Without a key or endpoint the analysis is the local regex fallback: nothing worth prefetching
+        
+        lookahead, max_workers, budget = prefetch_settings()
+        if self.analysis_prefetcher is None:
+            self.analysis_prefetcher = AnalysisPrefetcher(
+                self.prefetch_paper_analysis,
+                max_workers=max_workers,
+                budget=budget,
+            )
+        
+        upcoming = []
+        for index in range(self.current_paper_index + 1, len(self.papers_list)):
+            if len(upcoming) >= lookahead:
+                break
+            filename = self.papers_list[index]
+            if not self.paper_summaries.get(filename, {}).get('uploaded', False):
+                upcoming.append(filename)
+        upcoming.extend(f for f in extra_papers if f not in upcoming)
+        self.analysis_prefetcher.request([os.path.join(self.pdf_folder, f) for f in upcoming])
+        
     def clear_inputs(self):
         """Clear all input fields"""
         for btn in self.judgment_buttons.values():
@@ -2246,10 +2831,10 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
         }
         
         # Remove existing entry for this file if present
-        self.training_data = [d for d in self.training_data if d["filename"] != filename]
+        self.training_entries.pop(filename, None)
         
         # Add new entry to session data only (no local file persistence)
-        self.training_data.append(entry)
+        self.training_entries[filename] = entry
         
         # Update progress display
         self.update_progress()
@@ -2271,7 +2856,7 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
         else:
             QMessageBox.information(self, "🎉 Complete!", 
                                   f"All {len(self.papers_list)} papers have been reviewed!\n\n"
-                                  f"Total decisions made: {len(self.training_data)} papers\n\n"
+                                  f"Total decisions made: {len(self.training_entries)} papers\n\n"
                                   f"Use 'Upload Decision' to upload your final analysis to GitHub.")
             
     def previous_paper(self):
@@ -2404,7 +2989,7 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
 
     def export_training_data(self):
         """Export training data for analysis"""
-        if not self.training_data:
+        if not self.training_entries:
             QMessageBox.information(self, "No Data", "No training data to export.")
             return
             
@@ -2417,10 +3002,10 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
         if filename:
             try:
                 with open(filename, 'w') as f:
-                    json.dump(self.training_data, f, indent=2)
+                    json.dump(list(self.training_entries.values()), f, indent=2)
                 QMessageBox.information(self, "Exported", 
                                       f"Training data exported to {filename}\n\n"
-                                      f"Papers labeled: {len(self.training_data)}\n"
+                                      f"Papers labeled: {len(self.training_entries)}\n"
                                       f"Use training_analysis.py to analyze the results.")
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", f"Could not export: {e}")
@@ -2475,7 +3060,7 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
                     return  # User was warned about missing data, let them fix it
         
         # Now check if we have any training data at all
-        if not self.training_data:
+        if not self.training_entries:
             # Check if there's at least some evidence in the interface
             evidence_text = self.human_input.toPlainText().strip()
             ai_analysis = self.ai_input.toPlainText().strip()
@@ -2498,7 +3083,7 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
             
         try:
             # Process training session (save locally + upload to GitHub)
-            result = self.github_uploader.process_training_session(self.training_data, ga_name)
+            result = self.github_uploader.process_training_session(list(self.training_entries.values()), ga_name)
             print(f"DEBUG: Uploader result: {result}")  # Debug logging
             
             if result['success']:
@@ -2511,7 +3096,7 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
                                       f"Your decision has been successfully recorded and uploaded!\n\n"
                                       f"GA: {ga_name}\n"
                                       f"Session: {result['session_id']}\n"
-                                      f"Papers analyzed: {len(self.training_data)}\n\n"
+                                      f"Papers analyzed: {len(self.training_entries)}\n\n"
                                       f"Decision files created:\n"
                                       f"• {Path(result['json_file']).name}\n"
                                       f"• {Path(result['md_file']).name}\n\n"
@@ -2643,11 +3228,12 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
                             window_geometry.get("width", 1200),
                             window_geometry.get("height", 800)
                         )
-                    if "paper_states" in old_settings:
-                        self.paper_states = old_settings["paper_states"]
                     if "current_paper_index" in old_settings:
                         self.current_paper_index = old_settings["current_paper_index"]
+                    if "paper_states" in old_settings:
+                        self.import_paper_states(old_settings["paper_states"])
                 print("Migrated UI settings from old config file")
+                self.save_settings()
                 return
             except Exception as e:
                 print(f"Error migrating UI settings: {e}")
@@ -2669,19 +3255,37 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
                             window_geometry.get("height", 800)
                         )
                     
-                    # Restore paper states and current index
-                    if "paper_states" in settings:
-                        self.paper_states = settings["paper_states"]
+                    # Restore current index
                     if "current_paper_index" in settings:
                         self.current_paper_index = settings["current_paper_index"]
+                    self.prefetch_analysis = settings.get("prefetch_analysis", False)
                     
                     # Note: PDF highlights no longer persisted - text capture is sufficient
+                
+                # Older versions kept paper states in this file: move them to the store once
+                if "paper_states" in settings:
+                    self.import_paper_states(settings["paper_states"])
+                    self.save_settings()
         except Exception as e:
             print(f"Could not load settings: {e}")
             self.pdf_folder = str(self.default_pdf_folder)
 
+    def import_paper_states(self, paper_states):
+        """Move paper states from an older settings file into the paper state store"""
+        self.paper_store.put_many(paper_states)
+        self.paper_summaries = self.paper_store.summaries()
+        self.recount_progress()
+        print(f"Moved {len(paper_states)} paper states to {self.paper_store.db_path.name}")
+
     def save_settings(self):
         """Save UI settings to file (window geometry, folder, progress)"""
+        self.state_save_timer.stop()
+        try:
+            # Only papers changed since the last save are written
+            self.paper_store.flush()
+        except Exception as e:
+            print(f"Could not save paper states: {e}")
+        
         try:
             # Get current window geometry
             geometry = self.geometry()
@@ -2695,15 +3299,18 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
                     "height": geometry.height()
                 },
                 "current_paper_index": self.current_paper_index,
-                "paper_states": self.paper_states,
+                "prefetch_analysis": self.prefetch_analysis,
                 "last_updated": datetime.now().isoformat()
             }
             
-            with open(self.settings_file, 'w') as f:
+            # Write a temporary file and swap it in, so a crash never leaves a truncated file
+            tmp_file = self.settings_file.with_suffix(".json.tmp")
+            with open(tmp_file, 'w') as f:
                 json.dump(settings, f, indent=2)
             
             # Set file permissions to user-only (600)
-            os.chmod(self.settings_file, 0o600)
+            os.chmod(tmp_file, 0o600)
+            os.replace(tmp_file, self.settings_file)
         except Exception as e:
             print(f"Could not save settings: {e}")
 
@@ -2796,6 +3403,9 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
 
         current_paper = self.papers_list[self.current_paper_index]
         pdf_path = Path(self.pdf_folder) / current_paper
+        if self.analysis_prefetcher is not None:
+            # Answers already prefetched come from the cache; don't race the foreground run
+            self.analysis_prefetcher.discard(os.path.join(self.pdf_folder, current_paper))
 
         # Show progress bar and update status
         self.analysis_progress.setVisible(True)
@@ -2851,7 +3461,10 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
             findings_text = self.format_ai_findings(result, paper_name)
             self.ai_input.setHtml(findings_text)
             self.evidence_tabs.setCurrentIndex(1)
-            if result['positionality_score'] > 0.3:
+            if result.get('positionality_errors'):
+                self.statusBar().showMessage(f"⚠️ {len(result['positionality_errors'])} analysis pass(es) failed - results incomplete, try again", 8000)
+                self.current_ai_findings = result if result['positionality_score'] > 0.3 else None
+            elif result['positionality_score'] > 0.3:
                 self.statusBar().showMessage(f"✅ Found {len(result['positionality_snippets'])} potential evidence excerpts", 5000)
                 self.current_ai_findings = result
             else:
@@ -2934,6 +3547,18 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
 <b>Recommendation:</b> {recommendation}<br>
 <b>Patterns Detected:</b> {', '.join(patterns).replace('_', ' ').title() if patterns else 'None'}<br><br><br>"""
         
+        screening = result.get('positionality_prefilter')
+        if screening and screening['verdict'] == 'negative':
+            text += """<b>Screened locally:</b> no first-person or reflexivity language was found in the paper, 
+so the AI passes were skipped.<br><br>"""
+        
+        errors = result.get('positionality_errors')
+        if errors:
+            # A failed pass (rate limit, timeout) is not a "no positionality" verdict
+            failed = ', '.join(errors).replace('_', ' ').title()
+            text += f"""<b><font color="#d32f2f">⚠️ Incomplete analysis:</font></b> {failed} failed after retries. 
+Run AI Analysis again before relying on this result.<br><br>"""
+        
         if snippets:
             text += "<b><font color=\"#4CAF50\">Evidence Excerpts Found:</font></b>\n\n"
             for i, (pattern, excerpt) in enumerate(snippets.items(), 1):
@@ -3054,7 +3679,7 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
         self.statusBar().showMessage("Manual review mode - read the full paper carefully", 3000)
     
     def save_current_paper_state(self):
-        """Save the current paper's content to paper_states"""
+        """Save the current paper's content to the paper state store"""
         if not self.papers_list or self.current_paper_index >= len(self.papers_list):
             return
             
@@ -3071,26 +3696,38 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
                 decision = key
                 break
         
-        # Save to paper_states (preserve uploaded flag if it exists)
-        if filename not in self.paper_states:
-            self.paper_states[filename] = {}
-        
         # Preserve uploaded status when updating state
-        uploaded_status = self.paper_states[filename].get('uploaded', False)
+        uploaded_status = self.paper_summaries.get(filename, {}).get('uploaded', False)
         
-        self.paper_states[filename].update({
+        state = {
             'human_text': human_text,
             'ai_text': ai_text,
             'decision': decision,
             'uploaded': uploaded_status  # Preserve uploaded flag
-        })
+        }
         
-        # Persist to disk immediately for safety
-        self.save_settings()
+        # Persist shortly after, once navigation pauses
+        self.schedule_state_save(filename, state)
         
         # Refresh status dot when state is saved
         self.update_current_paper_status()
     
+    def get_paper_state(self, filename):
+        """Saved state for a paper, read from the store on demand (None if never saved)"""
+        if filename not in self.paper_summaries:
+            return None
+        return self.paper_store.get(filename)
+    
+    def schedule_state_save(self, filename, state):
+        """Stage a paper's state; it is written with the UI settings after a short pause"""
+        was_uploaded = self.paper_summaries.get(filename, {}).get('uploaded', False)
+        summary = summarize_state(state)
+        self.paper_summaries[filename] = summary
+        if summary['uploaded'] != was_uploaded and filename in self.papers_in_folder:
+            self.processed_count += 1 if summary['uploaded'] else -1
+        self.paper_store.stage(filename, state)
+        self.state_save_timer.start()  # Restarts the delay if already pending
+    
     def load_current_paper_state(self):
         """Load the saved state for current paper"""
         if not self.papers_list or self.current_paper_index >= len(self.papers_list):
@@ -3098,8 +3735,8 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
             
         filename = self.papers_list[self.current_paper_index]
         
-        if filename in self.paper_states:
-            state = self.paper_states[filename]
+        state = self.get_paper_state(filename)
+        if state is not None:
             
             # Restore text content
             self.human_input.setPlainText(state.get('human_text', ''))
@@ -3129,10 +3766,9 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
     
     def mark_paper_uploaded(self, filename):
         """Mark a paper as uploaded/processed"""
-        if filename not in self.paper_states:
-            self.paper_states[filename] = {}
-        
-        self.paper_states[filename]['uploaded'] = True
+        state = self.get_paper_state(filename) or {}
+        state['uploaded'] = True
+        self.schedule_state_save(filename, state)
         self.update_progress()  # Refresh the status indicators
         # Update the current paper status dot as it's been uploaded
         self.update_current_paper_status()
@@ -3148,16 +3784,16 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
         filename = self.papers_list[self.current_paper_index]
 
         # If uploaded marker present -> green
-        state = self.paper_states.get(filename, {})
-        if state.get('uploaded'):
+        summary = self.paper_summaries.get(filename, {})
+        if summary.get('uploaded'):
             return 'green'
 
-        # Check for any human or AI evidence or judgment
-        human = state.get('human_text', '') or self.human_input.toPlainText().strip()
-        ai = state.get('ai_text', '') or self.ai_input.toPlainText().strip()
+        # Check for any saved or on-screen human or AI evidence
+        has_evidence = (summary.get('has_evidence') or self.human_input.toPlainText().strip()
+                        or self.ai_input.toPlainText().strip())
 
         # If there's evidence or partial data -> yellow
-        if human or ai:
+        if has_evidence:
             return 'yellow'
 
         # Otherwise no data -> red
@@ -3182,9 +3818,21 @@ The "Selected Text" box below the PDF is collapsible - uncheck it to get more sp
     def closeEvent(self, event):
         """Save settings when closing"""
         self.save_settings()
+        self.pdf_viewer.shutdown()
+        if self.analysis_prefetcher is not None:
+            self.analysis_prefetcher.stop()
+        for worker in [self.corpus_worker, *self.retired_corpus_workers]:
+            if worker is not None:
+                worker.requestInterruption()
+                worker.wait()
+        close_shared_clients()  # Release the pooled API connections
         super().closeEvent(event)
 
 def main():
+    # Page prefetch uses a helper process; required for frozen (PyInstaller) builds
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     app = QApplication(sys.argv)
     
     # Set application style
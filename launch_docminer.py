@@ -143,7 +143,7 @@ class SimpleCredentialDialog(QDialog):
             # Get paths
             env_script = Path.home() / ".research_buddy" / "scripts" / "set_env.sh"
             app_dir = Path(__file__).parent
-            app_script = app_dir / "enhanced_training_interface.py"
+            app_script = app_dir / "run_docminer.py"
             
             # Create launch command that sources env and runs app
             cmd = f'source "{env_script}" && cd "{app_dir}" && python3 "{app_script}"'
@@ -9,7 +9,7 @@ For production use, see the pre-built app in releases:
 https://github.com/OhioMathTeacher/docminer/releases
 
 Usage:
-    python run_research_buddy.py
+    python run_docminer.py
 
 Requirements:
     - Python 3.11+
@@ -23,8 +23,12 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-# Import and run the main application
-from enhanced_training_interface import main
-
 if __name__ == "__main__":
+    # Before the GUI import: the page render helper process re-imports this
+    # script, and frozen builds hand it over to multiprocessing here
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    # Import and run the main application
+    from enhanced_training_interface import main
     main()
\ No newline at end of file
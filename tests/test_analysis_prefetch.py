@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for background pre-analysis of upcoming papers (utils/analysis_prefetch.py)
+"""
+
+import threading
+import time
+
+from utils.analysis_prefetch import AnalysisPrefetcher
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_requested_papers_are_analysed():
+    analysed = []
+    prefetcher = AnalysisPrefetcher(lambda path, progress: analysed.append(path), max_workers=2)
+    try:
+        prefetcher.request(["a.pdf", "b.pdf"])
+        wait_for(lambda: prefetcher.is_done("a.pdf") and prefetcher.is_done("b.pdf"))
+        prefetcher.request(["a.pdf"])  # already done: not analysed again
+        time.sleep(0.05)
+        assert sorted(analysed) == ["a.pdf", "b.pdf"]
+    finally:
+        prefetcher.stop()
+
+
+def test_cancelled_papers_do_not_use_the_budget():
+    release = threading.Event()
+
+    def analyze(path, progress):
+        if path.startswith("slow"):
+            while not release.is_set():
+                progress(50, "waiting")  # raises once the paper is cancelled
+                time.sleep(0.01)
+
+    prefetcher = AnalysisPrefetcher(analyze, max_workers=1, budget=2)
+    try:
+        prefetcher.request(["slow1.pdf"])
+        wait_for(lambda: prefetcher.stats()["running"] == 1)
+        prefetcher.cancel()
+        wait_for(lambda: prefetcher.stats()["running"] == 0)
+
+        prefetcher.request(["a.pdf", "b.pdf", "c.pdf"])
+        wait_for(lambda: prefetcher.stats()["completed"] == 2)
+        time.sleep(0.05)
+        assert prefetcher.is_done("a.pdf") and prefetcher.is_done("b.pdf")
+        assert not prefetcher.is_done("c.pdf")  # budget of two completed analyses used up
+        assert not prefetcher.is_done("slow1.pdf")
+    finally:
+        release.set()
+        prefetcher.stop()
+
+
+def test_new_request_cancels_unwanted_paper():
+    cancelled = threading.Event()
+
+    def analyze(path, progress):
+        try:
+            while True:
+                progress(50, "waiting")
+                time.sleep(0.01)
+        except Exception:
+            cancelled.set()
+            raise
+
+    prefetcher = AnalysisPrefetcher(analyze, max_workers=1)
+    try:
+        prefetcher.request(["a.pdf"])
+        wait_for(lambda: prefetcher.stats()["running"] == 1)
+        prefetcher.request(["b.pdf"])
+        assert cancelled.wait(5)
+    finally:
+        prefetcher.discard("b.pdf")
+        prefetcher.stop()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for analysis telemetry sinks (utils/analysis_telemetry.py)
+"""
+
+import json
+
+from utils import analysis_telemetry
+from utils.analysis_telemetry import JsonlSink, RingBufferSink
+
+
+def pass_record(name, **fields):
+    return {"kind": "pass", "pass": name, **fields}
+
+
+def test_ring_buffer_keeps_most_recent_records():
+    ring = RingBufferSink(capacity=3)
+    for i in range(5):
+        ring.emit({"kind": "pass" if i % 2 else "analysis", "n": i})
+    assert [record["n"] for record in ring.records()] == [2, 3, 4]
+    assert [record["n"] for record in ring.records("pass")] == [3]
+    ring.clear()
+    assert ring.records() == []
+
+
+def test_summary_aggregates_pass_records():
+    ring = RingBufferSink()
+    ring.emit(pass_record("explicit", cache="hit", wall_time=0.0, prompt_tokens=0, context_chars=800))
+    ring.emit(pass_record("explicit", cache="miss", wall_time=1.5, queue_wait=0.25, retries=2,
+                          prompt_tokens=300, completion_tokens=40, context_chars=1200))
+    ring.emit(pass_record("subtle", cache="miss", error="timeout", wall_time=30.0))
+    ring.emit({"kind": "analysis", "wall_time": 99.0})
+    summary = ring.summary()
+    assert summary["explicit"] == {
+        "calls": 2, "cache_hits": 1, "errors": 0, "retries": 2, "wall_time": 1.5, "queue_wait": 0.25,
+        "prompt_tokens": 300, "completion_tokens": 40, "context_chars": 2000,
+    }
+    assert summary["subtle"]["errors"] == 1 and summary["subtle"]["calls"] == 1
+    assert set(summary) == {"explicit", "subtle"}
+
+
+def test_jsonl_sink_appends_one_line_per_record(tmp_path):
+    path = tmp_path / "logs" / "telemetry.jsonl"
+    sink = JsonlSink(path)
+    sink.emit(pass_record("explicit", wall_time=1.25, paper="Café.pdf"))
+    sink.emit({"kind": "analysis", "path": tmp_path})  # non-JSON values are written with str()
+    sink.close()
+    sink = JsonlSink(path)
+    sink.emit({"kind": "analysis", "n": 3})
+    sink.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"kind": "pass", "pass": "explicit", "wall_time": 1.25, "paper": "Café.pdf"},
+        {"kind": "analysis", "path": str(tmp_path)},
+        {"kind": "analysis", "n": 3},
+    ]
+
+
+class FailingSink:
+    def emit(self, record):
+        raise RuntimeError("disk full")
+
+
+def test_emit_isolates_failing_sinks(capsys):
+    failing, ring = FailingSink(), RingBufferSink()
+    analysis_telemetry.add_sink(failing)
+    analysis_telemetry.add_sink(ring)
+    try:
+        analysis_telemetry.emit(pass_record("reflexive"))
+    finally:
+        analysis_telemetry.remove_sink(failing)
+        analysis_telemetry.remove_sink(ring)
+    record = ring.records()[0]
+    assert record["pass"] == "reflexive" and "timestamp" in record
+    assert "FailingSink failed: disk full" in capsys.readouterr().out
+    # The default ring buffer still received the record
+    assert analysis_telemetry.get_ring_buffer().records()[-1] is record
@@ -0,0 +1,50 @@
+"""Tests for the benchmark regression check."""
+
+from benchmarks.run_benchmarks import _timed, compare_to_baseline
+
+BASELINE = {
+    "stages": {"fast": 0.010, "slow": 1.000},
+    "spread": {"fast": 0.001, "slow": 0.100},
+}
+
+
+def _results(stages, spread):
+    return {"stages": stages, "spread": spread}
+
+
+def test_slowdown_beyond_tolerance_delta_and_noise_is_a_regression():
+    results = _results({"fast": 0.010, "slow": 2.000}, {"fast": 0.001, "slow": 0.050})
+    regressions = compare_to_baseline(results, BASELINE, tolerance=0.5, min_delta=0.020, noise_k=3)
+
+    assert [r["stage"] for r in regressions] == ["slow"]
+    assert regressions[0]["ratio"] == 2.0
+    assert abs(regressions[0]["noise"] - 0.150) < 1e-9
+
+
+def test_slowdown_within_the_noise_band_is_ignored():
+    # 1.6x and 600 ms slower, but within 3 x (100 + 150) ms of MAD
+    results = _results({"slow": 1.600}, {"slow": 0.150})
+    assert compare_to_baseline(results, BASELINE, tolerance=0.5, min_delta=0.020, noise_k=3) == []
+
+
+def test_small_absolute_slowdown_is_ignored():
+    # Three times slower, but only 20 ms
+    results = _results({"fast": 0.030}, {"fast": 0.0})
+    assert compare_to_baseline(results, BASELINE, tolerance=0.5, min_delta=0.020, noise_k=3) == []
+
+
+def test_stages_missing_from_the_baseline_are_skipped():
+    results = _results({"new_stage": 5.0}, {"new_stage": 0.0})
+    assert compare_to_baseline(results, BASELINE, tolerance=0.5, min_delta=0.020, noise_k=3) == []
+
+
+def test_timed_warms_up_and_interleaves_rounds():
+    calls = []
+    stages = {"a": lambda: calls.append("a"), "b": lambda: calls.append("b")}
+
+    timings = _timed(stages, repeat=3, warmup=1)
+
+    assert calls == ["a", "b"] * 4
+    assert set(timings) == {"a", "b"}
+    p50, mad = timings["a"]
+    assert p50 >= 0 and mad >= 0
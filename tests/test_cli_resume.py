@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for resuming an interrupted batch run of cli/py_extractor02.py
+"""
+
+import csv
+import importlib.util
+import os
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+_spec = importlib.util.spec_from_file_location(
+    "py_extractor02", Path(__file__).resolve().parent.parent / "cli" / "py_extractor02.py")
+py_extractor02 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(py_extractor02)
+
+
+def write_pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def read_rows(output_csv):
+    with open(output_csv, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == py_extractor02.CSV_HEADER
+    return rows[1:]
+
+
+def run(folder, output_csv, resume=False):
+    py_extractor02.process_pdfs(str(folder), str(output_csv), "keyword", resume=resume)
+
+
+def make_corpus(tmp_path):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    write_pdf(folder / "a.pdf", "My positionality as a researcher.")
+    write_pdf(folder / "b.pdf", "A quantitative study of test scores.")
+    return folder, tmp_path / "out.csv"
+
+
+def test_resume_skips_unchanged_papers(tmp_path):
+    folder, output_csv = make_corpus(tmp_path)
+    run(folder, output_csv)
+    first = read_rows(output_csv)
+    write_pdf(folder / "c.pdf", "Reflexivity in fieldwork.")
+    run(folder, output_csv, resume=True)
+    rows = read_rows(output_csv)
+    assert rows[:2] == first
+    assert [row[0] for row in rows] == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_resume_replaces_row_of_changed_paper(tmp_path):
+    folder, output_csv = make_corpus(tmp_path)
+    run(folder, output_csv)
+    assert [row[8] for row in read_rows(output_csv)] == ["Yes", "No"]
+    write_pdf(folder / "b.pdf", "Now with a standpoint statement.")
+    os.utime(folder / "b.pdf", (1, 1))  # make sure the mtime differs from the checkpoint
+    run(folder, output_csv, resume=True)
+    rows = read_rows(output_csv)
+    assert [row[0] for row in rows] == ["a.pdf", "b.pdf"]
+    assert rows[1][8] == "Yes"
+    checkpoint = py_extractor02.load_checkpoint(py_extractor02.checkpoint_path_for(str(output_csv)))
+    assert sorted(checkpoint) == ["a.pdf", "b.pdf"]
+
+
+def test_resume_drops_half_written_last_row(tmp_path):
+    folder, output_csv = make_corpus(tmp_path)
+    run(folder, output_csv)
+    # Simulate a crash while b.pdf's row was being written, before its checkpoint entry
+    checkpoint_path = py_extractor02.checkpoint_path_for(str(output_csv))
+    lines = Path(checkpoint_path).read_text().splitlines()
+    Path(checkpoint_path).write_text(lines[0] + "\n")
+    content = Path(output_csv).read_text(encoding="utf-8")
+    Path(output_csv).write_text(content[:content.index("b.pdf") + 12], encoding="utf-8")
+    run(folder, output_csv, resume=True)
+    assert [row[0] for row in read_rows(output_csv)] == ["a.pdf", "b.pdf"]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted context assembly (utils/context_builder.py)
+"""
+
+from utils.context_builder import (CHARS_PER_TOKEN, AnalysisContext, estimate_tokens,
+                                   split_paragraphs)
+from utils.document_index import DocumentIndex
+from utils.pattern_detector import get_detector
+
+FILLER = ("The survey instrument was administered to a stratified sample of schools across the region. "
+          "Response rates were comparable across strata and the analysis used standard weights. ") * 3
+POSITIONALITY = ("As a former classroom teacher, I acknowledge that my own background as a White woman "
+                 "shapes how I read these interviews. My positionality as an insider researcher influenced "
+                 "the questions I asked, and I reflect on this throughout the analysis. ") * 2
+REFERENCES = "Smith, J. (2019). Reflexive practice. Journal of Education, 12(3), 45-67. doi:10.1/x\n" * 8
+
+
+def make_index(pages):
+    return DocumentIndex("test", pages, [[] for _ in pages])
+
+
+def paper():
+    pages = ["Introduction\n\n" + FILLER + "\n\n" + FILLER,
+             "Methods\n\n" + FILLER + "\n\n" + FILLER,
+             "Discussion\n\n" + FILLER + "\n\n" + POSITIONALITY,
+             "References\n\n" + REFERENCES]
+    return AnalysisContext(make_index(pages))
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("x" * (CHARS_PER_TOKEN * 10 + 1)) == 11
+
+
+def test_split_paragraphs_breaks_at_blank_lines_and_headings():
+    text = "A" * 100 + "\n\n" + "B" * 100 + "\nHeading\n" + "C" * 100
+    heading_offset = text.index("Heading")
+    spans = split_paragraphs(text, breaks={heading_offset})
+    assert [text[start:end].strip()[0] for start, end in spans] == ["A", "B", "H"]
+
+
+def test_vocabulary_counts_pattern_detector_matches():
+    context = paper()
+    for paragraph in context.paragraphs:
+        assert paragraph["vocabulary"] == len(get_detector().scan(paragraph["text"]))
+    assert max(paragraph["vocabulary"] for paragraph in context.paragraphs) > 0
+
+
+def test_positionality_paragraph_deep_in_paper_is_selected():
+    context = paper()
+    selected = context.select("explicit", budget=estimate_tokens(POSITIONALITY) + 10)
+    assert len(selected) == 1
+    assert "positionality" in selected[0]["text"]
+    assert selected[0]["page"] == 2
+
+
+def test_selection_fits_budget_in_document_order():
+    context = paper()
+    selected = context.select("subtle", budget=300)
+    assert sum(paragraph["tokens"] for paragraph in selected) <= 300
+    offsets = [paragraph["offset"] for paragraph in selected]
+    assert offsets == sorted(offsets)
+
+
+def test_references_are_never_sent():
+    context = paper()
+    assert any(paragraph["section"] == "references" for paragraph in context.paragraphs)
+    text = context.build("subtle", budget=100000)
+    assert "Journal of Education" not in text
+
+
+def test_short_text_falls_back_to_start_of_document():
+    context = AnalysisContext(make_index(["Title", "Page 2"]))
+    assert context.paragraphs == []
+    assert context.build("explicit") == "Title\nPage 2"
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the folder-wide full-text index (utils/corpus_index.py)
+"""
+
+import os
+import sqlite3
+
+import fitz  # PyMuPDF
+import pytest
+
+from utils.corpus_index import CorpusIndex, to_match_query
+
+
+def write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def make_folder(tmp_path):
+    folder = tmp_path / "papers"
+    folder.mkdir()
+    write_pdf(folder / "a.pdf", ["Introduction to the study.", "As an insider/outsider researcher I reflect."])
+    write_pdf(folder / "b.pdf", ["Regression results for test scores."])
+    return folder
+
+
+def test_to_match_query_quotes_every_term():
+    assert to_match_query('insider/outsider "my position"') == '"insider outsider" "my position"'
+    assert to_match_query("  ;;  ") == ""
+
+
+def test_update_and_search(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(tmp_path / "cache"))
+    folder = make_folder(tmp_path)
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    assert index.update_folder(folder)["added"] == 2
+
+    hits = index.search("insider/outsider", folder=folder)
+    assert [(hit["paper"], hit["page"]) for hit in hits] == [("a.pdf", 1)]
+    assert "[insider/outsider]" in hits[0]["snippet"]
+    assert index.search("reflecting", folder=folder)[0]["paper"] == "a.pdf"  # stemmed
+    assert index.stats(folder) == {"papers": 2, "pages": 3, "db_path": str(index.db_path)}
+
+
+def test_update_is_incremental(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(tmp_path / "cache"))
+    folder = make_folder(tmp_path)
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    index.update_folder(folder)
+
+    os.utime(folder / "a.pdf", (1, 1))  # touched, same content
+    write_pdf(folder / "b.pdf", ["Now about standpoint theory."])
+    stats = index.update_folder(folder)
+    assert (stats["unchanged"], stats["updated"], stats["added"]) == (1, 1, 0)
+    assert index.search("standpoint", folder=folder)[0]["paper"] == "b.pdf"
+
+    os.remove(folder / "b.pdf")
+    assert index.update_folder(folder)["removed"] == 1
+    assert index.search("standpoint", folder=folder) == []
+
+
+def test_update_stops_when_asked(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(tmp_path / "cache"))
+    folder = make_folder(tmp_path)
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    stats = index.update_folder(folder, should_stop=lambda: True)
+    assert stats["added"] == 0 and index.stats(folder)["papers"] == 0
+
+
+def test_connections_are_closed(tmp_path, monkeypatch):
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(tmp_path / "cache"))
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    folder = make_folder(tmp_path)
+    index = CorpusIndex(tmp_path / "corpus.sqlite3")
+    index.update_folder(folder)
+    index.search("insider", folder=folder)
+    index.stats()
+    assert opened
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")  # closed
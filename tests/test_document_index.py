@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the page-level text index and its on-disk cache (utils/document_index.py)
+"""
+
+import shutil
+from collections import OrderedDict
+
+import fitz  # PyMuPDF
+import pytest
+
+from utils import document_index, result_cache
+from utils.document_index import DocumentIndex, detect_headings, load_document_index, sections_from_headings
+from utils.result_cache import ResultCache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Empty cache directory and cleared in-memory caches."""
+    directory = tmp_path / "cache"
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(directory))
+    monkeypatch.setattr(result_cache, "_result_cache", None)
+    monkeypatch.setattr(document_index, "_memory_cache", OrderedDict())
+    monkeypatch.setattr(document_index, "_path_hashes", OrderedDict())
+    return directory
+
+
+def write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_detect_headings():
+    pages = [
+        "Journal of Studies\nA Title\nAbstract\nWe study things.\n1. Introduction\nText.",
+        "Journal of Studies\nIII. Methods and Data\nthe results below are lower case\nResults:",
+        "Journal of Studies\nResults and Discussion\n" + "Discussion " * 10 + "\nReferences",
+    ]
+    headings = detect_headings(pages)
+    assert [(h["section"], h["text"], h["page"]) for h in headings] == [
+        ("abstract", "Abstract", 0),
+        ("introduction", "1. Introduction", 0),
+        ("methods", "III. Methods and Data", 1),
+        ("results", "Results:", 1),
+        ("results", "Results and Discussion", 2),
+        ("references", "References", 2),
+    ]
+    full_text = "\n".join(pages)
+    for heading in headings:
+        assert full_text[heading["offset"]:].startswith(heading["text"])
+
+
+def test_running_headers_are_not_headings():
+    pages = ["Discussion\nBody text on page %d." % n for n in range(3)]
+    assert detect_headings(pages) == []
+
+
+def test_section_boundaries():
+    headings = [
+        {"section": "introduction", "offset": 10},   # table of contents entry
+        {"section": "methods", "offset": 20},
+        {"section": "introduction", "offset": 100},  # the real section
+        {"section": "methods", "offset": 400},
+    ]
+    assert sections_from_headings(headings, 500) == {"introduction": (100, 400), "methods": (400, 500)}
+
+
+def test_document_index_offsets_and_sections():
+    index = DocumentIndex("x", ["Introduction\nHello there.", "Methods\nWe asked people."], [[], []])
+    assert index.page_offsets == [0, 26]
+    assert index.page_for_offset(0) == 0 and index.page_for_offset(26) == 1 and index.page_for_offset(-5) == 0
+    assert index.section_text("introduction") == "Introduction\nHello there.\n"
+    assert index.section_text("methods", max_chars=7) == "Methods"
+    assert index.section_text("results") == ""
+    assert index.words(5) == []
+    restored = DocumentIndex.from_dict(index.to_dict())
+    assert restored.full_text == index.full_text and restored.headings == index.headings
+
+
+def test_index_is_reused_by_file_hash(cache_dir, tmp_path, monkeypatch):
+    path = tmp_path / "paper.pdf"
+    write_pdf(path, ["Introduction\nText one.", "Methods\nText two."])
+    first = load_document_index(str(path))
+    assert load_document_index(str(path)) is first  # memory
+    stored = list((cache_dir / "index").glob("*.json.gz"))
+    assert [p.name for p in stored] == [f"{first.sha256}.json.gz"]
+
+    # A copy with the same bytes is served from disk without extracting text again
+    monkeypatch.setattr(document_index, "_memory_cache", OrderedDict())
+    monkeypatch.setattr(DocumentIndex, "build", classmethod(lambda cls, doc, sha256=None: pytest.fail("rebuilt")))
+    copy = tmp_path / "copy.pdf"
+    shutil.copy(path, copy)
+    reloaded = load_document_index(str(copy))
+    assert reloaded.sha256 == first.sha256 and reloaded.pages == first.pages
+
+
+def test_changed_file_gets_a_new_index(cache_dir, tmp_path):
+    path = tmp_path / "paper.pdf"
+    write_pdf(path, ["Version one."])
+    first = load_document_index(str(path))
+    write_pdf(path, ["Version two, longer."])
+    second = load_document_index(str(path))
+    assert second.sha256 != first.sha256
+    assert second.pages[0].startswith("Version two")
+
+
+def test_path_hashes_are_bounded(cache_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(document_index, "_path_hashes_size", 2)
+    for n in range(4):
+        path = tmp_path / f"paper{n}.pdf"
+        write_pdf(path, [f"Paper {n}."])
+        load_document_index(str(path))
+    assert [key[0] for key in document_index._path_hashes] == [str(tmp_path / "paper2.pdf"),
+                                                                str(tmp_path / "paper3.pdf")]
+
+
+def test_stored_indexes_share_the_result_cache_budget(cache_dir, tmp_path, monkeypatch):
+    paths = []
+    for n in range(4):
+        paths.append(tmp_path / f"paper{n}.pdf")
+        write_pdf(paths[-1], [f"Paper {n} " + "text " * 200])
+    shas = [load_document_index(str(paths[0])).sha256]
+    index_size = next((cache_dir / "index").glob("*.json.gz")).stat().st_size
+
+    # Room for two indexes: writing more evicts the least recently used
+    monkeypatch.setattr(result_cache, "_result_cache", ResultCache(cache_dir, max_bytes=index_size * 2 + 10))
+    shas += [load_document_index(str(path)).sha256 for path in paths[1:]]
+    budget = result_cache.get_cache_budget()
+    stats = budget.stats()
+    assert stats["index_entries"] == 2 and stats["bytes"] <= budget.max_bytes
+    assert sorted(p.name for p in (cache_dir / "index").glob("*.json.gz")) == sorted(
+        f"{sha}.json.gz" for sha in shas[2:])
+
+    assert budget.clear()["removed"] == 2
+    assert list((cache_dir / "index").glob("*.json.gz")) == []
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline chat-completions provider (utils/fake_llm_provider.py)
+"""
+
+import openai
+import pytest
+
+from utils.fake_llm_provider import FakeChatProvider, start_server
+
+MESSAGES = [{"role": "system", "content": "Answer YES or NO."},
+            {"role": "user", "content": "Text:\n\nI position myself as an insider. More text."}]
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(provider):
+        server, base_url = start_server(provider)
+        servers.append(server)
+        return openai.OpenAI(api_key="offline", base_url=base_url, max_retries=0)
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def ask(client, timeout=5.0):
+    return client.chat.completions.create(model="fake", messages=MESSAGES, timeout=timeout)
+
+
+def test_from_url():
+    provider = FakeChatProvider.from_url("fake://?latency_ms=5&yes_rate=1&seed=3&hang_seconds=2")
+    assert (provider.latency_ms, provider.yes_rate, provider.seed, provider.hang_seconds) == (5, 1, 3, 2)
+
+
+def test_answers_are_deterministic():
+    first = FakeChatProvider(latency_ms=0, yes_rate=0.5, seed=1)
+    second = FakeChatProvider(latency_ms=0, yes_rate=0.5, seed=1)
+    prompts = [[{"role": "user", "content": f"paper {i}"}] for i in range(50)]
+    answers = [first.answer(prompt) for prompt in prompts]
+    assert answers == [second.answer(prompt) for prompt in prompts]
+    assert {answer.split("\n")[0] for answer in answers} == {"YES", "NO"}
+    assert FakeChatProvider(yes_rate=1).answer(MESSAGES) == "YES\nI position myself as an insider"
+
+
+def test_successful_completion(serve):
+    provider = FakeChatProvider(latency_ms=1, yes_rate=1)
+    response = ask(serve(provider))
+    assert response.choices[0].message.content.startswith("YES")
+    assert response.usage.prompt_tokens > 0
+    assert provider.stats()["ok"] == 1
+
+
+def test_rate_limit_sends_retry_after(serve):
+    client = serve(FakeChatProvider(latency_ms=1, rate_limit_rate=1, retry_after=7))
+    with pytest.raises(openai.RateLimitError) as caught:
+        ask(client)
+    assert caught.value.response.headers["retry-after"] == "7"
+
+
+def test_server_error(serve):
+    with pytest.raises(openai.InternalServerError):
+        ask(serve(FakeChatProvider(latency_ms=1, error_rate=1)))
+
+
+def test_timeout_is_a_client_timeout(serve):
+    provider = FakeChatProvider(latency_ms=1, timeout_rate=1, hang_seconds=2)
+    with pytest.raises(openai.APITimeoutError):
+        ask(serve(provider), timeout=0.2)
+    assert provider.stats()["timeouts"] == 1
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared, pooled OpenAI clients (utils/openai_client.py)
+"""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+from utils import openai_client
+from utils.openai_client import (close_async_clients, close_shared_clients, detect_provider,
+                                 get_shared_async_client, get_shared_client)
+
+
+def test_detect_provider():
+    assert detect_provider("sk-or-abc")[1] == "https://openrouter.ai/api/v1"
+    assert detect_provider("sk-proj-abc")[1] == "https://api.openai.com/v1"
+    assert detect_provider("whatever")[0].startswith("Unknown")
+
+
+def test_sync_client_is_shared_until_configuration_changes():
+    try:
+        client = get_shared_client("sk-test")
+        assert get_shared_client("sk-test") is client
+        assert client.max_retries == 0  # retries belong to the request scheduler
+        other = get_shared_client("sk-other")
+        assert other is not client
+        assert client.is_closed()  # the replaced client's connection pool is released
+        assert not other.is_closed()
+        assert list(openai_client._clients) == [("sk-other", "https://api.openai.com/v1")]
+    finally:
+        close_shared_clients()
+    assert not openai_client._clients
+
+
+def test_fake_provider_is_imported_only_when_used():
+    check = "import sys, utils.openai_client; print('utils.fake_llm_provider' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True,
+                            cwd=str(Path(__file__).resolve().parent.parent))
+    assert output.stdout.strip() == "False"
+
+
+def test_fake_base_url_starts_a_loopback_provider():
+    try:
+        client = get_shared_client("offline", "fake://?latency_ms=1&seed=7")
+        assert str(client.base_url).startswith("http://127.0.0.1:")
+        answer = client.chat.completions.create(model="fake", messages=[{"role": "user", "content": "hi"}])
+        assert answer.choices[0].message.content
+        assert openai_client.fake_provider_stats("fake://?latency_ms=1&seed=7")["ok"] == 1
+    finally:
+        close_shared_clients()
+
+
+def test_async_clients_are_per_loop_and_closed():
+    async def use():
+        client = get_shared_async_client("sk-test")
+        assert get_shared_async_client("sk-test") is client
+        assert client.max_retries == 0
+        await close_async_clients()
+        return client
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    assert first is not second
+    assert first.is_closed() and second.is_closed()
+    assert not openai_client._async_clients
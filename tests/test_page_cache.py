@@ -0,0 +1,187 @@
+"""Tests for the rendered-page cache and the background page prefetcher."""
+
+import threading
+import time
+
+import fitz
+import pytest
+
+from utils.page_cache import PagePrefetcher, PageRenderCache, render_page_samples
+
+
+def _to_image(data):
+    width, height, stride, samples = data
+    return data, len(samples)
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "paper.pdf"
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((20, 40), f"Page {i + 1}")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class InProcessPrefetcher(PagePrefetcher):
+    """Renders on the prefetch thread; can hold each render until released."""
+
+    def __init__(self, cache, to_image, gate=None):
+        self.gate = gate
+        self.started = []
+        super().__init__(cache, to_image)
+
+    def _render(self, pdf_path, page_num, scale):
+        self.started.append(page_num)
+        if self.gate is not None:
+            self.gate.wait(timeout=10)
+        return render_page_samples(pdf_path, page_num, scale)
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+    cache = PageRenderCache(max_bytes=100)
+    cache.put("a", "A", 40)
+    cache.put("b", "B", 40)
+    assert cache.get("a") == "A"  # a is now the most recent
+    cache.put("c", "C", 40)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.stats()["bytes"] == 80
+
+
+def test_cache_replacing_a_key_updates_its_size():
+    cache = PageRenderCache(max_bytes=100)
+    cache.put("a", "A", 60)
+    cache.put("a", "A2", 30)
+    cache.put("b", "B", 70)
+
+    assert cache.get("a") == "A2"
+    assert cache.stats()["bytes"] == 100
+
+
+def test_cache_skips_pages_larger_than_the_budget():
+    cache = PageRenderCache(max_bytes=100)
+    cache.put("a", "A", 50)
+    cache.put("huge", "H", 101)
+
+    assert "huge" not in cache
+    assert "a" in cache
+
+
+def test_cache_counts_hits_and_misses():
+    cache = PageRenderCache(max_bytes=100)
+    cache.put(PageRenderCache.make_key("doc", 0, 1.5), "A", 10)
+
+    assert cache.get(PageRenderCache.make_key("doc", 0, 1.5000001)) == "A"
+    assert cache.get(PageRenderCache.make_key("doc", 1, 1.5)) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_render_page_samples_returns_rgb_samples(pdf_path):
+    width, height, stride, samples = render_page_samples(str(pdf_path), 0, 1.0)
+    assert (width, height) == (200, 200)
+    assert len(samples) == stride * height
+    assert render_page_samples(str(pdf_path), 10, 1.0) is None
+
+
+def test_request_fills_the_cache(pdf_path):
+    cache = PageRenderCache()
+    prefetcher = InProcessPrefetcher(cache, _to_image)
+    try:
+        prefetcher.request(pdf_path, "doc", [(1, 1.0), (2, 1.0), (99, 1.0)])
+        keys = [PageRenderCache.make_key("doc", n, 1.0) for n in (1, 2)]
+        assert _wait_for(lambda: all(key in cache for key in keys))
+        assert PageRenderCache.make_key("doc", 99, 1.0) not in cache
+    finally:
+        prefetcher.stop()
+
+
+def test_request_skips_pages_already_cached(pdf_path):
+    cache = PageRenderCache()
+    cache.put(PageRenderCache.make_key("doc", 0, 1.0), "cached", 1)
+    prefetcher = InProcessPrefetcher(cache, _to_image)
+    try:
+        prefetcher.request(pdf_path, "doc", [(0, 1.0), (1, 1.0)])
+        assert _wait_for(lambda: PageRenderCache.make_key("doc", 1, 1.0) in cache)
+        assert prefetcher.started == [1]
+        assert cache.get(PageRenderCache.make_key("doc", 0, 1.0)) == "cached"
+    finally:
+        prefetcher.stop()
+
+
+def test_cancel_drops_pending_pages(pdf_path):
+    cache = PageRenderCache()
+    gate = threading.Event()
+    prefetcher = InProcessPrefetcher(cache, _to_image, gate=gate)
+    try:
+        prefetcher.request(pdf_path, "doc", [(0, 1.0), (1, 1.0), (2, 1.0)])
+        assert _wait_for(lambda: prefetcher.started == [0])
+        prefetcher.cancel()
+        gate.set()
+
+        # The page already rendering finishes; the queued ones never start
+        assert _wait_for(lambda: PageRenderCache.make_key("doc", 0, 1.0) in cache)
+        time.sleep(0.1)
+        assert prefetcher.started == [0]
+        assert cache.stats()["entries"] == 1
+    finally:
+        gate.set()
+        prefetcher.stop()
+
+
+def test_new_request_replaces_pending_pages(pdf_path):
+    cache = PageRenderCache()
+    gate = threading.Event()
+    prefetcher = InProcessPrefetcher(cache, _to_image, gate=gate)
+    try:
+        prefetcher.request(pdf_path, "doc", [(0, 1.0), (1, 1.0)])
+        assert _wait_for(lambda: prefetcher.started == [0])
+        prefetcher.request(pdf_path, "doc", [(3, 1.0)])
+        gate.set()
+
+        assert _wait_for(lambda: PageRenderCache.make_key("doc", 3, 1.0) in cache)
+        assert prefetcher.started == [0, 3]
+    finally:
+        gate.set()
+        prefetcher.stop()
+
+
+def test_stop_ends_the_prefetch_thread(pdf_path):
+    prefetcher = InProcessPrefetcher(PageRenderCache(), _to_image)
+    prefetcher.stop()
+    assert not prefetcher._thread.is_alive()
+
+    prefetcher.request(pdf_path, "doc", [(0, 1.0)])
+    time.sleep(0.05)
+    assert prefetcher.started == []
+
+
+def test_prefetcher_renders_in_the_helper_process(pdf_path):
+    cache = PageRenderCache()
+    prefetcher = PagePrefetcher(cache, _to_image)
+    try:
+        prefetcher.request(pdf_path, "doc", [(0, 1.0)])
+        key = PageRenderCache.make_key("doc", 0, 1.0)
+        assert _wait_for(lambda: key in cache, timeout=60)
+        width, height, stride, samples = cache.get(key)
+        assert (width, height) == (200, 200)
+    finally:
+        prefetcher.stop()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for per-paper review state persistence (utils/paper_state_store.py)
+"""
+
+import sqlite3
+
+import pytest
+
+from utils.paper_state_store import PaperStateStore, summarize_state
+
+
+def test_stage_and_flush(tmp_path):
+    store = PaperStateStore(tmp_path / "states.sqlite3")
+    store.stage("a.pdf", {"human_text": "evidence", "decision": "yes"})
+    assert store.has_pending
+    assert store.get("a.pdf")["decision"] == "yes"  # unflushed changes are visible
+    assert store.flush() == 1
+    assert not store.has_pending and store.flush() == 0
+
+    reopened = PaperStateStore(store.db_path)
+    assert reopened.get("a.pdf") == {"human_text": "evidence", "decision": "yes"}
+    assert reopened.get("missing.pdf") is None
+    assert len(reopened) == 1
+
+
+def test_later_stage_of_same_paper_wins(tmp_path):
+    store = PaperStateStore(tmp_path / "states.sqlite3")
+    store.stage("a.pdf", {"decision": "yes"})
+    store.stage("a.pdf", {"decision": "no"})
+    store.flush()
+    assert store.get("a.pdf") == {"decision": "no"}
+
+
+def test_summaries_without_reading_text(tmp_path):
+    store = PaperStateStore(tmp_path / "states.sqlite3")
+    store.put_many({
+        "a.pdf": {"human_text": "x", "decision": "yes", "uploaded": True},
+        "b.pdf": {"ai_text": "CONFIDENCE: 0.2"},
+    })
+    store.stage("c.pdf", {})
+    assert store.summaries() == {
+        "a.pdf": {"uploaded": True, "has_decision": True, "has_evidence": True},
+        "b.pdf": {"uploaded": False, "has_decision": False, "has_evidence": True},
+        "c.pdf": summarize_state({}),
+    }
+
+
+def test_failed_flush_keeps_changes(tmp_path, monkeypatch):
+    store = PaperStateStore(tmp_path / "states.sqlite3")
+    store.stage("a.pdf", {"decision": "yes"})
+
+    def broken_connect():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, "_connect", broken_connect)
+    with pytest.raises(sqlite3.Error):
+        store.flush()
+    monkeypatch.undo()
+    assert store.has_pending
+    assert store.flush() == 1
+
+
+def test_database_is_private(tmp_path):
+    store = PaperStateStore(tmp_path / "states.sqlite3")
+    assert store.db_path.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-parse PDF document model (utils/parsed_document.py)
+"""
+
+import hashlib
+
+import fitz  # PyMuPDF
+
+from utils import metadata_extractor, parsed_document
+from utils.parsed_document import ParsedDocument, open_document
+
+
+def write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.set_metadata({"title": "A Study", "author": "Ada Author"})
+    doc.save(str(path))
+    doc.close()
+
+
+def make_pdf(tmp_path):
+    path = tmp_path / "paper.pdf"
+    write_pdf(path, ["Title: Reading in Rural Schools\nAuthor: Ada Author", "doi: 10.1234/abc.5678",
+                     "Third page text."])
+    return path
+
+
+def test_nothing_is_read_until_asked(tmp_path):
+    document = ParsedDocument(make_pdf(tmp_path))
+    assert document._doc is None
+    assert document.page_text(1).strip() == "doi: 10.1234/abc.5678"
+    assert list(document._page_text) == [1]  # only the requested page was decoded
+    document.close()
+    assert document._doc is None
+
+
+def test_pages_are_decoded_once(tmp_path, monkeypatch):
+    with ParsedDocument(make_pdf(tmp_path)) as document:
+        decoded = []
+        original = fitz.Page.get_text
+
+        def counting_get_text(page, *args, **kwargs):
+            decoded.append((page.number, args))
+            return original(page, *args, **kwargs)
+
+        monkeypatch.setattr(fitz.Page, "get_text", counting_get_text)
+        assert document.text(0, 2) == document.text(0, 2)
+        assert document.pages_text(-1) == ["Third page text.\n"]
+        assert document.words(0) is document.words(0)
+        assert [word[4] for word in document.words(0)][:2] == ["Title:", "Reading"]
+        assert decoded == [(0, ()), (1, ()), (2, ()), (0, ("words",))]
+        assert document.page_count == 3
+        assert document.metadata["author"] == "Ada Author"
+
+
+def test_sha256_is_computed_once(tmp_path, monkeypatch):
+    path = make_pdf(tmp_path)
+    calls = []
+    original = parsed_document.file_sha256
+    monkeypatch.setattr(parsed_document, "file_sha256", lambda p: calls.append(p) or original(p))
+    document = ParsedDocument(path)
+    assert document.sha256 == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert document.sha256 == document.sha256
+    assert len(calls) == 1
+
+
+def test_open_document_closes_only_what_it_opened(tmp_path):
+    path = make_pdf(tmp_path)
+    with open_document(str(path)) as document:
+        assert document.page_count == 3
+    assert document._doc is None
+
+    with ParsedDocument(path) as shared:
+        assert ParsedDocument.open(shared) is shared
+        with open_document(shared) as document:
+            assert document is shared
+            document.page_text(0)
+        assert shared._doc is not None  # still open for the caller
+
+
+def test_extractors_share_one_parse(tmp_path):
+    with ParsedDocument(make_pdf(tmp_path)) as document:
+        text_meta = metadata_extractor.extract_text_metadata(document)
+        assert text_meta["title"] == "Reading in Rural Schools"
+        assert text_meta["doi"] == "10.1234/abc.5678"
+        assert metadata_extractor.extract_metadata_pymupdf(document)["title"] == "A Study"
+        assert metadata_extractor.extract_doi(document) == "10.1234/abc.5678"
+        assert sorted(document._page_text) == [0, 1]
+    assert metadata_extractor.extract_metadata_pdfplumber is metadata_extractor.extract_text_metadata
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass positionality pattern detection (utils/pattern_detector.py)
+and the regex fallback analysis built on it
+"""
+
+import random
+import re
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pytest
+
+from utils import metadata_extractor
+from utils.document_index import load_document_index
+from utils.pattern_detector import POSITIONALITY_PATTERNS, PatternDetector, get_detector, scan_document
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample_pdfs"
+
+PHRASES = [
+    "My positionality", "our positionality", "As a Black woman and first-generation researcher",
+    "my background as a teacher in rural schools", "identify as queer and disabled",
+    "I acknowledge that my training as an economist shapes my bias",
+    "recognize our own assumptions", "my partial perspective", "I, as the researcher,",
+    "situated as an outsider", "our role as the investigator", "I must acknowledge",
+    "I wonder whether my presence shaped their perspective", "I examine my own assumptions",
+    "reflexive methodology", "feminist standpoint", "We bring years of classroom experience and bias",
+    "transparent about my shifting insider position", "position myself as a learner among peers",
+    "acknowledge our relative privilege", "power dynamics shaped this research",
+    "insider status", "limitations of my own outsider perspective",
+    "boundaries of our disciplinary understanding", "positionalities",
+]
+FILLER = ["the", "survey", "data", "were", "analysed", "I", "my", "our", "position", "as", "a",
+          "researcher", "perspective", "of", "and", "bias", ".", ",", "\n", "Table", "insider"]
+
+
+def reference_matches(text):
+    """Every pattern's re.finditer matches, the behaviour the detector must reproduce."""
+    found = []
+    for name, pattern in POSITIONALITY_PATTERNS.items():
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            found.append((name, match.start(), match.end(), match.group(0)))
+    return sorted(found)
+
+
+def detector_matches(text):
+    return sorted((m["name"], m["start"], m["end"], m["text"]) for m in get_detector().scan(text))
+
+
+def random_text(rng, pieces=400):
+    words = []
+    for _ in range(pieces):
+        piece = rng.choice(PHRASES) if rng.random() < 0.15 else rng.choice(FILLER)
+        if rng.random() < 0.1:
+            piece = piece.upper()
+        words.append(piece)
+    return " ".join(words)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_per_pattern_finditer_on_random_text(seed):
+    text = random_text(random.Random(seed))
+    assert detector_matches(text) == reference_matches(text)
+
+
+def test_matches_per_pattern_finditer_on_sample_papers():
+    paths = sorted(SAMPLE_DIR.glob("*.pdf"))
+    assert paths
+    for path in paths:
+        text = load_document_index(str(path)).full_text
+        assert detector_matches(text) == reference_matches(text), path.name
+
+
+def test_letters_ignore_case_folds_to_ascii():
+    # The long s and dotted/dotless i match s and i under re.IGNORECASE
+    text = "a ſtandpoint theory, İnsider perspective and ı reflect on it"
+    assert detector_matches(text) == reference_matches(text)
+    assert len(reference_matches(text)) == 3
+
+
+def test_first_matches():
+    text = "Our positionality matters. My positionality differs. Insider perspective."
+    assert get_detector().first_matches(text) == {
+        "explicit_positionality": "Our positionality",
+        "positionality_term": "positionality",
+        "insider_outsider": "Insider perspective",
+    }
+
+
+def test_patterns_must_start_with_a_word():
+    with pytest.raises(ValueError):
+        PatternDetector({"no_boundary": r"positionality"})
+    detector = PatternDetector({"custom": r"\b(?:alpha|beta) test"})
+    assert [m["text"] for m in detector.scan("an ALPHA test and a beta test")] == ["ALPHA test", "beta test"]
+
+
+def write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_scan_document_reports_pages(tmp_path):
+    path = tmp_path / "paper.pdf"
+    write_pdf(path, ["Introduction.", "Survey methods.", "Reflexive methodology here."])
+    matches = scan_document(load_document_index(str(path)))
+    assert sorted((m["name"], m["page"]) for m in matches) == [("methodological_reflexivity", 2),
+                                                                ("reflexive_methodology", 2)]
+
+def test_fallback_analysis_covers_all_pages(tmp_path, monkeypatch):
+    for variable in ("OPENAI_API_KEY", "RESEARCH_BUDDY_OPENAI_API_KEY", "DOCMINER_OPENAI_BASE_URL"):
+        monkeypatch.delenv(variable, raising=False)
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "long.pdf"
+    pages = [f"Page {n} reports survey results for the district." for n in range(1, 31)]
+    pages[27] = "My positionality as a former teacher in the district."
+    write_pdf(path, pages)
+
+    result = metadata_extractor.extract_positionality(str(path))
+    assert "explicit_positionality" in result["positionality_tests"]
+    assert result["positionality_snippets"]["explicit_positionality"] == "My positionality (page 28)"
+    assert result["positionality_score"] == 0.3
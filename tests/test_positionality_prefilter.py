@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for local screening before the AI positionality passes (utils/positionality_prefilter.py)
+"""
+
+import pytest
+
+from utils.positionality_prefilter import DEFAULT_THRESHOLDS, prefilter_thresholds, screen_document
+
+QUANTITATIVE = ("We estimated a Type I error rate of 0.05 for the Phase I trial. Studies I and II used "
+                "the same sample, and Table I reports the coefficients for each school i. ") * 40
+REFLEXIVE = ("My positionality as a former teacher shaped this study. I acknowledge that my own biases "
+             "as an insider researcher influenced the interviews. ") * 3
+FIRST_PERSON = ("I interviewed twelve teachers over two years. My notes from each visit were coded "
+                "with a colleague, and the themes below are the ones that recurred. ") * 5
+
+
+@pytest.fixture
+def clean_environment(monkeypatch):
+    for variable in ("DOCMINER_PREFILTER", "DOCMINER_PREFILTER_NEGATIVE_SCORE",
+                     "DOCMINER_PREFILTER_NEGATIVE_FIRST_PERSON", "DOCMINER_PREFILTER_POSITIVE_SCORE"):
+        monkeypatch.delenv(variable, raising=False)
+    return monkeypatch
+
+
+def test_quantitative_paper_is_negative():
+    result = screen_document(QUANTITATIVE)
+    assert result["verdict"] == "negative"
+    assert result["patterns"] == {}
+    # Roman numerals and the index variable i are not first-person words
+    assert result["first_person"] == 0
+
+
+def test_reflexive_paper_is_positive():
+    result = screen_document(QUANTITATIVE + REFLEXIVE)
+    assert result["verdict"] == "positive"
+    assert result["score"] >= DEFAULT_THRESHOLDS["positive_min_score"]
+    assert "explicit_positionality" in result["patterns"]
+
+
+def test_first_person_without_patterns_is_uncertain():
+    result = screen_document(FIRST_PERSON)
+    assert result["patterns"] == {}
+    assert result["first_person"] > DEFAULT_THRESHOLDS["negative_max_first_person"]
+    assert result["verdict"] == "uncertain"
+
+
+def test_first_person_ignores_case():
+    # Sentence-initial and all-caps forms count ("MY" in a heading, "Me" starting a sentence)
+    assert screen_document("MY ROLE. Me too. " * 5)["first_person"] == 0.5
+
+
+def test_default_thresholds(clean_environment):
+    assert prefilter_thresholds() == DEFAULT_THRESHOLDS
+
+
+def test_thresholds_from_environment(clean_environment):
+    clean_environment.setenv("DOCMINER_PREFILTER_NEGATIVE_SCORE", "0.5")
+    clean_environment.setenv("DOCMINER_PREFILTER_NEGATIVE_FIRST_PERSON", "0.1")
+    clean_environment.setenv("DOCMINER_PREFILTER_POSITIVE_SCORE", "3")
+    thresholds = prefilter_thresholds()
+    assert thresholds == {"negative_max_score": 0.5, "negative_max_first_person": 0.1,
+                          "positive_min_score": 3.0}
+    # A looser negative threshold lets the first-person paper skip the AI passes
+    assert screen_document(FIRST_PERSON, thresholds)["verdict"] == "negative"
+    assert screen_document(QUANTITATIVE + REFLEXIVE, thresholds)["verdict"] == "positive"
+
+
+def test_prefilter_can_be_disabled(clean_environment):
+    clean_environment.setenv("DOCMINER_PREFILTER", "0")
+    assert prefilter_thresholds() is None
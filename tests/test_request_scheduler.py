@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for rate-limited, retrying API calls (utils/request_scheduler.py)
+"""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from utils import request_scheduler
+from utils.fake_llm_provider import FakeChatProvider, start_server
+from utils.request_scheduler import RequestScheduler, TokenBucket, provider_for_base_url, retry_after_seconds
+
+MESSAGES = [{"role": "user", "content": "Is there a positionality statement?"}]
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(request_scheduler, "BASE_BACKOFF", 0.01)
+
+
+def api_error(error_class, status, headers=None):
+    response = httpx.Response(status, headers=headers, request=httpx.Request("POST", "http://test/v1"))
+    return error_class("injected", response=response, body=None)
+
+
+def flaky(failures, result="done"):
+    """A call that raises the given errors in turn, then returns result."""
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+def test_provider_for_base_url():
+    assert provider_for_base_url("https://api.openai.com/v1") == "openai"
+    assert provider_for_base_url("https://openrouter.ai/api/v1") == "openrouter"
+    assert provider_for_base_url("http://127.0.0.1:8089/v1") == "local"
+    assert provider_for_base_url("https://llm.example.org/v1") == "llm.example.org"
+
+
+def test_retry_after_headers():
+    assert retry_after_seconds(api_error(openai.RateLimitError, 429, {"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(api_error(openai.RateLimitError, 429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(api_error(openai.RateLimitError, 429)) is None
+
+
+def test_transient_errors_are_retried():
+    call, calls = flaky([api_error(openai.InternalServerError, 500),
+                         openai.APITimeoutError(httpx.Request("POST", "http://test/v1"))])
+    stats = {}
+    assert RequestScheduler(max_retries=3).run("local", call, stats=stats) == "done"
+    assert len(calls) == 3
+    assert stats["retries"] == 2
+
+
+def test_rate_limit_pauses_the_provider():
+    scheduler = RequestScheduler(max_retries=3)
+    call, calls = flaky([api_error(openai.RateLimitError, 429, {"retry-after": "0.2"})])
+    assert scheduler.run("local", call) == "done"
+    assert calls[1] - calls[0] >= 0.19
+    assert scheduler.bucket("local")._paused_until > 0
+
+
+def test_gives_up_after_max_retries():
+    call, calls = flaky([api_error(openai.InternalServerError, 500)] * 5)
+    with pytest.raises(openai.InternalServerError):
+        RequestScheduler(max_retries=2).run("local", call)
+    assert len(calls) == 3
+
+
+def test_permanent_errors_are_not_retried():
+    call, calls = flaky([api_error(openai.AuthenticationError, 401)])
+    with pytest.raises(openai.AuthenticationError):
+        RequestScheduler(max_retries=3).run("local", call)
+    assert len(calls) == 1
+
+
+def test_run_async_retries_with_the_same_policy():
+    async def call():
+        return sync_call()
+
+    sync_call, calls = flaky([api_error(openai.InternalServerError, 500),
+                              api_error(openai.RateLimitError, 429, {"retry-after": "0.05"})])
+    stats = {}
+    result = asyncio.run(RequestScheduler(max_retries=3).run_async("local", call, stats=stats))
+    assert result == "done"
+    assert len(calls) == 3
+    assert stats["retries"] == 2
+
+
+def test_run_async_against_the_fake_provider():
+    provider = FakeChatProvider(latency_ms=1, rate_limit_rate=1, retry_after=0.01)
+    server, base_url = start_server(provider)
+
+    async def ask():
+        async with openai.AsyncOpenAI(api_key="offline", base_url=base_url, max_retries=0) as client:
+            return await RequestScheduler(max_retries=2).run_async(
+                "local", lambda: client.chat.completions.create(model="fake", messages=MESSAGES))
+
+    try:
+        with pytest.raises(openai.RateLimitError):
+            asyncio.run(ask())
+        assert provider.stats()["rate_limited"] == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=20.0, capacity=1.0)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    # One token up front, then one every 50 ms
+    assert time.monotonic() - started >= 0.14
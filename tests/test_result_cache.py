@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk LLM result cache (utils/result_cache.py)
+"""
+
+import os
+import sys
+
+from utils import result_cache
+from utils.result_cache import ResultCache
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = ResultCache(cache_dir=tmp_path)
+    key = cache.make_key("doc", "explicit", [{"role": "user", "content": "x"}], "gpt-4o-mini", 0.1)
+    assert cache.get(key) is None
+    cache.put(key, {"answer": "YES"})
+    assert cache.get(key) == {"answer": "YES"}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_depends_on_every_input():
+    base = ResultCache.make_key("doc", "explicit", "prompt", "model", 0.1)
+    assert base == ResultCache.make_key("doc", "explicit", "prompt", "model", 0.1)
+    assert base != ResultCache.make_key("other", "explicit", "prompt", "model", 0.1)
+    assert base != ResultCache.make_key("doc", "subtle", "prompt", "model", 0.1)
+    assert base != ResultCache.make_key("doc", "explicit", "prompt", "model", 0.2)
+    assert base != ResultCache.make_key("doc", "explicit", "prompt", "model", 0.1, max_tokens=10)
+
+
+def test_overwriting_a_key_does_not_grow_tracked_size(tmp_path):
+    cache = ResultCache(cache_dir=tmp_path)
+    cache.put("a" * 64, {"answer": "first"})
+    for _ in range(20):
+        cache.put("b" * 64, {"answer": "x" * 100})
+    assert cache._size_bytes == cache._scan_size()
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(cache_dir=tmp_path)
+    keys = [str(i) * 64 for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, {"answer": "x" * 100})
+        path = cache._path_for(key)
+        os.utime(path, (1000 + age, 1000 + age))
+    cache.get(keys[0])  # refreshes the oldest entry
+    cache.prune(max_bytes=cache._scan_size() - 1)
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+
+def test_budget_evicts_on_put(tmp_path):
+    cache = ResultCache(cache_dir=tmp_path, max_bytes=500)
+    for i in range(10):
+        cache.put(f"{i:064d}", {"answer": "x" * 100})
+    assert cache._scan_size() <= 500
+
+
+def test_cli_uses_configured_budget(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("DOCMINER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("DOCMINER_CACHE_MAX_MB", "5")
+    monkeypatch.setattr(sys, "argv", ["result_cache", "stats"])
+    result_cache.main()
+    assert "of 5 MB" in capsys.readouterr().out
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the document-wide search index (utils/search_index.py)
+"""
+
+from utils.document_index import DocumentIndex
+from utils.search_index import SearchIndex, load_search_index, tokenize
+
+
+def line(words, y, x=72.0):
+    """Word boxes [x0, y0, x1, y1, text] for one line of text."""
+    boxes = []
+    for word in words.split():
+        width = 6.0 * len(word)
+        boxes.append([x, y, x + width, y + 11.0, word])
+        x += width + 4.0
+    return boxes
+
+
+def make_index(pages, sha256="search-test"):
+    """DocumentIndex from pages given as lists of lines."""
+    words = []
+    for page in pages:
+        page_words = []
+        for line_num, text in enumerate(page):
+            page_words.extend(line(text, 72.0 + 14.0 * line_num))
+        words.append(page_words)
+    return DocumentIndex(sha256, ["\n".join(page) for page in pages], words)
+
+
+PAGES = [
+    ["Introduction", "We study reading in rural schools."],
+    ["My positionality as a former", "teacher shaped the interviews.", "Positional statements vary."],
+    ["The author's position-", "ality is discussed later, in the position paper."],
+]
+
+
+def test_tokenize():
+    assert tokenize("My Position-ality, (2019)") == ["my", "position", "ality", "2019"]
+
+
+def test_phrase_search_across_pages():
+    index = SearchIndex(make_index(PAGES))
+    hits = index.search("positionality as a")
+    assert [(hit["page"], hit["text"]) for hit in hits] == [(1, "positionality as a")]
+    assert hits[0]["bboxes"][0][:2] == (72.0 + 6.0 * 2 + 4.0, 72.0)
+    assert "former" in hits[0]["snippet"]
+
+
+def test_phrase_spanning_lines():
+    hits = SearchIndex(make_index(PAGES)).search("a former teacher")
+    assert [(hit["page"], hit["word_start"], hit["word_end"]) for hit in hits] == [(1, 3, 5)]
+
+
+def test_last_token_matches_as_prefix_and_case_is_ignored():
+    hits = SearchIndex(make_index(PAGES)).search("POSITIONAL")
+    assert [(hit["page"], hit["text"]) for hit in hits] == [
+        (1, "positionality"), (1, "Positional"), (2, "position- ality")]
+
+
+def test_line_break_hyphen_is_joined():
+    index = SearchIndex(make_index(PAGES))
+    assert [hit["page"] for hit in index.search("author's positionality")] == [2]
+    # An ordinary word on the next line is not joined
+    assert [hit["text"] for hit in index.search("position paper")] == ["position paper."]
+
+
+def test_max_hits_and_empty_query():
+    index = SearchIndex(make_index(PAGES))
+    assert len(index.search("position", max_hits=2)) == 2
+    assert index.search("  ,.  ") == []
+    assert index.search("nonexistent phrase") == []
+
+
+def test_load_search_index_is_memoised():
+    document = make_index(PAGES, sha256="memo-test")
+    assert load_search_index(document) is load_search_index(document)
+
+
+def test_substrings_inside_words_match():
+    index = SearchIndex(make_index(PAGES))
+    assert [(hit["page"], hit["text"]) for hit in index.search("ality")] == [
+        (1, "positionality"), (2, "position- ality")]
+    assert [hit["text"] for hit in index.search("ality as a form")] == ["positionality as a former"]
+    assert [hit["text"] for hit in index.search("tionality as")] == ["positionality as"]
+    assert index.search("ality former") == []
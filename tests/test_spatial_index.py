@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the word-box grid used by drag selection (utils/spatial_index.py)
+"""
+
+import random
+
+import pytest
+
+from utils.spatial_index import WordGrid
+
+
+def brute_force(bboxes, x0, y0, x1, y1):
+    return [i for i, (a, b, c, d) in enumerate(bboxes) if a <= x1 and c >= x0 and b <= y1 and d >= y0]
+
+
+def random_page(rng, words=600):
+    """Word boxes laid out in lines like a page of text."""
+    bboxes = []
+    x, y = 72.0, 72.0
+    for _ in range(words):
+        width = rng.uniform(10, 70)
+        if x + width > 540:
+            x, y = 72.0, y + 14.0
+        bboxes.append((x, y, x + width, y + 11.0))
+        x += width + 4.0
+    return bboxes
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_query_matches_brute_force(seed):
+    rng = random.Random(seed)
+    bboxes = random_page(rng)
+    grid = WordGrid(bboxes)
+    assert len(grid) == len(bboxes)
+    for _ in range(200):
+        x0, y0 = rng.uniform(0, 600), rng.uniform(0, 800)
+        rect = (x0, y0, x0 + rng.uniform(0, 300), y0 + rng.uniform(0, 300))
+        assert grid.query(*rect) == brute_force(bboxes, *rect)
+
+
+def test_edges_are_inclusive():
+    grid = WordGrid([(10, 10, 20, 20), (30, 10, 40, 20)])
+    assert grid.query(20, 20, 25, 25) == [0]
+    assert grid.query(20.5, 0, 29.5, 30) == []
+    assert grid.query(0, 0, 1000, 1000) == [0, 1]
+
+
+def test_explicit_cell_size():
+    bboxes = random_page(random.Random(9), words=100)
+    for cell_size in (5.0, 50.0, 1000.0):
+        grid = WordGrid(bboxes, cell_size=cell_size)
+        assert grid.query(100, 80, 300, 120) == brute_force(bboxes, 100, 80, 300, 120)
+
+
+def test_empty_page():
+    grid = WordGrid([])
+    assert len(grid) == 0
+    assert grid.query(0, 0, 100, 100) == []
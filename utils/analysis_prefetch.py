@@ -0,0 +1,151 @@
+"""
+Background AI pre-analysis of the papers a reviewer is about to open.
+
+An AnalysisPrefetcher runs the full positionality analysis for upcoming
+papers on a few worker threads. Every pass answer is stored in the result
+cache (see utils/result_cache.py), so when the reviewer reaches a paper and
+runs the analysis, the answers come back from disk in milliseconds.
+
+Only the latest request matters: a new request replaces the queue, and a
+paper that is being analysed but is no longer wanted is cancelled at its
+next pass boundary (passes already answered stay cached). A budget caps how
+many papers may be analysed in the background per session; cancelled or
+failed analyses do not count against it.
+"""
+
+import os
+import threading
+
+DEFAULT_LOOKAHEAD = 3
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_BUDGET = 20  # papers per session
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a prefetch analysis to abandon it at a pass boundary."""
+
+
+class AnalysisPrefetcher:
+    """Analyses queued papers in the background, most wanted first."""
+
+    def __init__(self, analyze, max_workers=DEFAULT_MAX_WORKERS, budget=DEFAULT_BUDGET):
+        """
+        Args:
+            analyze: callable(pdf_path, progress_callback) running one analysis,
+                e.g. extract_positionality; progress_callback is called between passes
+            max_workers: Papers analysed at the same time
+            budget: Papers that may be analysed in the background (None for no limit);
+                analyses in progress hold a slot until they complete, fail or are cancelled
+        """
+        self.analyze = analyze
+        self.budget = budget
+        self.started = 0
+        self.completed = 0
+        self._pending = []   # paths in priority order
+        self._running = {}   # path -> threading.Event set to cancel it
+        self._done = set()   # paths whose analysis is in the result cache
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"AnalysisPrefetcher-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, pdf_paths):
+        """
+        Replace the queue with these papers (in priority order).
+        Papers already analysed or in progress are skipped; papers in progress
+        that are no longer requested are cancelled.
+        """
+        pdf_paths = [str(path) for path in pdf_paths]
+        wanted = set(pdf_paths)
+        with self._condition:
+            self._pending = [path for path in pdf_paths if path not in self._done and path not in self._running]
+            for path, cancel_event in self._running.items():
+                if path in wanted:
+                    cancel_event.clear()  # Wanted again before it reached a pass boundary
+                else:
+                    cancel_event.set()
+            self._condition.notify_all()
+
+    def discard(self, pdf_path):
+        """Stop prefetching one paper (e.g. the reviewer is analysing it in the foreground)."""
+        pdf_path = str(pdf_path)
+        with self._condition:
+            self._pending = [path for path in self._pending if path != pdf_path]
+            cancel_event = self._running.get(pdf_path)
+            if cancel_event is not None:
+                cancel_event.set()
+
+    def cancel(self):
+        """Drop the queue and cancel analyses in progress."""
+        with self._condition:
+            self._pending = []
+            for cancel_event in self._running.values():
+                cancel_event.set()
+
+    def stop(self):
+        self.cancel()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+    def is_done(self, pdf_path):
+        with self._condition:
+            return str(pdf_path) in self._done
+
+    def stats(self):
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "running": len(self._running),
+                "started": self.started,
+                "completed": self.completed,
+                "budget": self.budget,
+            }
+
+    def _budget_left(self):
+        return self.budget is None or self.completed + len(self._running) < self.budget
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not (self._pending and self._budget_left()):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                pdf_path = self._pending.pop(0)
+                cancel_event = threading.Event()
+                self._running[pdf_path] = cancel_event
+                self.started += 1
+
+            def check_cancelled(pct, msg):
+                if cancel_event.is_set():
+                    raise AnalysisCancelled()
+
+            try:
+                self.analyze(pdf_path, check_cancelled)
+                with self._condition:
+                    self._done.add(pdf_path)
+                    self.completed += 1
+                print(f"DEBUG: Pre-analysed {os.path.basename(pdf_path)}")
+            except AnalysisCancelled:
+                print(f"DEBUG: Pre-analysis of {os.path.basename(pdf_path)} cancelled")
+            except Exception as e:
+                print(f"DEBUG: Pre-analysis of {os.path.basename(pdf_path)} failed: {e}")
+            finally:
+                with self._condition:
+                    self._running.pop(pdf_path, None)
+                    self._condition.notify_all()  # A slot of the budget may have been given back
+
+
+def prefetch_settings():
+    """(lookahead, max_workers, budget), overridable with DOCMINER_PREFETCH_AHEAD/_WORKERS/_BUDGET."""
+    lookahead = int(os.getenv("DOCMINER_PREFETCH_AHEAD") or DEFAULT_LOOKAHEAD)
+    max_workers = int(os.getenv("DOCMINER_PREFETCH_WORKERS") or DEFAULT_MAX_WORKERS)
+    budget = int(os.getenv("DOCMINER_PREFETCH_BUDGET") or DEFAULT_BUDGET)
+    return lookahead, max(1, max_workers), budget
@@ -0,0 +1,145 @@
+"""
+Structured telemetry for the positionality analysis.
+
+Every AI pass emits one record (wall time, time queued behind the rate
+limiter, prompt/completion tokens, result-cache hit or miss, retries and
+characters of context sent), and every analysis emits a summary record
+(document read time, total time, failed passes). Records are plain dicts
+handed to every registered sink:
+
+- RingBufferSink keeps the most recent records in memory; one is always
+  installed (get_ring_buffer()) and backs the GUI's Analysis Statistics.
+- JsonlSink appends records to a JSON-lines file for offline analysis. Set
+  DOCMINER_TELEMETRY_JSONL=/path/to/file.jsonl to install one at startup.
+
+A sink is any object with an emit(record) method; add your own with
+add_sink(). Telemetry never interrupts an analysis: sink errors are printed
+and ignored.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+DEFAULT_RING_CAPACITY = 1000
+
+_sinks = []
+_sinks_lock = threading.Lock()
+_ring_buffer = None
+_env_configured = False
+
+
+class RingBufferSink:
+    """Thread-safe in-memory buffer of the most recent records."""
+
+    def __init__(self, capacity=DEFAULT_RING_CAPACITY):
+        self._records = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self, kind=None):
+        """Buffered records, oldest first (only those of `kind` if given)."""
+        with self._lock:
+            records = list(self._records)
+        return [record for record in records if kind is None or record.get("kind") == kind]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self):
+        """
+        Per-pass aggregates over the buffered pass records.
+
+        Returns:
+            dict pass name -> calls, cache_hits, errors, retries, wall_time and
+            queue_wait (seconds, summed), prompt_tokens, completion_tokens,
+            context_chars (summed)
+        """
+        totals = {}
+        for record in self.records("pass"):
+            entry = totals.setdefault(record["pass"], {
+                "calls": 0, "cache_hits": 0, "errors": 0, "retries": 0, "wall_time": 0.0,
+                "queue_wait": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "context_chars": 0,
+            })
+            entry["calls"] += 1
+            entry["cache_hits"] += record.get("cache") == "hit"
+            entry["errors"] += bool(record.get("error"))
+            for field in ("retries", "wall_time", "queue_wait", "prompt_tokens", "completion_tokens",
+                          "context_chars"):
+                entry[field] += record.get(field) or 0
+        return totals
+
+
+class JsonlSink:
+    """Appends each record as one JSON line."""
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def emit(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def _configure():
+    """Install the default ring buffer and the JSONL sink requested by the environment (once)."""
+    global _ring_buffer, _env_configured
+    if _env_configured:
+        return
+    _env_configured = True
+    _ring_buffer = RingBufferSink()
+    _sinks.append(_ring_buffer)
+    jsonl_path = os.getenv("DOCMINER_TELEMETRY_JSONL")
+    if jsonl_path:
+        try:
+            _sinks.append(JsonlSink(jsonl_path))
+        except OSError as e:
+            print(f"Could not open telemetry file {jsonl_path}: {e}")
+
+
+def get_ring_buffer():
+    """The process-wide RingBufferSink."""
+    with _sinks_lock:
+        _configure()
+        return _ring_buffer
+
+
+def add_sink(sink):
+    with _sinks_lock:
+        _configure()
+        _sinks.append(sink)
+
+
+def remove_sink(sink):
+    with _sinks_lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def emit(record):
+    """Timestamp a record and hand it to every sink."""
+    record.setdefault("timestamp", time.time())
+    with _sinks_lock:
+        _configure()
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink.emit(record)
+        except Exception as e:
+            print(f"Telemetry sink {type(sink).__name__} failed: {e}")
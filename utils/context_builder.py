@@ -0,0 +1,182 @@
+"""
+Token-budgeted context assembly for the AI analysis passes.
+
+Instead of cutting section text at fixed character counts, a paper is split
+into paragraphs once; each paragraph gets a token estimate and cheap local
+relevance signals (positionality pattern matches from
+utils/pattern_detector.py, the section it belongs to, first-person
+density, citation density). Each pass then packs the
+best-ranked paragraphs into its own token budget and sends them in
+document order. Reference lists and acknowledgements are never sent, and a
+positionality paragraph deep in the paper is not lost to truncation.
+
+Token counts are estimated from character counts (about four characters
+per token for English prose), which is close enough for budgeting and
+needs no tokenizer download.
+"""
+
+import bisect
+import math
+import re
+
+from utils.pattern_detector import get_detector
+
+CHARS_PER_TOKEN = 4
+
+# Tokens of document text sent by each pass
+PASS_TOKEN_BUDGETS = {
+    "explicit": 1000,
+    "reflexive": 1000,
+    "subtle": 2500,
+    "final_assessment": 600,
+}
+
+# Section name -> prior relevance for each pass (sections not listed get DEFAULT_SECTION_WEIGHT;
+# 'front' is text before the first detected heading)
+PASS_SECTION_WEIGHTS = {
+    "explicit": {"positionality": 3.0, "introduction": 2.0, "methods": 2.0, "front": 1.5},
+    "reflexive": {"positionality": 3.0, "methods": 2.0, "discussion": 1.5, "conclusion": 1.5},
+    "subtle": {"positionality": 2.0, "introduction": 1.0, "methods": 1.0, "background": 1.0,
+               "discussion": 1.0, "conclusion": 1.0, "front": 1.0},
+    "final_assessment": {"positionality": 3.0, "introduction": 2.0, "methods": 2.0, "front": 1.0},
+}
+DEFAULT_SECTION_WEIGHT = 0.5
+# Boilerplate sections: never worth paying for. Their headings only count in the back
+# part of a paper; earlier matches are running heads or tables of contents.
+EXCLUDED_SECTIONS = {"references", "acknowledgements"}
+EXCLUDED_SECTIONS_START = 0.4   # fraction of the text before which they are ignored
+
+VOCABULARY_WEIGHT = 2.0         # per positionality pattern match, up to MAX_VOCABULARY_MATCHES
+MAX_VOCABULARY_MATCHES = 3
+FIRST_PERSON_WEIGHT = 25.0      # times the share of first-person words (typically 0-0.08)
+CITATION_PENALTY = 15.0         # times citations per word (reference-like paragraphs)
+
+MIN_PARAGRAPH_CHARS = 400       # lines are merged until a paragraph is at least this long
+MAX_PARAGRAPH_CHARS = 1600
+MIN_USEFUL_CHARS = 60           # shorter fragments are running heads, page numbers, captions
+
+_FIRST_PERSON_RE = re.compile(r"\b(?:I|me|my|mine|myself|we|us|our|ours|ourselves)\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"\w+")
+_CITATION_RE = re.compile(r"\(\s*(?:19|20)\d{2}[a-z]?\s*\)|\b(?:19|20)\d{2}[a-z]?[,;)]|\bdoi\b|\bpp\.|\bet al\.")
+_PARAGRAPH_END_RE = re.compile(r"[.!?:\"”)]\s*$")
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_paragraphs(page_text, breaks=()):
+    """
+    (start, end) character spans of paragraph-sized chunks of a page.
+    PDF text has no reliable paragraph marks, so lines are merged until a
+    chunk is long enough and ends a sentence, or a blank line follows a
+    chunk that is more than a fragment.
+    A line starting at one of the `breaks` offsets (e.g. a section heading)
+    always starts a new chunk.
+    """
+    spans = []
+    start = None
+    position = 0
+    for line in page_text.split("\n"):
+        line_end = position + len(line)
+        if start is not None and position in breaks:
+            spans.append((start, position - 1))
+            start = None
+        if not line.strip():
+            # A heading or running head alone is not a paragraph: keep it with the text that follows
+            if start is not None and position - start > MIN_USEFUL_CHARS:
+                spans.append((start, position))
+                start = None
+        else:
+            if start is None:
+                start = position
+            length = line_end - start
+            if (length >= MIN_PARAGRAPH_CHARS and _PARAGRAPH_END_RE.search(line)) or length >= MAX_PARAGRAPH_CHARS:
+                spans.append((start, line_end))
+                start = None
+        position = line_end + 1
+    if start is not None:
+        spans.append((start, len(page_text)))
+    return spans
+
+
+class AnalysisContext:
+    """A paper's paragraphs with their token estimates and relevance signals."""
+
+    def __init__(self, index):
+        """
+        Args:
+            index: DocumentIndex of the paper
+        """
+        self.index = index
+        back_matter_start = len(index.full_text) * EXCLUDED_SECTIONS_START
+        headings = [heading for heading in index.headings
+                    if heading["section"] not in EXCLUDED_SECTIONS or heading["offset"] >= back_matter_start]
+        heading_offsets = [heading["offset"] for heading in headings]
+        self.paragraphs = []
+        heading_carried = None  # (offset, text) of a heading left alone at the bottom of a page
+        detector = get_detector()
+        for page_num, page_text in enumerate(index.pages):
+            page_offset = index.page_offsets[page_num]
+            breaks = {offset - page_offset for offset in heading_offsets
+                      if page_offset <= offset < page_offset + len(page_text)}
+            for start, end in split_paragraphs(page_text, breaks):
+                text = page_text[start:end].strip()
+                offset = page_offset + start
+                if len(text) < MIN_USEFUL_CHARS:
+                    if start in breaks:
+                        heading_carried = (offset, text)
+                    continue
+                if heading_carried is not None:
+                    offset, text = heading_carried[0], heading_carried[1] + "\n" + text
+                    heading_carried = None
+                heading = bisect.bisect_right(heading_offsets, offset) - 1
+                words = max(1, len(_WORD_RE.findall(text)))
+                self.paragraphs.append({
+                    "text": text,
+                    "page": page_num,
+                    "offset": offset,
+                    "section": headings[heading]["section"] if heading >= 0 else "front",
+                    "tokens": estimate_tokens(text),
+                    "vocabulary": len(detector.scan(text)),
+                    "first_person": len(_FIRST_PERSON_RE.findall(text)) / words,
+                    "citations": len(_CITATION_RE.findall(text)) / words,
+                })
+
+    def score(self, paragraph, pass_name):
+        """Local relevance of a paragraph for a pass (None = never send)."""
+        if paragraph["section"] in EXCLUDED_SECTIONS:
+            return None
+        weights = PASS_SECTION_WEIGHTS.get(pass_name, {})
+        return (weights.get(paragraph["section"], DEFAULT_SECTION_WEIGHT)
+                + VOCABULARY_WEIGHT * min(paragraph["vocabulary"], MAX_VOCABULARY_MATCHES)
+                + FIRST_PERSON_WEIGHT * paragraph["first_person"]
+                - CITATION_PENALTY * paragraph["citations"])
+
+    def select(self, pass_name, budget=None):
+        """Best-ranked paragraphs that fit the pass's token budget, in document order."""
+        budget = budget or PASS_TOKEN_BUDGETS[pass_name]
+        ranked = []
+        for position, paragraph in enumerate(self.paragraphs):
+            score = self.score(paragraph, pass_name)
+            if score is not None:
+                ranked.append((-score, position))
+        ranked.sort()
+
+        chosen = []
+        remaining = budget
+        for _, position in ranked:
+            tokens = self.paragraphs[position]["tokens"]
+            if tokens <= remaining:
+                chosen.append(position)
+                remaining -= tokens
+        return [self.paragraphs[position] for position in sorted(chosen)]
+
+    def build(self, pass_name, budget=None):
+        """Context text for a pass: its selected paragraphs separated by blank lines."""
+        budget = budget or PASS_TOKEN_BUDGETS[pass_name]
+        paragraphs = self.select(pass_name, budget)
+        if not paragraphs:
+            # Nothing paragraph-shaped (e.g. a scanned or very short paper): send the start of the text
+            return self.index.full_text[:budget * CHARS_PER_TOKEN]
+        return "\n\n".join(paragraph["text"] for paragraph in paragraphs)
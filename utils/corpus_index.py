@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide full-text index over a folder of PDFs.
+
+Per-page text (from the DocumentIndex) is stored in a SQLite FTS5 table at
+~/.docminer/cache/corpus.sqlite3, so "which papers mention X?" is answered
+for a whole folder in milliseconds. Updates are incremental: a paper is only
+re-indexed when its size/mtime changed and its content hash no longer
+matches what was indexed.
+
+Usage:
+    python -m utils.corpus_index update ~/Papers
+    python -m utils.corpus_index search ~/Papers "insider/outsider"
+"""
+
+import os
+import re
+import sqlite3
+from contextlib import closing
+import threading
+import time
+from pathlib import Path
+
+from utils.document_index import load_document_index
+from utils.parsed_document import ParsedDocument
+from utils.result_cache import DEFAULT_CACHE_DIR
+
+SCHEMA_VERSION = 1
+
+_SEGMENT_RE = re.compile(r'"([^"]*)"|(\S+)')
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def to_match_query(text):
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every whitespace-separated term (or "quoted phrase") becomes a phrase of
+    its word tokens and all of them must match, so "insider/outsider" finds
+    the adjacent words insider outsider and punctuation never reaches the
+    FTS5 query parser.
+    """
+    phrases = []
+    for quoted, bare in _SEGMENT_RE.findall(text):
+        tokens = _TOKEN_RE.findall(quoted or bare)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " ".join(phrases)
+
+
+class CorpusIndex:
+    """SQLite FTS5 index of per-page text for every indexed PDF."""
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path or Path(os.getenv("DOCMINER_CACHE_DIR") or DEFAULT_CACHE_DIR) / "corpus.sqlite3")
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        """New connection; use as `with closing(self._connect()) as conn, conn:` (commit, then close)."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS papers")
+                conn.execute("DROP TABLE IF EXISTS pages")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS papers (
+                    path TEXT PRIMARY KEY,
+                    folder TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    page_count INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS papers_folder ON papers(folder)")
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+                    path UNINDEXED, page UNINDEXED, text,
+                    tokenize = 'porter unicode61'
+                )
+            """)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def update_folder(self, folder, progress_callback=None, should_stop=None):
+        """
+        Bring the index up to date with the PDFs in a folder.
+
+        Args:
+            folder: Folder to index (not recursive, like load_folder)
+            progress_callback: Optional callable(done, total, filename)
+            should_stop: Optional callable returning True to stop early
+
+        Returns:
+            dict: added, updated, unchanged, removed, failed counts
+        """
+        folder = os.path.abspath(folder)
+        filenames = sorted(f for f in os.listdir(folder) if f.lower().endswith('.pdf'))
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "failed": 0}
+
+        with closing(self._connect()) as conn, conn:
+            known = {
+                row[0]: row[1:]
+                for row in conn.execute("SELECT path, mtime, size, sha256 FROM papers WHERE folder = ?", (folder,))
+            }
+
+        for done, filename in enumerate(filenames):
+            if should_stop and should_stop():
+                break
+            if progress_callback:
+                progress_callback(done, len(filenames), filename)
+            path = os.path.join(folder, filename)
+            try:
+                status = self._update_paper(path, folder, filename, known.get(path))
+            except Exception as e:
+                print(f"Could not index {filename}: {e}")
+                status = "failed"
+            stats[status] += 1
+
+        # Forget papers that are no longer in the folder
+        current = {os.path.join(folder, f) for f in filenames}
+        removed = [path for path in known if path not in current]
+        if removed and not (should_stop and should_stop()):
+            with self._lock, closing(self._connect()) as conn, conn:
+                for path in removed:
+                    conn.execute("DELETE FROM pages WHERE path = ?", (path,))
+                    conn.execute("DELETE FROM papers WHERE path = ?", (path,))
+            stats["removed"] = len(removed)
+
+        if progress_callback:
+            progress_callback(len(filenames), len(filenames), "")
+        return stats
+
+    def _update_paper(self, path, folder, filename, known):
+        """Index one PDF if it changed; returns 'added', 'updated' or 'unchanged'."""
+        st = os.stat(path)
+        if known and known[0] == st.st_mtime and known[1] == st.st_size:
+            return "unchanged"
+
+        with ParsedDocument(path) as doc:
+            sha = doc.sha256
+            if known and known[2] == sha:
+                # Touched but not changed: just remember the new mtime
+                with self._lock, closing(self._connect()) as conn, conn:
+                    conn.execute("UPDATE papers SET mtime = ?, size = ? WHERE path = ?",
+                                 (st.st_mtime, st.st_size, path))
+                return "unchanged"
+            index = load_document_index(doc)
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM pages WHERE path = ?", (path,))
+            conn.executemany(
+                "INSERT INTO pages (path, page, text) VALUES (?, ?, ?)",
+                [(path, page_num, text) for page_num, text in enumerate(index.pages) if text.strip()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO papers (path, folder, filename, mtime, size, sha256, page_count, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, folder, filename, st.st_mtime, st.st_size, sha, index.page_count, time.time()),
+            )
+        return "updated" if known else "added"
+
+    def search(self, query, folder=None, limit=100):
+        """
+        Ranked full-text search.
+
+        Args:
+            query: Free text (see to_match_query); terms are stemmed, so
+                "position" also finds "positions"
+            folder: Only return papers from this folder
+            limit: Maximum number of hits
+
+        Returns:
+            list of dicts, best first: paper (filename), path, page (0-based),
+            snippet (matches wrapped in [ ]) and score (bm25, lower is better)
+        """
+        match = to_match_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT papers.filename, pages.path, pages.page, "
+            "       snippet(pages, 2, '[', ']', '…', 16), bm25(pages) AS score "
+            "FROM pages JOIN papers ON papers.path = pages.path "
+            "WHERE pages MATCH ?"
+        )
+        params = [match]
+        if folder is not None:
+            sql += " AND papers.folder = ?"
+            params.append(os.path.abspath(folder))
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {"paper": filename, "path": path, "page": int(page),
+             "snippet": " ".join(snippet.split()), "score": score}
+            for filename, path, page, snippet, score in rows
+        ]
+
+    def stats(self, folder=None):
+        with closing(self._connect()) as conn, conn:
+            if folder is None:
+                papers, pages = conn.execute("SELECT COUNT(*), COALESCE(SUM(page_count), 0) FROM papers").fetchone()
+            else:
+                papers, pages = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(page_count), 0) FROM papers WHERE folder = ?",
+                    (os.path.abspath(folder),),
+                ).fetchone()
+        return {"papers": papers, "pages": pages, "db_path": str(self.db_path)}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Full-text index over a folder of PDFs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    update_parser = sub.add_parser("update", help="Index new or changed PDFs in a folder")
+    update_parser.add_argument("folder")
+    search_parser = sub.add_parser("search", help="Search the indexed PDFs of a folder")
+    search_parser.add_argument("folder")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    index = CorpusIndex()
+    if args.command == "update":
+        started = time.time()
+        result = index.update_folder(args.folder)
+        print(f"Indexed {args.folder} in {time.time() - started:.1f}s: "
+              f"{result['added']} added, {result['updated']} updated, {result['unchanged']} unchanged, "
+              f"{result['removed']} removed, {result['failed']} failed")
+    elif args.command == "search":
+        index.update_folder(args.folder)
+        hits = index.search(args.query, folder=args.folder, limit=args.limit)
+        for hit in hits:
+            print(f"{hit['paper']} p.{hit['page'] + 1}: {hit['snippet']}")
+        if not hits:
+            print("No matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Page-level text index with section detection.
+
+A DocumentIndex holds everything DocMiner reads from a PDF's text layer:
+per-page text, word boxes (in PDF points), detected section headings and
+the character span of each section. It is built once per document and
+stored as gzipped JSON under ~/.docminer/cache/index/<sha256>.json.gz, so
+reopening a paper or re-rendering it at a new zoom never re-extracts text.
+Stored indexes count against the result cache's size budget and are
+evicted least-recently-used with it (python -m utils.result_cache
+stats|prune|clear covers both).
+"""
+
+import bisect
+import gzip
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from utils.parsed_document import open_document
+from utils.result_cache import DEFAULT_CACHE_DIR, get_cache_budget
+
+# Bump when the stored format or section detection changes
+INDEX_VERSION = 1
+
+# Section name -> heading vocabulary (matched against whole, short lines)
+SECTION_HEADINGS = {
+    "abstract": r"abstract",
+    "introduction": r"introduction",
+    "background": r"background|literature review|review of (?:the )?literature|theoretical framework|conceptual framework",
+    "methods": r"methods?|methodology|research design|data and methods|materials and methods",
+    "positionality": r"(?:researcher |author )?positionality(?: statement)?|reflexivity(?: statement)?|researcher identity",
+    "results": r"results|findings",
+    "discussion": r"discussion",
+    "conclusion": r"conclusions?|concluding remarks|final thoughts",
+    "acknowledgements": r"acknowledge?ments?",
+    "references": r"references|bibliography|works cited",
+}
+
+# Words allowed after "and" in compound headings such as "Results and Discussion"
+_HEADING_SUFFIX = (r"data|analysis|procedures?|participants|implications|limitations|recommendations|"
+                   r"future (?:research|directions)|" + "|".join(SECTION_HEADINGS.values()))
+
+_HEADING_RE = re.compile(
+    r"^(?:(?:\d+(?:\.\d+)*|[IVXLC]+)\.?\s+)?"      # optional "2.", "2.1", "III."
+    r"(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_HEADINGS.items()) + r")"
+    r"(?:\s+(?:and|&)\s+(?:" + _HEADING_SUFFIX + r"))?\s*:?$",  # "Methods and Data", "Results:"
+    re.IGNORECASE,
+)
+_MAX_HEADING_LENGTH = 60
+# Lines repeated on this many pages are running headers/footers, not headings
+_RUNNING_HEADER_PAGES = 3
+
+_memory_cache = OrderedDict()   # sha256 -> DocumentIndex
+_path_hashes = OrderedDict()    # (path, mtime, size) -> sha256, least recently used first
+_memory_cache_size = 8
+_path_hashes_size = 1024        # small entries; enough for a large folder
+_memory_lock = threading.Lock()
+
+
+def detect_headings(pages):
+    """
+    Find section headings in page texts.
+
+    Returns:
+        list of dicts: section, text, page, offset (character offset in the
+        full text, where pages are joined by a single newline)
+    """
+    line_pages = {}
+    for page_num, page_text in enumerate(pages):
+        for line in set(page_text.split("\n")):
+            key = line.strip().lower()
+            if key and len(key) <= _MAX_HEADING_LENGTH:
+                line_pages[key] = line_pages.get(key, 0) + 1
+
+    headings = []
+    offset = 0
+    for page_num, page_text in enumerate(pages):
+        line_start = 0
+        for line in page_text.split("\n"):
+            stripped = line.strip()
+            if (stripped and len(stripped) <= _MAX_HEADING_LENGTH
+                    and line_pages.get(stripped.lower(), 0) < _RUNNING_HEADER_PAGES):
+                match = _HEADING_RE.match(stripped)
+                first_letter = next((c for c in stripped if c.isalpha()), "")
+                if match and first_letter.isupper():
+                    headings.append({
+                        "section": match.lastgroup,
+                        "text": stripped,
+                        "page": page_num,
+                        "offset": offset + line_start,
+                    })
+            line_start += len(line) + 1
+        offset += len(page_text) + 1
+    return headings
+
+
+def sections_from_headings(headings, text_length):
+    """
+    Map each section name to its (start, end) character span.
+    A section runs from its heading to the next heading; when a name occurs
+    more than once (e.g. a table of contents) the longest span wins.
+    """
+    sections = {}
+    for i, heading in enumerate(headings):
+        start = heading["offset"]
+        end = headings[i + 1]["offset"] if i + 1 < len(headings) else text_length
+        name = heading["section"]
+        if name not in sections or (end - start) > (sections[name][1] - sections[name][0]):
+            sections[name] = (start, end)
+    return sections
+
+
+class DocumentIndex:
+    """Per-document text, word boxes and section boundaries."""
+
+    def __init__(self, sha256, pages, words, headings=None):
+        self.sha256 = sha256
+        self.pages = pages          # list of page text
+        self._words = words         # list (per page) of [x0, y0, x1, y1, text]
+        self.full_text = "\n".join(pages)
+        self.page_offsets = []
+        offset = 0
+        for page_text in pages:
+            self.page_offsets.append(offset)
+            offset += len(page_text) + 1
+        self.headings = headings if headings is not None else detect_headings(pages)
+        self.sections = sections_from_headings(self.headings, len(self.full_text))
+
+    @classmethod
+    def build(cls, doc, sha256=None):
+        """Extract text and word boxes for every page of a ParsedDocument."""
+        pages = doc.pages_text()
+        words = [
+            [[round(w[0], 2), round(w[1], 2), round(w[2], 2), round(w[3], 2), w[4]]
+             for w in doc.words(page_num)]
+            for page_num in range(doc.page_count)
+        ]
+        return cls(sha256 or doc.sha256, pages, words)
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def words(self, page_num):
+        """Word boxes for a page as [x0, y0, x1, y1, text] in PDF points."""
+        if 0 <= page_num < len(self._words):
+            return self._words[page_num]
+        return []
+
+    def page_for_offset(self, offset):
+        """0-based page containing a full-text character offset."""
+        return max(0, bisect.bisect_right(self.page_offsets, offset) - 1)
+
+    def section_text(self, name, max_chars=None):
+        """Text of a detected section ('' if it was not found)."""
+        span = self.sections.get(name)
+        if not span:
+            return ""
+        text = self.full_text[span[0]:span[1]]
+        return text[:max_chars] if max_chars else text
+
+    def to_dict(self):
+        return {
+            "version": INDEX_VERSION,
+            "sha256": self.sha256,
+            "pages": self.pages,
+            "words": self._words,
+            "headings": self.headings,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["sha256"], data["pages"], data["words"], data.get("headings"))
+
+
+def index_dir():
+    """Directory holding stored indexes (next to the result cache)."""
+    return Path(os.getenv("DOCMINER_CACHE_DIR") or DEFAULT_CACHE_DIR) / "index"
+
+
+def _read_index(path):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION:
+        return None
+    try:
+        os.utime(path)  # mark as recently used for the cache's LRU eviction
+    except OSError:
+        pass
+    return DocumentIndex.from_dict(data)
+
+
+def _write_index(path, index):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        size = tmp_path.stat().st_size
+        try:
+            replaced_bytes = path.stat().st_size
+        except OSError:
+            replaced_bytes = 0
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not store document index: {e}")
+        return
+    get_cache_budget().add_written(size, replaced_bytes)
+
+
+def _remember(index):
+    with _memory_lock:
+        _memory_cache[index.sha256] = index
+        _memory_cache.move_to_end(index.sha256)
+        while len(_memory_cache) > _memory_cache_size:
+            _memory_cache.popitem(last=False)
+
+
+def _document_sha256(doc):
+    """Content hash, memoised by (path, mtime, size) so reopening skips hashing."""
+    try:
+        st = os.stat(doc.pdf_path)
+        stat_key = (os.path.abspath(doc.pdf_path), st.st_mtime, st.st_size)
+    except OSError:
+        return doc.sha256
+    with _memory_lock:
+        sha = _path_hashes.get(stat_key)
+        if sha is not None:
+            _path_hashes.move_to_end(stat_key)
+    if sha is None:
+        sha = doc.sha256
+        with _memory_lock:
+            _path_hashes[stat_key] = sha
+            while len(_path_hashes) > _path_hashes_size:
+                _path_hashes.popitem(last=False)
+    return sha
+
+
+def load_document_index(source):
+    """
+    Return the DocumentIndex for a path or ParsedDocument, building and
+    storing it on first use. Later calls are served from memory or disk.
+    """
+    with open_document(source) as doc:
+        sha = _document_sha256(doc)
+        with _memory_lock:
+            index = _memory_cache.get(sha)
+        if index is not None:
+            return index
+
+        path = index_dir() / f"{sha}.json.gz"
+        index = _read_index(path)
+        if index is None:
+            index = DocumentIndex.build(doc, sha)
+            _write_index(path, index)
+        _remember(index)
+        return index
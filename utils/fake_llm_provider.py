@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the chat-completions API.
+
+FakeChatProvider answers POST /chat/completions with canned YES/NO answers
+(and a CONFIDENCE/ASSESSMENT block for the final-assessment prompt) after a
+configurable latency, and injects rate limits, server errors and timeouts at
+configurable rates. An injected timeout never answers: the request hangs for
+hang_seconds (longer than any client timeout) and the connection is then
+dropped, so clients see their own timeout error. Whether a prompt gets YES depends only on a hash of the
+prompt and the seed, so the same corpus gets the same answers on every run.
+
+It can run inside the application or as a separate HTTP server:
+
+    # Inside the app: served from a background thread on a loopback port
+    DOCMINER_OPENAI_BASE_URL="fake://?latency_ms=300&error_rate=0.05&yes_rate=0.3"
+
+    # HTTP server for other processes / tools
+    python -m utils.fake_llm_provider --port 8089 --latency-ms 300
+    DOCMINER_OPENAI_BASE_URL=http://127.0.0.1:8089/v1
+
+No API key is needed for either.
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+class FakeChatProvider:
+    """Deterministic, latency- and error-injecting chat-completions endpoint."""
+
+    def __init__(self, latency_ms=200.0, latency_sigma=0.0, yes_rate=0.3, error_rate=0.0,
+                 rate_limit_rate=0.0, timeout_rate=0.0, retry_after=1.0, hang_seconds=600.0, seed=0):
+        """
+        Args:
+            latency_ms: Median response time
+            latency_sigma: Spread of a log-normal latency distribution (0 = always latency_ms)
+            yes_rate: Fraction of prompts answered YES
+            error_rate: Fraction of requests failing with HTTP 500
+            rate_limit_rate: Fraction of requests failing with HTTP 429 (with Retry-After)
+            timeout_rate: Fraction of requests that get no response (the client times out)
+            retry_after: Retry-After seconds sent with 429s
+            hang_seconds: How long a timed-out request is held open before the connection is
+                dropped; keep it above the client's timeout
+            seed: Seed for answers, latencies and injected failures
+        """
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.yes_rate = yes_rate
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.retry_after = retry_after
+        self.hang_seconds = hang_seconds
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.counts = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "timeouts": 0, "max_in_flight": 0}
+
+    @classmethod
+    def from_url(cls, url):
+        """Provider configured from a fake:// URL's query, e.g. fake://?latency_ms=50&yes_rate=0.5"""
+        params = {key: float(value) for key, value in parse_qsl(urlparse(url).query)}
+        if "seed" in params:
+            params["seed"] = int(params["seed"])
+        return cls(**params)
+
+    def _latency(self):
+        with self._lock:
+            factor = math.exp(self._random.gauss(0, self.latency_sigma)) if self.latency_sigma else 1.0
+        return self.latency_ms * factor / 1000.0
+
+    def _failure(self):
+        """'rate_limited', 'error', 'timeout' or None for this request."""
+        with self._lock:
+            roll = self._random.random()
+        for outcome, rate in (("rate_limited", self.rate_limit_rate), ("error", self.error_rate),
+                              ("timeout", self.timeout_rate)):
+            if roll < rate:
+                return outcome
+            roll -= rate
+        return None
+
+    def _is_yes(self, prompt):
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64 < self.yes_rate
+
+    def answer(self, messages):
+        """Canned answer text for a list of chat messages."""
+        system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        found = self._is_yes(system + user)
+        if "CONFIDENCE:" in system:
+            confidence = 0.8 if found else 0.2
+            return (f"CONFIDENCE: {confidence}\n"
+                    f"ASSESSMENT: Offline assessment ({'positionality present' if found else 'none found'}).\n"
+                    "ADDITIONAL_EVIDENCE: None")
+        if not found:
+            return "NO"
+        # Quote the first sentence of the text under analysis as evidence
+        text = user.split("\n\n", 1)[-1].strip()
+        quote = text.split(". ")[0][:200] or "I position myself as a researcher."
+        return f"YES\n{quote}"
+
+    def handle(self, payload):
+        """
+        Serve one chat-completions request.
+
+        Returns:
+            (status, headers, body dict), or None when the request should time out
+        """
+        with self._lock:
+            self.counts["requests"] += 1
+            self._in_flight += 1
+            self.counts["max_in_flight"] = max(self.counts["max_in_flight"], self._in_flight)
+        try:
+            time.sleep(self._latency())
+            failure = self._failure()
+            with self._lock:
+                self.counts[{"rate_limited": "rate_limited", "error": "errors",
+                             "timeout": "timeouts", None: "ok"}[failure]] += 1
+            if failure == "timeout":
+                return None
+            if failure == "rate_limited":
+                return 429, {"retry-after": str(self.retry_after)}, {
+                    "error": {"message": "Rate limit reached (fake provider)", "type": "rate_limit_exceeded"}}
+            if failure == "error":
+                return 500, {}, {"error": {"message": "Internal error (fake provider)", "type": "server_error"}}
+
+            messages = payload.get("messages", [])
+            content = self.answer(messages)
+            prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+            completion_tokens = max(1, len(content) // 4)
+            return 200, {}, {
+                "id": f"chatcmpl-fake-{self.counts['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "fake"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            }
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+def make_server(provider, host="127.0.0.1", port=0):
+    """ThreadingHTTPServer serving provider at http://host:port/v1 (port 0 picks a free port)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self.send_error(400)
+                return
+            result = provider.handle(payload)
+            if result is None:
+                # Injected timeout: answer nothing until the client has given up, then hang up
+                time.sleep(provider.hang_seconds)
+                self.close_connection = True
+                return
+            status, headers, body = result
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark output clean
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_server(provider, host="127.0.0.1", port=0):
+    """Serve provider on a daemon thread; returns (server, base_url). Call server.shutdown() to stop."""
+    server = make_server(provider, host, port)
+    threading.Thread(target=server.serve_forever, name="FakeChatProvider", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline chat-completions endpoint for testing and benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.0)
+    parser.add_argument("--yes-rate", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--hang-seconds", type=float, default=600.0,
+                        help="How long timed-out requests are held before the connection is dropped")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    provider = FakeChatProvider(
+        latency_ms=args.latency_ms, latency_sigma=args.latency_sigma, yes_rate=args.yes_rate,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, timeout_rate=args.timeout_rate,
+        retry_after=args.retry_after, hang_seconds=args.hang_seconds, seed=args.seed,
+    )
+    server = make_server(provider, args.host, args.port)
+    print(f"Fake chat-completions provider at http://{args.host}:{server.server_address[1]}/v1 (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {provider.stats()}")
+
+
+if __name__ == "__main__":
+    main()
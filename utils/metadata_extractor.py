@@ -1,60 +1,137 @@
 import os
-from openai import OpenAI, AuthenticationError, APIError
+from openai import AuthenticationError, APIError
+from utils.openai_client import get_shared_client
 
 # Initialize global client variable (will be configured on first use)
 _openai_client = None
 
+def openai_credentials():
+    """
+    (api_key, base_url) for AI analysis from the environment; api_key is None
+    when AI analysis is not configured (no key and no DOCMINER_OPENAI_BASE_URL).
+    """
+    api_key = (os.getenv("RESEARCH_BUDDY_OPENAI_API_KEY") or 
+              os.getenv("OPENAI_API_KEY") or "")
+    base_url = os.getenv("DOCMINER_OPENAI_BASE_URL") or None
+    
+    if not api_key and base_url:
+        api_key = "docminer-offline"  # Local endpoints don't check the key
+    return api_key or None, base_url
+
 def get_openai_client():
-    """Get configured OpenAI client with correct API endpoint."""
+    """
+    Get the shared OpenAI client with the correct API endpoint.
+    The client (and its keep-alive connection pool) is reused across papers
+    and threads; it is rebuilt only when the API key or endpoint changes.
+    
+    DOCMINER_OPENAI_BASE_URL overrides the endpoint, e.g. a local server or
+    fake:// for the offline provider (utils/fake_llm_provider.py); no API
+    key is needed then.
+    """
     global _openai_client
     
     # Always reload from environment in case config changed
-    api_key = (os.getenv("RESEARCH_BUDDY_OPENAI_API_KEY") or 
-              os.getenv("OPENAI_API_KEY") or "")
-    
+    api_key, base_url = openai_credentials()
     if not api_key:
         print(" No OpenAI API key found. AI analysis will be disabled.")
         return None
     
-    # Auto-detect API provider based on key prefix
-    if api_key.startswith("sk-or-"):
-        # OpenRouter key detected
-        base_url = "https://openrouter.ai/api/v1"
-        provider = "OpenRouter"
-    elif api_key.startswith("sk-proj-"):
-        # OpenAI project key
-        base_url = "https://api.openai.com/v1"
-        provider = "OpenAI (project key)"
-    elif api_key.startswith("sk-"):
-        # Standard OpenAI key
-        base_url = "https://api.openai.com/v1"
-        provider = "OpenAI"
-    else:
-        # Unknown key format - default to OpenAI
-        base_url = "https://api.openai.com/v1"
-        provider = f"Unknown (defaulting to OpenAI)"
-    
-    # Create new client with correct endpoint
-    _openai_client = OpenAI(api_key=api_key, base_url=base_url)
-    print(f"Configured OpenAI client for {provider} - endpoint: {base_url}")
-    
+    # Endpoint is auto-detected from the key prefix (OpenAI or OpenRouter) unless overridden
+    _openai_client = get_shared_client(api_key, base_url)
     return _openai_client
 
-import fitz  # PyMuPDF
 import re
-import pdfplumber
+import time
 import requests
-from PyPDF2 import PdfReader
+from concurrent.futures import ThreadPoolExecutor
+from utils.parsed_document import ParsedDocument, open_document
+from utils.document_index import load_document_index
+from utils.context_builder import AnalysisContext
+from utils.pattern_detector import scan_document
+from utils.positionality_prefilter import prefilter_thresholds, screen_document
+from utils.result_cache import get_result_cache
+from utils.request_scheduler import get_request_scheduler, provider_for_base_url
+from utils import analysis_telemetry as telemetry
+
+# Model used by every positionality pass
+ANALYSIS_MODEL = "gpt-4o-mini"
+
+
+def _chat_completion(client, pass_name, messages, temperature, max_tokens, timeout, document_hash=None,
+                     use_cache=True):
+    """
+    Run one analysis chat completion and return the stripped answer text.
+    When document_hash is given (and use_cache is set) the answer is served
+    from / stored in the on-disk result cache, so re-analysing an unchanged
+    paper costs nothing.
+    The request runs under the provider's rate limit and transient failures
+    are retried (see utils/request_scheduler.py); if it still fails the
+    error is raised, never turned into an answer.
+    Each call emits a 'pass' telemetry record (see utils/analysis_telemetry.py).
+    """
+    started = time.perf_counter()
+    stats = {}
+    record = {
+        "kind": "pass",
+        "pass": pass_name,
+        "document": document_hash,
+        "model": ANALYSIS_MODEL,
+        "context_chars": sum(len(message["content"]) for message in messages),
+        "cache": "off",
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+    }
+    try:
+        cache = get_result_cache() if document_hash and use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(document_hash, pass_name, messages, ANALYSIS_MODEL,
+                                       temperature, max_tokens=max_tokens)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                record["cache"] = "hit"
+                return cached["answer"]
+            record["cache"] = "miss"
+        
+        resp = get_request_scheduler().run(
+            provider_for_base_url(client.base_url),
+            lambda: client.chat.completions.create(
+                model=ANALYSIS_MODEL,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout
+            ),
+            stats=stats
+        )
+        if resp.usage is not None:
+            record["prompt_tokens"] = resp.usage.prompt_tokens
+            record["completion_tokens"] = resp.usage.completion_tokens
+        answer = resp.choices[0].message.content.strip()
+        
+        if cache is not None:
+            cache.put(cache_key, {"answer": answer, "pass": pass_name, "model": ANALYSIS_MODEL})
+        return answer
+    except Exception as e:
+        record["error"] = str(e) or type(e).__name__
+        raise
+    finally:
+        record["wall_time"] = time.perf_counter() - started
+        record["queue_wait"] = stats.get("queue_wait", 0.0)
+        record["retries"] = stats.get("retries", 0)
+        telemetry.emit(record)
+
 
 def extract_metadata_pymupdf(pdf_path):
     """
     Extract embedded metadata using PyMuPDF (fitz).
+    Accepts a path or a ParsedDocument.
     Returns dict: title, author, subject, keywords, creation_date, producer.
     """
     meta = {"title": None, "author": None, "subject": None, "keywords": None, "creation_date": None, "producer": None}
     try:
-        doc = fitz.open(pdf_path)
-        raw = doc.metadata
+        with open_document(pdf_path) as doc:
+            raw = doc.metadata
         meta.update({
             "title": raw.get("title"),
             "author": raw.get("author"),
@@ -64,19 +141,20 @@ def extract_metadata_pymupdf(pdf_path):
             "producer": raw.get("producer"),
         })
     except Exception as e:
-        print(f"PyMuPDF metadata extraction failed for {pdf_path}: {e}")
+        print(f"PyMuPDF metadata extraction failed for {_source_name(pdf_path)}: {e}")
     return meta
 
 
-def extract_metadata_pdfplumber(pdf_path):
+def extract_text_metadata(pdf_path):
     """
-    Extract text-based metadata using pdfplumber by scanning the first two pages.
+    Extract text-based metadata by scanning the first two pages' PyMuPDF text.
+    Accepts a path or a ParsedDocument.
     Returns dict: title, author, journal, volume, issue, pages, doi.
     """
     meta = {"title": None, "author": None, "journal": None, "volume": None, "issue": None, "pages": None, "doi": None}
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = "".join(page.extract_text() or "" for page in pdf.pages[:2])
+        with open_document(pdf_path) as doc:
+            text = doc.text(0, 2)
         match = re.search(r"^Title:\s*(.*)$", text, re.MULTILINE)
         if match: meta["title"] = match.group(1).strip()
         match = re.search(r"^Author[s]?:\s*(.*)$", text, re.MULTILINE)
@@ -84,24 +162,34 @@ def extract_metadata_pdfplumber(pdf_path):
         match = re.search(r"doi:\s*(10\.\d{4,9}/[-._;()/:A-Z0-9]+)", text, re.IGNORECASE)
         if match: meta["doi"] = match.group(1)
     except Exception as e:
-        print(f"PdfPlumber metadata extraction failed for {pdf_path}: {e}")
+        print(f"Text metadata extraction failed for {_source_name(pdf_path)}: {e}")
     return meta
 
 
+# Former name, from when this scan used pdfplumber; kept for existing callers
+extract_metadata_pdfplumber = extract_text_metadata
+
+
 def extract_doi(pdf_path):
     """
-    Scan the first two pages for a DOI using PyPDF2.
+    Scan the first two pages for a DOI.
+    Accepts a path or a ParsedDocument.
     """
     try:
-        reader = PdfReader(pdf_path)
-        text = "".join(page.extract_text() or "" for page in reader.pages[:2])
+        with open_document(pdf_path) as doc:
+            text = doc.text(0, 2)
         match = re.search(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", text, re.IGNORECASE)
         if match: return match.group(0)
     except Exception as e:
-        print(f"PyPDF2 DOI extraction failed for {pdf_path}: {e}")
+        print(f"DOI extraction failed for {_source_name(pdf_path)}: {e}")
     return None
 
 
+def _source_name(source):
+    """Printable path for a path or ParsedDocument"""
+    return source.pdf_path if isinstance(source, ParsedDocument) else source
+
+
 def crossref_lookup(doi_or_title):
     """
     Lookup metadata from Crossref using DOI or title.
@@ -161,7 +249,7 @@ def datacite_lookup(doi):
         print(f"DataCite lookup returned invalid JSON for {doi}")
     return {}
 
-def extract_positionality(pdf_path, progress_callback=None):
+def extract_positionality(pdf_path, progress_callback=None, concurrent=True, use_cache=True, prefilter=True):
     """
     Deep contextual AI analysis of positionality in academic papers.
     Uses multi-pass semantic analysis for thorough understanding.
@@ -169,10 +257,16 @@ def extract_positionality(pdf_path, progress_callback=None):
     
     This analysis is designed to take 30-60 seconds for thorough semantic understanding
     that goes beyond simple pattern matching. It provides value students can't easily replicate.
+    With concurrent=True (the default) passes 1 and 2 run in parallel, so wall time is roughly
+    the slower of those two calls plus passes 3 and 4.
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_path: Path to the PDF file, or a ParsedDocument to reuse an existing parse
         progress_callback: Optional callable(progress_pct, message) for progress updates
+        concurrent: Run the independent passes 1 and 2 on a small thread pool
+        use_cache: Reuse answers stored in the on-disk result cache (see utils/result_cache.py)
+        prefilter: Skip the AI passes for papers the local screen finds clearly negative
+            (see utils/positionality_prefilter.py; DOCMINER_PREFILTER=0 also disables it)
     """
     
     def report_progress(pct, msg):
@@ -191,54 +285,76 @@ def extract_positionality(pdf_path, progress_callback=None):
     snippets = {}
     score = 0.0
     
-    # Extract full PDF text for comprehensive analysis
+    # Extract full PDF text for comprehensive analysis (page index is cached on disk)
     report_progress(10, "Reading entire document...")
+    started = time.perf_counter()
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # Get text from all pages with section markers
-            sections = {}
-            full_text = []
-            
-            for i, page in enumerate(pdf.pages):
-                page_text = page.extract_text() or ""
-                full_text.append(page_text)
-                
-                # Identify key sections
-                if i == 0:
-                    sections['introduction'] = page_text[:2000]
-                elif i < 3:
-                    if not sections.get('introduction'):
-                        sections['introduction'] = sections.get('introduction', '') + '\n' + page_text
-                
-                # Look for methodology/methods section
-                if re.search(r'\b(Methods?|Methodology)\b', page_text, re.IGNORECASE):
-                    sections['methods'] = page_text[:2000]
-                
-            # Get conclusion (last 2 pages)
-            if len(pdf.pages) >= 2:
-                sections['conclusion'] = '\n'.join(p.extract_text() or "" for p in pdf.pages[-2:])
-            
-            full_text_str = '\n'.join(full_text)
-            total_words = len(full_text_str.split())
-            
+        index = load_document_index(pdf_path)
+        # Each pass gets the most relevant paragraphs that fit its token budget
+        context = AnalysisContext(index)
+        document_hash = index.sha256
+        read_time = time.perf_counter() - started
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return {'positionality_tests': [], 'positionality_snippets': {}, 'positionality_score': 0.0}
     
+    # Local screen: papers without first-person or reflexivity language skip the AI passes
+    thresholds = prefilter_thresholds() if prefilter else None
+    screening = screen_document(index.full_text, thresholds) if thresholds else None
+    if screening and screening['verdict'] == 'negative':
+        explanation = _generate_explanation([], {}, 0.0)
+        explanation += ("\nScreened locally: no first-person or reflexivity language was found, "
+                        "so the AI passes were skipped.\n")
+        report_progress(100, "No positionality language found - AI passes skipped")
+        telemetry.emit({
+            "kind": "analysis",
+            "document": document_hash,
+            "paper": os.path.basename(str(_source_name(pdf_path))),
+            "read_time": read_time,
+            "wall_time": time.perf_counter() - started,
+            "score": 0.0,
+            "failed_passes": [],
+            "prefilter": "negative",
+        })
+        return {
+            "positionality_tests": [],
+            "positionality_snippets": {'ai_explanation': explanation},
+            "positionality_score": 0.0,
+            "positionality_errors": {},
+            "positionality_prefilter": screening
+        }
+    
+    # PASS 1 + PASS 2 depend only on the document text, so by default they
+    # are fired together and the paper waits for the slower of the two calls.
+    explicit_context = context.build('explicit')
+    reflexive_context = context.build('reflexive')
+    
     # PASS 1: Explicit positionality detection (15-30%)
     report_progress(15, "Pass 1/4: Scanning for explicit positionality statements...")
-    explicit_result = _analyze_explicit_positionality(client, sections.get('introduction', ''), 
-                                                       sections.get('methods', ''))
+    if concurrent:
+        # PASS 2: Reflexive awareness detection (30-45%)
+        report_progress(30, "Pass 2/4: Analyzing for reflexive awareness and researcher positioning...")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            explicit_future = pool.submit(_analyze_explicit_positionality, client, explicit_context,
+                                          document_hash, use_cache)
+            reflexive_future = pool.submit(_analyze_reflexive_awareness, client, reflexive_context,
+                                           document_hash, use_cache)
+            explicit_result = explicit_future.result()
+            reflexive_result = reflexive_future.result()
+    else:
+        explicit_result = _analyze_explicit_positionality(client, explicit_context, document_hash, use_cache)
+    
     if explicit_result['found']:
         matched.append('explicit_positionality')
         snippets['explicit'] = explicit_result['evidence']
         score = max(score, 0.9)
         report_progress(30, "Found explicit positionality statement!")
     
-    # PASS 2: Reflexive awareness detection (30-45%)
-    report_progress(30, "Pass 2/4: Analyzing for reflexive awareness and researcher positioning...")
-    reflexive_result = _analyze_reflexive_awareness(client, sections.get('methods', ''), 
-                                                     sections.get('conclusion', ''))
+    if not concurrent:
+        # PASS 2: Reflexive awareness detection (30-45%)
+        report_progress(30, "Pass 2/4: Analyzing for reflexive awareness and researcher positioning...")
+        reflexive_result = _analyze_reflexive_awareness(client, reflexive_context, document_hash, use_cache)
+    
     if reflexive_result['found']:
         matched.append('reflexive_awareness')
         snippets['reflexive'] = reflexive_result['evidence']
@@ -246,9 +362,10 @@ def extract_positionality(pdf_path, progress_callback=None):
         report_progress(45, "Found reflexive awareness!")
     
     # PASS 3: Subtle/implicit positionality (45-65%)
+    subtle_result = {'found': False}
     if score < 0.5:  # Only do deep scan if we haven't found strong signals yet
         report_progress(45, "Pass 3/4: Deep contextual analysis for subtle positionality...")
-        subtle_result = _analyze_subtle_positionality(client, full_text_str, total_words)
+        subtle_result = _analyze_subtle_positionality(client, context.build('subtle'), document_hash, use_cache)
         if subtle_result['found']:
             matched.append('subtle_positionality')
             snippets['subtle'] = subtle_result['evidence']
@@ -259,25 +376,46 @@ def extract_positionality(pdf_path, progress_callback=None):
     
     # PASS 4: Final comprehensive assessment (65-90%)
     report_progress(70, "Pass 4/4: Comprehensive semantic assessment...")
-    assessment = _final_comprehensive_assessment(client, sections, matched, snippets)
+    assessment = _final_comprehensive_assessment(client, context.build('final_assessment'), matched, snippets,
+                                                 document_hash, use_cache)
     
     # Combine all findings
     final_snippets = {**snippets, **assessment.get('additional_evidence', {})}
     final_score = assessment.get('confidence_score', score)
     final_tests = matched + assessment.get('additional_patterns', [])
     
+    # Passes that still failed after retries: their "not found" is not a verdict
+    errors = {
+        name: result['error']
+        for name, result in (('explicit', explicit_result), ('reflexive', reflexive_result),
+                             ('subtle', subtle_result), ('final_assessment', assessment))
+        if result.get('error')
+    }
+    
     report_progress(95, "Generating detailed analysis report...")
     
     # Generate human-readable explanation
-    explanation = _generate_explanation(final_tests, final_snippets, final_score)
+    explanation = _generate_explanation(final_tests, final_snippets, final_score, errors)
     final_snippets['ai_explanation'] = explanation
     
-    report_progress(100, "Deep analysis complete!")
+    report_progress(100, "Analysis incomplete - some passes failed" if errors else "Deep analysis complete!")
+    telemetry.emit({
+        "kind": "analysis",
+        "document": document_hash,
+        "paper": os.path.basename(str(_source_name(pdf_path))),
+        "read_time": read_time,
+        "wall_time": time.perf_counter() - started,
+        "score": final_score,
+        "failed_passes": sorted(errors),
+        "prefilter": screening['verdict'] if screening else None,
+    })
     
     return {
         "positionality_tests": final_tests,
         "positionality_snippets": final_snippets,
-        "positionality_score": final_score
+        "positionality_score": final_score,
+        "positionality_errors": errors,
+        "positionality_prefilter": screening
     }
 
 
@@ -285,26 +423,17 @@ def _fallback_regex_analysis(pdf_path, report_progress):
     """Fallback regex-based analysis when AI is not available"""
     report_progress(20, "AI unavailable - using pattern matching...")
     
-    # Quick regex scan as fallback
+    # One scan of every page with the full pattern library (see utils/pattern_detector.py)
     matched = []
     snippets = {}
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            first_page = pdf.pages[0].extract_text() or ""
-            
-            patterns = {
-                "positionality_term": r"\bpositionalit\w*\b",
-                "first_person_reflexivity": r"\bI\s+(?:acknowledge|recognize|reflect)",
-            }
-            
-            for name, pattern in patterns.items():
-                if re.search(pattern, first_page, re.IGNORECASE):
-                    matched.append(name)
-                    snippets[name] = "Pattern match found (AI analysis unavailable for details)"
-                    break
-    except Exception:
-        pass
+        for match in scan_document(load_document_index(pdf_path)):
+            if match['name'] not in snippets:
+                matched.append(match['name'])
+                snippets[match['name']] = f"{' '.join(match['text'].split())} (page {match['page'] + 1})"
+    except Exception as e:
+        print(f"Pattern matching failed for {_source_name(pdf_path)}: {e}")
     
     report_progress(100, "Basic analysis complete")
     return {
@@ -314,13 +443,11 @@ def _fallback_regex_analysis(pdf_path, report_progress):
     }
 
 
-def _analyze_explicit_positionality(client, intro_text, methods_text):
+def _analyze_explicit_positionality(client, context_text, document_hash=None, use_cache=True):
     """Pass 1: Look for explicit positionality statements"""
     try:
-        combined_text = (intro_text or '')[:3000] + '\n\n' + (methods_text or '')[:3000]
-        
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+        answer = _chat_completion(
+            client, "explicit",
             messages=[
                 {
                     "role": "system",
@@ -340,32 +467,34 @@ If found, return 'YES' followed by the EXACT quote(s) on new lines."""
                 },
                 {
                     "role": "user",
-                    "content": f"Analyze this text for explicit positionality statements:\n\n{combined_text}"
+                    "content": f"Analyze this text for explicit positionality statements:\n\n{context_text}"
                 }
             ],
             temperature=0,
             max_tokens=400,
-            timeout=20.0
+            timeout=20.0,
+            document_hash=document_hash,
+            use_cache=use_cache
         )
         
-        answer = resp.choices[0].message.content.strip()
         if answer.upper().startswith("YES"):
             evidence = '\n'.join(answer.split('\n')[1:]) if '\n' in answer else answer
             return {'found': True, 'evidence': evidence}
         
+    except AuthenticationError:
+        raise
     except Exception as e:
         print(f"Explicit analysis failed: {e}")
+        return {'found': False, 'evidence': '', 'error': str(e)}
     
     return {'found': False, 'evidence': ''}
 
 
-def _analyze_reflexive_awareness(client, methods_text, conclusion_text):
+def _analyze_reflexive_awareness(client, context_text, document_hash=None, use_cache=True):
     """Pass 2: Look for reflexive awareness and researcher self-awareness"""
     try:
-        combined_text = (methods_text or '')[:3000] + '\n\n' + (conclusion_text or '')[:3000]
-        
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+        answer = _chat_completion(
+            client, "reflexive",
             messages=[
                 {
                     "role": "system",
@@ -385,35 +514,34 @@ If found, return 'YES' followed by the most relevant quote(s)."""
                 },
                 {
                     "role": "user",
-                    "content": f"Analyze for reflexive awareness:\n\n{combined_text}"
+                    "content": f"Analyze for reflexive awareness:\n\n{context_text}"
                 }
             ],
             temperature=0,
             max_tokens=400,
-            timeout=25.0
+            timeout=25.0,
+            document_hash=document_hash,
+            use_cache=use_cache
         )
         
-        answer = resp.choices[0].message.content.strip()
         if answer.upper().startswith("YES"):
             evidence = '\n'.join(answer.split('\n')[1:]) if '\n' in answer else answer
             return {'found': True, 'evidence': evidence}
         
+    except AuthenticationError:
+        raise
     except Exception as e:
         print(f"Reflexive analysis failed: {e}")
+        return {'found': False, 'evidence': '', 'error': str(e)}
     
     return {'found': False, 'evidence': ''}
 
 
-def _analyze_subtle_positionality(client, full_text, total_words):
+def _analyze_subtle_positionality(client, context_text, document_hash=None, use_cache=True):
     """Pass 3: Deep analysis for subtle/implicit positionality markers"""
     try:
-        # Analyze in chunks for thoroughness
-        chunk_size = 3000
-        words = full_text.split()[:chunk_size * 3]  # First ~9000 words
-        chunk = ' '.join(words)
-        
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+        answer = _chat_completion(
+            client, "subtle",
             messages=[
                 {
                     "role": "system",
@@ -434,26 +562,31 @@ If found, return 'YES' followed by the relevant passages and WHY they suggest po
                 },
                 {
                     "role": "user",
-                    "content": f"Analyze this text for subtle positionality indicators:\n\n{chunk}"
+                    "content": f"Analyze this text for subtle positionality indicators:\n\n{context_text}"
                 }
             ],
             temperature=0.1,  # Slightly higher for nuanced interpretation
             max_tokens=500,
-            timeout=35.0
+            timeout=35.0,
+            document_hash=document_hash,
+            use_cache=use_cache
         )
         
-        answer = resp.choices[0].message.content.strip()
         if answer.upper().startswith("YES"):
             evidence = '\n'.join(answer.split('\n')[1:]) if '\n' in answer else answer
             return {'found': True, 'evidence': evidence}
         
+    except AuthenticationError:
+        raise
     except Exception as e:
         print(f"Subtle analysis failed: {e}")
+        return {'found': False, 'evidence': '', 'error': str(e)}
     
     return {'found': False, 'evidence': ''}
 
 
-def _final_comprehensive_assessment(client, sections, matched_patterns, snippets):
+def _final_comprehensive_assessment(client, context_text, matched_patterns, snippets, document_hash=None,
+                                    use_cache=True):
     """Pass 4: Final comprehensive assessment and confidence scoring"""
     try:
         # Summarize what we found so far
@@ -462,11 +595,8 @@ def _final_comprehensive_assessment(client, sections, matched_patterns, snippets
         for key, value in snippets.items():
             findings_summary += f"- {key}: {value[:200]}...\n"
         
-        intro_sample = sections.get('introduction', '')[:1500]
-        methods_sample = sections.get('methods', '')[:1500]
-        
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+        answer = _chat_completion(
+            client, "final_assessment",
             messages=[
                 {
                     "role": "system",
@@ -486,16 +616,16 @@ ADDITIONAL_EVIDENCE: [Any new quotes found, or "None"]"""
                 },
                 {
                     "role": "user",
-                    "content": f"Preliminary findings:\n{findings_summary}\n\nIntroduction sample:\n{intro_sample}\n\nMethods sample:\n{methods_sample}\n\nProvide final assessment:"
+                    "content": f"Preliminary findings:\n{findings_summary}\n\nKey passages from the paper:\n{context_text}\n\nProvide final assessment:"
                 }
             ],
             temperature=0.2,
             max_tokens=600,
-            timeout=30.0
+            timeout=30.0,
+            document_hash=document_hash,
+            use_cache=use_cache
         )
         
-        answer = resp.choices[0].message.content.strip()
-        
         # Parse response
         confidence_match = re.search(r'CONFIDENCE:\s*([0-9.]+)', answer)
         confidence = float(confidence_match.group(1)) if confidence_match else 0.5
@@ -519,12 +649,15 @@ ADDITIONAL_EVIDENCE: [Any new quotes found, or "None"]"""
         
         return result
         
+    except AuthenticationError:
+        raise
     except Exception as e:
+        # No confidence_score: the caller keeps the score from the earlier passes
         print(f"Final assessment failed: {e}")
-        return {'confidence_score': 0.5, 'additional_evidence': {}, 'additional_patterns': []}
+        return {'additional_evidence': {}, 'additional_patterns': [], 'error': str(e)}
 
 
-def _generate_explanation(patterns, snippets, score):
+def _generate_explanation(patterns, snippets, score, errors=None):
     """Generate human-readable explanation of findings"""
     if score >= 0.7:
         level = "STRONG positionality detected"
@@ -548,18 +681,32 @@ def _generate_explanation(patterns, snippets, score):
         explanation += "No clear positionality statements were identified in this paper.\n"
         explanation += "The author does not explicitly discuss their position, background, or potential biases.\n"
     
+    if errors:
+        explanation += (f"\nIncomplete analysis: {len(errors)} pass(es) failed ({', '.join(errors)}) "
+                        "after retries. Run the analysis again before relying on this result.\n")
+    
     return explanation
 
 
 def extract_metadata(pdf_path):
+    """
+    Full metadata + positionality extraction for one paper.
+    The PDF is parsed once and the same ParsedDocument is handed to every extractor.
+    """
+    with open_document(pdf_path) as doc:
+        return _extract_metadata(doc)
+
+
+def _extract_metadata(doc):
+    pdf_path = doc.pdf_path
     meta = {}
-    meta.update(extract_metadata_pymupdf(pdf_path))
-    text_meta = extract_metadata_pdfplumber(pdf_path)
+    meta.update(extract_metadata_pymupdf(doc))
+    text_meta = extract_text_metadata(doc)
     meta.update(text_meta)
 
     if meta.get("doi"): meta["doi"] = meta["doi"].strip().rstrip('.;,')
     if not meta.get("doi"):
-        doi = extract_doi(pdf_path)
+        doi = extract_doi(doc)
         if doi: meta["doi"] = doi.strip().rstrip('.;,')
 
     if meta.get("doi"):
@@ -583,7 +730,7 @@ def extract_metadata(pdf_path):
             meta["author"] = auth
             meta["author_from_filename"] = auth
 
-    pos = extract_positionality(pdf_path)
+    pos = extract_positionality(doc)
     meta["positionality_tests"]   = pos.get("positionality_tests", [])
     meta["positionality_snippets"] = pos.get("positionality_snippets", {})
     meta["positionality_score"]    = pos.get("positionality_score", 0.0)
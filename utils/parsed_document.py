@@ -0,0 +1,123 @@
+"""
+Single-parse PDF document model.
+
+Opens a PDF once with PyMuPDF and exposes metadata, per-page text and
+word boxes lazily, so metadata extraction, DOI lookup and positionality
+analysis can all share one parse instead of re-opening the file.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import fitz  # PyMuPDF
+
+from utils.result_cache import file_sha256
+
+
+class ParsedDocument:
+    """
+    Lazily-decoded view of a PDF file.
+
+    Nothing is read until it is asked for, and every page is decoded at most
+    once. Pass an instance anywhere an extractor accepts a ``pdf_path``.
+    """
+
+    def __init__(self, pdf_path):
+        self.pdf_path = str(pdf_path)
+        self._doc = None
+        self._metadata = None
+        self._page_text = {}
+        self._page_words = {}
+        self._sha256 = None
+        # PyMuPDF documents are not safe to use from several threads at once
+        self._lock = threading.RLock()
+
+    @classmethod
+    def open(cls, source):
+        """Return ``source`` unchanged if it is already parsed, else wrap the path."""
+        if isinstance(source, cls):
+            return source
+        return cls(source)
+
+    @property
+    def doc(self):
+        """The underlying ``fitz.Document`` (opened on first access)."""
+        with self._lock:
+            if self._doc is None:
+                self._doc = fitz.open(self.pdf_path)
+            return self._doc
+
+    @property
+    def sha256(self):
+        """Hex SHA-256 of the file bytes - the document's content address."""
+        with self._lock:
+            if self._sha256 is None:
+                self._sha256 = file_sha256(self.pdf_path)
+            return self._sha256
+
+    @property
+    def page_count(self):
+        return len(self.doc)
+
+    @property
+    def metadata(self):
+        """Embedded PDF metadata dict as reported by PyMuPDF."""
+        with self._lock:
+            if self._metadata is None:
+                self._metadata = dict(self.doc.metadata or {})
+            return self._metadata
+
+    def page_text(self, page_num):
+        """Plain text of a single page (0-based)."""
+        with self._lock:
+            if page_num not in self._page_text:
+                self._page_text[page_num] = self.doc[page_num].get_text() or ""
+            return self._page_text[page_num]
+
+    def pages_text(self, start=0, stop=None):
+        """List of page texts for ``pages[start:stop]`` (negative indices allowed)."""
+        return [self.page_text(i) for i in range(self.page_count)[start:stop]]
+
+    def text(self, start=0, stop=None):
+        """Concatenated text for ``pages[start:stop]`` separated by newlines."""
+        return "\n".join(self.pages_text(start, stop))
+
+    def words(self, page_num):
+        """
+        Word boxes for a page in PDF points.
+
+        Returns:
+            list of (x0, y0, x1, y1, word, block_no, line_no, word_no) tuples
+        """
+        with self._lock:
+            if page_num not in self._page_words:
+                self._page_words[page_num] = self.doc[page_num].get_text("words")
+            return self._page_words[page_num]
+
+    def close(self):
+        with self._lock:
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@contextmanager
+def open_document(source):
+    """
+    Yield a ParsedDocument for a path or an existing ParsedDocument.
+
+    Documents created here are closed on exit; documents passed in are left
+    open for the caller to reuse.
+    """
+    document = ParsedDocument.open(source)
+    try:
+        yield document
+    finally:
+        if document is not source:
+            document.close()
@@ -0,0 +1,163 @@
+"""
+Single-pass detection of positionality and reflexivity language.
+
+POSITIONALITY_PATTERNS is the positionality pattern library used by the
+application (screening, context ranking and the regex fallback). It
+started as a copy of archive/analysis-tools/enhanced_detection.py; that
+archive script is frozen and nothing imports it, so pattern changes are
+made here only.
+
+The library has 25 regexes. Run one after another, each one walks the
+whole text, and because they start with \\b and ignore case, CPython's
+regex engine cannot skip ahead on a literal prefix: a 60-page paper costs
+25 full scans. A combined alternation is no faster, as the engine still
+tries every branch at every position.
+
+PatternDetector compiles the set once and scans in a single pass instead.
+Every pattern starts at a word boundary with a small set of leading words
+("my|our", "acknowledge|recognize", "positionalit", ...). One trigger regex
+finds the positions where any leading word starts, and only the patterns
+whose leading word can begin with that letter are tried there, anchored.
+The result is the same as running each pattern's finditer() over the
+text, at the cost of roughly one scan.
+"""
+
+import re
+
+# Pattern name -> regex. The maintained copy (the archive one is frozen, see above).
+# Each pattern must start with \b followed by a word or a (?:...) group of words.
+POSITIONALITY_PATTERNS = {
+    # Explicit positionality statements
+    "explicit_positionality": r"\b(?:My|Our) positionality\b",
+    "positionality_term": r"\bpositionalit\w*\b",
+
+    # Identity and background disclosure
+    "identity_disclosure": r"\bAs a (?:woman|man|Black|White|Latina?o?|Asian|Indigenous|queer|trans|disabled|working.class|first.generation)[^.]{0,80}(?:researcher|scholar|I)\b",
+    "background_statement": r"\b(?:My|Our) (?:background|experience|identity|perspective) as [^.]{10,100}",
+    "social_identity": r"\b(?:identify|identities) as (?:a |an )?(?:woman|man|Black|White|Latina?o?|Asian|Indigenous|queer|trans|disabled)[^.]{0,50}",
+
+    # Reflexive awareness and acknowledgment
+    "reflexive_awareness": r"\b(?:acknowledge|recognize|aware|conscious) (?:that )?(?:my|our) [^.]{5,80}(?:influence|affect|shape|bias|perspective|position|lens)",
+    "bias_acknowledgment": r"\b(?:acknowledge|recognize|admit) (?:my|our) (?:own )?(?:bias|biases|assumptions|preconceptions|limitations)",
+    "subjective_awareness": r"\b(?:my|our) (?:subjective|partial|limited) (?:perspective|view|understanding|lens)",
+
+    # Researcher positioning
+    "researcher_positioning": r"\bI,?\s*as (?:a |the )?(?:researcher|scholar|author|investigator),",
+    "positioned_researcher": r"\b(?:positioned|situated) as (?:a |an )?(?:researcher|scholar|outsider|insider)",
+    "researcher_role": r"\b(?:my|our) role as (?:a |the )?(?:researcher|scholar|investigator)",
+
+    # First-person reflexive statements
+    "first_person_reflexivity": r"\bI\s+(?:reflect|acknowledge|consider|recognize|admit|confess|must acknowledge|should note|cannot ignore)",
+    "reflexive_questioning": r"\bI (?:wonder|question|ask myself|consider) [^.]{10,80}(?:position|perspective|bias|influence)",
+    "self_examination": r"\bI (?:examine|explore|investigate) (?:my )?(?:own )?(?:assumptions|biases|position|perspective)",
+
+    # Methodological reflexivity
+    "methodological_reflexivity": r"\b(?:reflexiv|positional)[^.]{0,50}(?:methodology|approach|stance|analysis)",
+    "reflexive_methodology": r"\breflexive (?:methodology|approach|analysis|practice)",
+    "standpoint_theory": r"\b(?:standpoint theory|situated knowledge|feminist standpoint)",
+
+    # Disclosure and transparency
+    "disclosure_statement": r"\b(?:I|We) (?:bring|carry|hold) [^.]{10,80}(?:perspective|lens|experience|bias|assumptions)",
+    "transparency_statement": r"\b(?:transparent|transparency) about (?:my|our) [^.]{10,60}(?:position|bias|perspective)",
+    "position_statement": r"\b(?:position|stance) (?:myself|ourselves) as [^.]{10,60}",
+
+    # Power and privilege awareness
+    "privilege_acknowledgment": r"\b(?:acknowledge|recognize) (?:my|our) [^.]{5,50}(?:privilege|advantages|power)",
+    "power_dynamics": r"\b(?:power dynamics|power relations) [^.]{5,50}(?:research|study|investigation)",
+    "insider_outsider": r"\b(?:insider|outsider) (?:perspective|position|status|researcher)",
+
+    # Limitations and boundaries
+    "limitation_acknowledgment": r"\b(?:limitations? of|bounded by) (?:my|our) [^.]{10,60}(?:perspective|position|experience)",
+    "boundary_awareness": r"\b(?:boundaries|limits) of (?:my|our) [^.]{10,50}(?:understanding|knowledge|perspective)",
+}
+
+# \b then a (?:word|word) group or a single word
+_LEADING_WORDS_RE = re.compile(r"^\\b(?:\(\?:([^()]*)\)|([A-Za-z]+))")
+# Non-ASCII letters that ignore-case matching treats as ASCII ones
+# (the long s, the Kelvin sign, dotted and dotless i)
+_ASCII_FOLDS = {"\u017f": "s", "\u212a": "k", "\u0130": "i", "\u0131": "i"}
+
+
+class PatternDetector:
+    """A compiled set of named patterns, matched in one pass over a text."""
+
+    def __init__(self, patterns=POSITIONALITY_PATTERNS, flags=re.IGNORECASE):
+        """
+        Args:
+            patterns: dict pattern name -> regex; every regex must start with \\b and a
+                word or a (?:...) group of words
+            flags: re flags for every pattern (the trigger scan ignores case either way)
+        """
+        self.names = list(patterns)
+        leading = []
+        # Lowercase first letter of a leading word -> [(name, compiled pattern)] that can start with it
+        self._candidates = {}
+        for name, pattern in patterns.items():
+            match = _LEADING_WORDS_RE.match(pattern)
+            if not match:
+                raise ValueError(f"Pattern {name!r} does not start with \\b and a word: {pattern}")
+            words = match.group(1) or match.group(2)
+            leading.append(words)
+            compiled = re.compile(pattern, flags)
+            for letter in {word[0].lower() for word in words.split("|")}:
+                self._candidates.setdefault(letter, []).append((name, compiled))
+
+        alternatives = sorted(set(leading), key=len, reverse=True)
+        first_letters = "".join(sorted({letter + letter.upper() for letter in self._candidates}))
+        # The character class lets the engine reject most positions before trying the alternatives
+        self._trigger = re.compile(rf"\b(?=[{first_letters}])(?={'|'.join(alternatives)})", re.IGNORECASE)
+
+    def scan(self, text):
+        """
+        Every match of every pattern, in document order.
+        Matches of one pattern do not overlap (as with re.finditer); matches of
+        different patterns may.
+
+        Returns:
+            list of dicts: name, start, end (character offsets into text), text
+        """
+        matches = []
+        pattern_end = {}  # name -> end of its last match
+        for trigger in self._trigger.finditer(text):
+            position = trigger.start()
+            letter = text[position]
+            for name, compiled in self._candidates[_ASCII_FOLDS.get(letter) or letter.lower()]:
+                if position < pattern_end.get(name, 0):
+                    continue
+                match = compiled.match(text, position)
+                if match:
+                    matches.append({"name": name, "start": position, "end": match.end(),
+                                    "text": match.group(0)})
+                    pattern_end[name] = match.end()
+        return matches
+
+    def first_matches(self, text):
+        """Pattern name -> text of its first match, for the patterns found in text."""
+        found = {}
+        for match in self.scan(text):
+            found.setdefault(match["name"], match["text"])
+        return found
+
+
+_default_detector = None
+
+
+def get_detector():
+    """The shared PatternDetector for POSITIONALITY_PATTERNS (compiled on first use)."""
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = PatternDetector()
+    return _default_detector
+
+
+def scan_document(index):
+    """
+    Scan a DocumentIndex's full text once.
+
+    Returns:
+        list of match dicts (see PatternDetector.scan) with an added 'page' (0-based)
+    """
+    matches = get_detector().scan(index.full_text)
+    for match in matches:
+        match["page"] = index.page_for_offset(match["start"])
+    return matches
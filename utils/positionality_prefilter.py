@@ -0,0 +1,99 @@
+"""
+Local screening of papers before the AI positionality passes.
+
+Every analysed paper costs at least three chat completions. Many papers in
+a typical corpus (quantitative studies, reviews) contain no first-person
+language and none of the positionality/reflexivity vocabulary, and the AI
+passes only confirm that. screen_document() scores a paper's text with the
+pattern library in utils/pattern_detector.py plus the density of singular
+first-person words, and classifies it as:
+
+- 'negative': no pattern matches and almost no first-person language;
+  the AI passes are skipped.
+- 'positive': strong pattern evidence; the AI passes run as usual.
+- 'uncertain': everything else; the AI passes run as usual.
+
+Thresholds can be tuned with DOCMINER_PREFILTER_NEGATIVE_SCORE,
+DOCMINER_PREFILTER_NEGATIVE_FIRST_PERSON and DOCMINER_PREFILTER_POSITIVE_SCORE;
+DOCMINER_PREFILTER=0 sends every paper to the AI.
+"""
+
+import os
+import re
+
+from utils.pattern_detector import get_detector
+
+# Evidence weight of each pattern (initially from the archived enhanced_detection.get_pattern_confidence,
+# maintained here); others get DEFAULT_PATTERN_WEIGHT
+PATTERN_WEIGHTS = {
+    "explicit_positionality": 0.9, "positionality_term": 0.9, "identity_disclosure": 0.9,
+    "bias_acknowledgment": 0.9, "reflexive_awareness": 0.9,
+    "researcher_positioning": 0.7, "positioned_researcher": 0.7, "first_person_reflexivity": 0.7,
+    "methodological_reflexivity": 0.7, "disclosure_statement": 0.7,
+    "standpoint_theory": 0.4, "insider_outsider": 0.4, "power_dynamics": 0.4,
+}
+DEFAULT_PATTERN_WEIGHT = 0.5
+
+DEFAULT_THRESHOLDS = {
+    "negative_max_score": 0.0,            # pattern score at or below which a paper can be negative
+    "negative_max_first_person": 0.002,   # ... and at most this share of I/me/my words (2 per 1000)
+    "positive_min_score": 1.5,            # e.g. two high-confidence patterns
+}
+
+# Words after which "I" is a Roman numeral ("Type I error", "Phase I", "World War I")
+ROMAN_NUMERAL_CONTEXT = ("type", "phase", "stage", "grade", "level", "class", "title", "part", "chapter",
+                         "section", "study", "studies", "experiment", "table", "figure", "appendix",
+                         "volume", "vol.", "book", "article", "war")
+
+# Singular only: "we" and "our" are routine in quantitative methods sections.
+# "I" must be upper case (a lower-case i is an index variable or "i.e.") and is
+# not counted as a numeral: after a ROMAN_NUMERAL_CONTEXT word, in "I and II" /
+# "I-III", or as a list marker ("I.", "I)").
+_FIRST_PERSON_RE = re.compile(
+    r"\b(?:me|my|mine|myself)\b|"
+    + "".join(rf"(?<!\b{re.escape(word)} )" for word in ROMAN_NUMERAL_CONTEXT)
+    + r"\b(?-i:I)\b(?![.)])(?!\s*(?:and|or|to|,|&|/|-|–)\s*(?-i:[IV]+)\b)",
+    re.IGNORECASE,
+)
+_WORD_RE = re.compile(r"\w+")
+
+
+def prefilter_thresholds():
+    """Screening thresholds, or None when screening is disabled (DOCMINER_PREFILTER=0)."""
+    if os.getenv("DOCMINER_PREFILTER", "1") == "0":
+        return None
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for key, variable in (("negative_max_score", "DOCMINER_PREFILTER_NEGATIVE_SCORE"),
+                          ("negative_max_first_person", "DOCMINER_PREFILTER_NEGATIVE_FIRST_PERSON"),
+                          ("positive_min_score", "DOCMINER_PREFILTER_POSITIVE_SCORE")):
+        if os.getenv(variable):
+            thresholds[key] = float(os.getenv(variable))
+    return thresholds
+
+
+def screen_document(text, thresholds=None):
+    """
+    Classify a paper's full text as 'negative', 'positive' or 'uncertain'.
+
+    Args:
+        text: The paper's text
+        thresholds: dict as returned by prefilter_thresholds() (default: DEFAULT_THRESHOLDS)
+
+    Returns:
+        dict: verdict, score (summed weights of the patterns found), first_person
+        (share of words that are I/me/my/mine/myself), patterns (name -> first match)
+    """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    patterns = get_detector().first_matches(text)
+    score = sum(PATTERN_WEIGHTS.get(name, DEFAULT_PATTERN_WEIGHT) for name in patterns)
+    words = max(1, len(_WORD_RE.findall(text)))
+    first_person = len(_FIRST_PERSON_RE.findall(text)) / words
+
+    if score <= thresholds["negative_max_score"] and first_person <= thresholds["negative_max_first_person"]:
+        verdict = "negative"
+    elif score >= thresholds["positive_min_score"]:
+        verdict = "positive"
+    else:
+        verdict = "uncertain"
+    return {"verdict": verdict, "score": round(score, 2), "first_person": round(first_person, 4),
+            "patterns": patterns}
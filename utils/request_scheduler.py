@@ -0,0 +1,214 @@
+"""
+Rate-limited, retrying execution of LLM API calls.
+
+Every chat completion goes through one RequestScheduler per process. Each
+provider (OpenAI, OpenRouter, or any other endpoint host) gets a token
+bucket refilled at its requests-per-minute limit, so large batches run at
+the provider's sustained rate instead of tripping 429s. Rate limits,
+timeouts, connection errors and 5xx responses are retried with exponential
+backoff and full jitter; a Retry-After header from the server takes
+precedence and pauses the whole provider, not just the caller. Errors that
+retrying cannot fix (bad key, bad request) are raised immediately.
+
+Limits can be tuned with DOCMINER_RPM_OPENAI, DOCMINER_RPM_OPENROUTER,
+DOCMINER_RPM_LOCAL (local and fake endpoints), DOCMINER_RPM_DEFAULT and
+DOCMINER_MAX_RETRIES.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import openai
+
+# Sustained requests per minute by provider (conservative defaults for low usage tiers)
+DEFAULT_REQUESTS_PER_MINUTE = {
+    "openai": 500,
+    "openrouter": 200,
+    "local": 60000,  # local servers and the offline fake provider
+}
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+FALLBACK_REQUESTS_PER_MINUTE = 60
+DEFAULT_MAX_RETRIES = 5
+BASE_BACKOFF = 1.0    # seconds before the first retry (before jitter)
+MAX_BACKOFF = 60.0
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def provider_for_base_url(base_url):
+    """Rate-limit group for an endpoint: 'openai', 'openrouter', 'local' or the host name."""
+    host = urlparse(str(base_url)).hostname or str(base_url)
+    if host in LOCAL_HOSTS:
+        return "local"
+    if host.endswith("openrouter.ai"):
+        return "openrouter"
+    if host.endswith("openai.com"):
+        return "openai"
+    return host
+
+
+def requests_per_minute(provider):
+    if provider in DEFAULT_REQUESTS_PER_MINUTE:
+        return float(os.getenv(f"DOCMINER_RPM_{provider.upper()}") or DEFAULT_REQUESTS_PER_MINUTE[provider])
+    return float(os.getenv("DOCMINER_RPM_DEFAULT") or FALLBACK_REQUESTS_PER_MINUTE)
+
+
+def retry_after_seconds(error):
+    """Server-requested delay from Retry-After / retry-after-ms headers, or None."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        return None  # HTTP-date form: fall back to exponential backoff
+    return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds):
+        """Hold every caller for `seconds` (the provider asked us to back off)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+class RequestScheduler:
+    """Runs API calls under per-provider rate limits with retry and backoff."""
+
+    def __init__(self, max_retries=None):
+        self.max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, provider):
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                rate = requests_per_minute(provider) / 60.0
+                # Allow a burst of a few seconds' worth of requests
+                bucket = self._buckets[provider] = TokenBucket(rate, capacity=max(1.0, rate * 5))
+            return bucket
+
+    def _backoff(self, provider, bucket, error, attempt):
+        """
+        Decide how to retry after a transient failure.
+
+        Returns:
+            Seconds the caller itself should sleep (0 when the whole provider
+            was paused instead). Re-raises error once retries are exhausted.
+        """
+        if attempt >= self.max_retries:
+            raise error
+        delay = retry_after_seconds(error)
+        if delay is None:
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2 ** attempt))
+        if isinstance(error, openai.RateLimitError):
+            bucket.pause(delay)  # Everyone sharing the provider backs off
+            print(f"Rate limited by {provider}; retrying in {delay:.1f}s")
+            return 0.0
+        print(f"{type(error).__name__} from {provider}; retrying in {delay:.1f}s")
+        return delay
+
+    def run(self, provider, call, stats=None):
+        """
+        Run call() under the provider's rate limit, retrying transient failures.
+
+        Args:
+            provider: Rate-limit group (see provider_for_base_url)
+            call: Zero-argument callable making one API request
+            stats: Optional dict; 'retries' and 'queue_wait' (seconds) are added to it
+
+        Returns:
+            call()'s result. The last error is raised once retries are exhausted.
+        """
+        bucket = self.bucket(provider)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            if stats is not None:
+                stats["queue_wait"] = stats.get("queue_wait", 0.0) + waited
+            try:
+                return call()
+            except RETRYABLE_ERRORS as e:
+                time.sleep(self._backoff(provider, bucket, e, attempt))
+                attempt += 1
+                if stats is not None:
+                    stats["retries"] = attempt
+
+    async def run_async(self, provider, call, stats=None):
+        """
+        Async counterpart of run() for AsyncOpenAI requests.
+
+        call is a zero-argument callable returning an awaitable. The token
+        buckets are shared with run(), so sync and async callers draw on the
+        same per-provider budget; waiting for a token happens in a worker
+        thread so the event loop keeps serving other requests.
+        """
+        bucket = self.bucket(provider)
+        attempt = 0
+        while True:
+            waited = await asyncio.to_thread(bucket.acquire)
+            if stats is not None:
+                stats["queue_wait"] = stats.get("queue_wait", 0.0) + waited
+            try:
+                return await call()
+            except RETRYABLE_ERRORS as e:
+                await asyncio.sleep(self._backoff(provider, bucket, e, attempt))
+                attempt += 1
+                if stats is not None:
+                    stats["retries"] = attempt
+
+def get_request_scheduler():
+    """Process-wide RequestScheduler (DOCMINER_MAX_RETRIES overrides the retry count)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            max_retries = os.getenv("DOCMINER_MAX_RETRIES")
+            _scheduler = RequestScheduler(max_retries=int(max_retries) if max_retries else None)
+        return _scheduler
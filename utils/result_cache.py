@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for LLM pass results.
+
+Entries are keyed by a hash of (PDF bytes, pass name, prompt text, model,
+temperature) and stored as small JSON files under ~/.docminer/cache/results.
+Reading an entry refreshes its modification time, so eviction by oldest
+mtime gives least-recently-used behaviour within a size budget.
+
+The same budget covers the stored document indexes under
+~/.docminer/cache/index (see utils/document_index.py): they are evicted,
+pruned and cleared together with the results, oldest first.
+
+Usage:
+    python -m utils.result_cache stats
+    python -m utils.result_cache prune --max-mb 50
+    python -m utils.result_cache clear
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path.home() / ".docminer" / "cache"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Hex SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of JSON results on disk."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.results_dir = self.cache_dir / "results"
+        self.index_dir = self.cache_dir / "index"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size_bytes = None  # computed lazily on first write
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(document_hash, pass_name, prompt, model, temperature, **params):
+        """
+        Build the cache key for one LLM call.
+
+        Args:
+            document_hash: SHA-256 of the PDF bytes
+            pass_name: Analysis pass identifier (e.g. "explicit")
+            prompt: Prompt text or list of chat messages
+            model: Model name
+            temperature: Sampling temperature
+            params: Any other request parameters that change the answer
+        """
+        payload = json.dumps({
+            "document": document_hash,
+            "pass": pass_name,
+            "prompt": prompt,
+            "model": model,
+            "temperature": temperature,
+            "params": params,
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path_for(self, key):
+        return self.results_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serialisable value, evicting old entries if over budget."""
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            try:
+                replaced_bytes = path.stat().st_size  # overwriting an entry frees its old size
+            except OSError:
+                replaced_bytes = 0
+            os.replace(tmp_path, path)  # atomic - readers never see partial files
+        except OSError as e:
+            print(f"Could not write result cache entry: {e}")
+            return
+        self.add_written(len(data), replaced_bytes)
+
+    def add_written(self, size, replaced_bytes=0):
+        """
+        Count a file just written under the cache directory against the budget
+        (put() does this for results; document indexes report themselves here),
+        evicting old entries if over budget.
+        """
+        with self._lock:
+            if self._size_bytes is None:
+                self._size_bytes = self._scan_size()
+            else:
+                self._size_bytes += size - replaced_bytes
+            over_budget = self._size_bytes > self.max_bytes
+        if over_budget:
+            self.prune()
+
+    def _entries(self, kind=None):
+        """List of (mtime, size, path) for every entry on disk ('results' or 'index' only if kind is given)."""
+        entries = []
+        for entry_kind, directory, pattern in (("results", self.results_dir, "*/*.json"),
+                                               ("index", self.index_dir, "*.json.gz")):
+            if kind not in (None, entry_kind) or not directory.exists():
+                continue
+            for path in directory.glob(pattern):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def prune(self, max_bytes=None):
+        """
+        Evict least-recently-used entries until the cache fits in max_bytes.
+
+        Returns:
+            dict: removed (entry count), freed_bytes, remaining_bytes
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        freed = 0
+        for _, size, path in entries:
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            freed += size
+            removed += 1
+        with self._lock:
+            self._size_bytes = total
+        return {"removed": removed, "freed_bytes": freed, "remaining_bytes": total}
+
+    def clear(self):
+        """Remove every entry."""
+        return self.prune(max_bytes=0)
+
+    def stats(self):
+        """Hit/miss counters for this process plus on-disk usage (results and document indexes)."""
+        entries = self._entries("results")
+        indexes = self._entries("index")
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(entries),
+                "index_entries": len(indexes),
+                "bytes": sum(size for _, size, _ in entries + indexes),
+                "index_bytes": sum(size for _, size, _ in indexes),
+                "max_bytes": self.max_bytes,
+                "cache_dir": str(self.cache_dir),
+            }
+
+
+def get_result_cache():
+    """
+    Process-wide ResultCache, or None when caching is disabled.
+
+    Set DOCMINER_CACHE_DIR to relocate the cache, DOCMINER_CACHE_MAX_MB to
+    change the size budget, or DOCMINER_RESULT_CACHE=0 to disable it.
+    """
+    if os.getenv("DOCMINER_RESULT_CACHE", "1") == "0":
+        return None
+    return get_cache_budget()
+
+
+def get_cache_budget():
+    """
+    The process-wide ResultCache as owner of the cache directory's size budget.
+    Unlike get_result_cache() it exists even when result caching is disabled,
+    so stored document indexes stay bounded either way.
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = _cache_from_environment()
+        return _result_cache
+
+
+def _cache_from_environment():
+    """ResultCache at DOCMINER_CACHE_DIR with the DOCMINER_CACHE_MAX_MB budget (defaults otherwise)."""
+    max_mb = os.getenv("DOCMINER_CACHE_MAX_MB")
+    return ResultCache(
+        cache_dir=os.getenv("DOCMINER_CACHE_DIR") or None,
+        max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES,
+    )
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Inspect or prune the DocMiner cache (LLM results and document indexes)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show cache size and entry counts")
+    prune_parser = sub.add_parser("prune", help="Evict least-recently-used entries")
+    prune_parser.add_argument("--max-mb", type=float, default=None,
+                              help="Target size in MB (default: configured budget)")
+    sub.add_parser("clear", help="Remove every cached result and document index")
+    args = parser.parse_args()
+
+    # Not get_result_cache(): the cache must be manageable even when DOCMINER_RESULT_CACHE=0
+    cache = _cache_from_environment()
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"Cache directory: {stats['cache_dir']}")
+        print(f"Entries: {stats['entries']} results, {stats['index_entries']} document indexes "
+              f"({stats['index_bytes'] / (1024 * 1024):.2f} MB)")
+        print(f"Size: {stats['bytes'] / (1024 * 1024):.2f} MB of {stats['max_bytes'] / (1024 * 1024):.0f} MB")
+    elif args.command == "prune":
+        max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+        result = cache.prune(max_bytes=max_bytes)
+        print(f"Removed {result['removed']} entries ({result['freed_bytes'] / 1024:.1f} KB), "
+              f"{result['remaining_bytes'] / (1024 * 1024):.2f} MB remaining")
+    elif args.command == "clear":
+        result = cache.clear()
+        print(f"Removed {result['removed']} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Document-wide inverted search index.
+
+Built from a DocumentIndex, it maps each lower-cased token to the pages and
+token positions where it occurs, so phrase queries over a whole paper are
+answered in milliseconds instead of searching page by page. Queries match
+like PyMuPDF's substring search: a single word may occur anywhere inside a
+word ("ality" finds "positionality"), and in a phrase the first word may end
+a longer word and the last may start one ("ality as a res" finds
+"positionality as a researcher"). Hits cover whole words. Indexes are memoised per document hash; the
+underlying text comes from the DocumentIndex, which is already stored on disk.
+"""
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_memory_cache = OrderedDict()  # sha256 -> SearchIndex
+_memory_cache_size = 8
+_memory_lock = threading.Lock()
+
+
+def tokenize(text):
+    """Lower-cased word tokens of a string."""
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def _is_line_break_hyphen(words, previous_word, word_num):
+    """True if word_num continues a word hyphenated at the end of the previous line."""
+    if word_num != previous_word + 1:
+        return False
+    previous, current = words[previous_word], words[word_num]
+    wrapped = current[0] < previous[0] and current[1] > previous[1]  # next word starts a new line
+    return previous[4].endswith("-") and wrapped and current[4][:1].islower()
+
+
+class SearchIndex:
+    """Token -> (page, token position) postings for one document."""
+
+    def __init__(self, document_index):
+        self.sha256 = document_index.sha256
+        self.document_index = document_index
+        self.page_tokens = []       # per page: list of tokens in reading order
+        self.page_token_words = []  # per page: word index each token starts in
+        self.page_token_end_words = []  # per page: word index each token ends in
+        self.postings = {}          # token -> list of (page, token position)
+
+        for page_num in range(document_index.page_count):
+            tokens = []
+            token_words = []
+            token_end_words = []
+            words = document_index.words(page_num)
+            for word_num, word in enumerate(words):
+                for token in tokenize(word[4]):
+                    if token_words and _is_line_break_hyphen(words, token_end_words[-1], word_num):
+                        # "position-" + "ality" on the next line: one token, like PyMuPDF's dehyphenation
+                        tokens[-1] += token
+                        token_end_words[-1] = word_num
+                        continue
+                    tokens.append(token)
+                    token_words.append(word_num)
+                    token_end_words.append(word_num)
+            for position, token in enumerate(tokens):
+                self.postings.setdefault(token, []).append((page_num, position))
+            self.page_tokens.append(tokens)
+            self.page_token_words.append(token_words)
+            self.page_token_end_words.append(token_end_words)
+
+        self.vocabulary = sorted(self.postings)
+
+    def _prefix_tokens(self, prefix):
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        stop = bisect.bisect_left(self.vocabulary, prefix + "\uffff")
+        return self.vocabulary[start:stop]
+
+    def _suffix_tokens(self, suffix):
+        return [token for token in self.vocabulary if token.endswith(suffix)]
+
+    def _substring_tokens(self, substring):
+        return [token for token in self.vocabulary if substring in token]
+
+    def search(self, query, max_hits=None):
+        """
+        Find a word or phrase anywhere in the document (case-insensitive,
+        substring semantics as described in the module docstring).
+
+        Returns:
+            list of dicts in reading order: page (0-based), word_start,
+            word_end (inclusive word indices on that page), text (the matched
+            words), bboxes (word boxes in PDF points) and snippet (surrounding
+            words for a hit list)
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        if len(query_tokens) == 1:
+            first_tokens = self._substring_tokens(query_tokens[0])
+        else:
+            first_tokens = self._suffix_tokens(query_tokens[0])
+        middle = query_tokens[1:-1]
+        last_tokens = set(self._prefix_tokens(query_tokens[-1]))
+        # Vocabulary scans cost O(distinct words); postings are only read for the matching ones
+        starts = sorted(p for token in first_tokens for p in self.postings[token])
+
+        hits = []
+        for page_num, position in starts:
+            tokens = self.page_tokens[page_num]
+            end = position + len(query_tokens) - 1
+            if end >= len(tokens):
+                continue
+            if end > position and (tokens[position + 1:end] != middle or tokens[end] not in last_tokens):
+                continue
+            hits.append(self._hit(page_num, position, end))
+            if max_hits and len(hits) >= max_hits:
+                break
+        return hits
+
+    def _hit(self, page_num, token_start, token_end, context_words=8):
+        word_start = self.page_token_words[page_num][token_start]
+        word_end = self.page_token_end_words[page_num][token_end]
+        words = self.document_index.words(page_num)
+        matched = words[word_start:word_end + 1]
+        before = words[max(0, word_start - context_words):word_start]
+        after = words[word_end + 1:word_end + 1 + context_words]
+        return {
+            "page": page_num,
+            "word_start": word_start,
+            "word_end": word_end,
+            "text": " ".join(w[4] for w in matched),
+            "bboxes": [tuple(w[:4]) for w in matched],
+            "snippet": " ".join(w[4] for w in before + matched + after),
+        }
+
+
+def load_search_index(document_index):
+    """SearchIndex for a DocumentIndex, built on first use and memoised by hash."""
+    with _memory_lock:
+        index = _memory_cache.get(document_index.sha256)
+        if index is not None:
+            _memory_cache.move_to_end(document_index.sha256)
+            return index
+
+    index = SearchIndex(document_index)
+    with _memory_lock:
+        _memory_cache[index.sha256] = index
+        while len(_memory_cache) > _memory_cache_size:
+            _memory_cache.popitem(last=False)
+    return index
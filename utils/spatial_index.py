@@ -0,0 +1,76 @@
+"""
+Uniform-grid spatial index over word bounding boxes.
+
+Word boxes are stored column-wise in flat ``array('d')`` buffers and
+bucketed into square grid cells, so a rectangle query only visits the
+cells it overlaps instead of every word on the page. Building the index is
+O(words); a query costs O(cells covered + words in those cells).
+"""
+
+from array import array
+
+MIN_CELL_SIZE = 16.0
+
+
+class WordGrid:
+    """Rectangle-intersection index over (x0, y0, x1, y1) boxes."""
+
+    def __init__(self, bboxes, cell_size=None):
+        self.x0 = array('d')
+        self.y0 = array('d')
+        self.x1 = array('d')
+        self.y1 = array('d')
+        for bbox in bboxes:
+            self.x0.append(bbox[0])
+            self.y0.append(bbox[1])
+            self.x1.append(bbox[2])
+            self.y1.append(bbox[3])
+
+        self._bounds = (min(self.x0), min(self.y0), max(self.x1), max(self.y1)) if self.x0 else None
+        self.cell_size = cell_size or self._default_cell_size()
+        self._cells = {}  # (column, row) -> array('i') of word indices
+        for i in range(len(self.x0)):
+            for cell in self._cells_for(self.x0[i], self.y0[i], self.x1[i], self.y1[i]):
+                bucket = self._cells.get(cell)
+                if bucket is None:
+                    bucket = self._cells[cell] = array('i')
+                bucket.append(i)
+
+    def __len__(self):
+        return len(self.x0)
+
+    def _default_cell_size(self):
+        """About four line heights: a few words per cell on typical pages."""
+        if not self.y0:
+            return MIN_CELL_SIZE
+        heights = sorted(b - a for a, b in zip(self.y0, self.y1))
+        return max(MIN_CELL_SIZE, heights[len(heights) // 2] * 4)
+
+    def _cells_for(self, x0, y0, x1, y1):
+        size = self.cell_size
+        for column in range(int(x0 // size), int(x1 // size) + 1):
+            for row in range(int(y0 // size), int(y1 // size) + 1):
+                yield column, row
+
+    def bbox(self, i):
+        return self.x0[i], self.y0[i], self.x1[i], self.y1[i]
+
+    def query(self, x0, y0, x1, y1):
+        """Indices (ascending) of boxes that intersect the rectangle, edges inclusive."""
+        if not self.x0:
+            return []
+        # Clamp to the occupied area so huge drag rectangles do not walk empty cells
+        bounds_x0, bounds_y0, bounds_x1, bounds_y1 = self._bounds
+        x0, y0 = max(x0, bounds_x0), max(y0, bounds_y0)
+        x1, y1 = min(x1, bounds_x1), min(y1, bounds_y1)
+        if x0 > x1 or y0 > y1:
+            return []
+        candidates = set()
+        for cell in self._cells_for(x0, y0, x1, y1):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                candidates.update(bucket)
+        return sorted(
+            i for i in candidates
+            if self.x0[i] <= x1 and self.x1[i] >= x0 and self.y0[i] <= y1 and self.y1[i] >= y0
+        )